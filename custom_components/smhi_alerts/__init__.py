@@ -9,28 +9,18 @@ from homeassistant.helpers import entity_registry as er
 
 from .const import (
     DOMAIN,
-    CONF_DISTRICT,
-    CONF_LANGUAGE,
-    CONF_INCLUDE_MESSAGES,
-    CONF_INCLUDE_GEOMETRY,
-    DEFAULT_LANGUAGE,
-    DEFAULT_INCLUDE_MESSAGES,
-    DEFAULT_INCLUDE_GEOMETRY,
     CONF_MODE,
-    CONF_LATITUDE,
-    CONF_LONGITUDE,
-    CONF_RADIUS_KM,
     DEFAULT_MODE,
-    DEFAULT_RADIUS_KM,
-    CONF_EXCLUDE_SEA,
-    DEFAULT_EXCLUDE_SEA,
     CONF_EXCLUDED_MESSAGE_TYPES,
     DEFAULT_EXCLUDED_MESSAGE_TYPES,
     CONF_MESSAGE_TYPES,
     DEFAULT_MESSAGE_TYPES,
 )
 from .frontend import async_setup_frontend
+from .hub import async_release_hub, async_remove_snapshot
 from .sensor import SmhiAlertCoordinator
+from .services import async_register_services
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,6 +33,8 @@ async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the SMHI Alert component."""
     hass.data.setdefault(DOMAIN, {})
     await async_setup_frontend(hass)
+    async_register_websocket_commands(hass)
+    async_register_services(hass)
     return True
 
 
@@ -52,6 +44,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     # Create shared coordinator once and store it for all platforms
     coordinator = SmhiAlertCoordinator(hass, entry)
+    # Listen before the first refresh: a snapshot served at startup is
+    # revalidated in the background and may finish while we are built.
+    entry.async_on_unload(
+        coordinator.hub.async_add_listener(coordinator.async_handle_hub_update)
+    )
     try:
         start = monotonic()
         _LOGGER.debug(
@@ -72,67 +69,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             entry.entry_id,
             ex,
         )
+        # The coordinator already registered its poll bounds on the hub.
+        await coordinator.async_shutdown()
+        await async_release_hub(hass)
         raise ConfigEntryNotReady from ex
 
     hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator}
+    entry.async_on_unload(coordinator.async_shutdown)
 
     async def _options_updated(hass: HomeAssistant, updated_entry: ConfigEntry):
         domain_data = hass.data.get(DOMAIN, {})
         if updated_entry.entry_id not in domain_data:
             return
         coord = domain_data[updated_entry.entry_id]["coordinator"]
-        coord.mode = updated_entry.options.get(
-            CONF_MODE, updated_entry.data.get(CONF_MODE, DEFAULT_MODE)
-        )
-        coord.district = updated_entry.options.get(
-            CONF_DISTRICT, updated_entry.data.get(CONF_DISTRICT, "all")
-        )
-        coord.language = updated_entry.options.get(
-            CONF_LANGUAGE, updated_entry.data.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
-        )
-        coord.include_messages = updated_entry.options.get(
-            CONF_INCLUDE_MESSAGES,
-            updated_entry.data.get(CONF_INCLUDE_MESSAGES, DEFAULT_INCLUDE_MESSAGES),
-        )
-        coord.include_geometry = updated_entry.options.get(
-            CONF_INCLUDE_GEOMETRY,
-            updated_entry.data.get(CONF_INCLUDE_GEOMETRY, DEFAULT_INCLUDE_GEOMETRY),
-        )
-        coord.set_message_types(
-            updated_entry.options.get(
-                CONF_MESSAGE_TYPES,
-                updated_entry.data.get(CONF_MESSAGE_TYPES, DEFAULT_MESSAGE_TYPES),
-            ),
-            updated_entry.options.get(
-                CONF_EXCLUDED_MESSAGE_TYPES,
-                updated_entry.data.get(
-                    CONF_EXCLUDED_MESSAGE_TYPES, DEFAULT_EXCLUDED_MESSAGE_TYPES
-                ),
-            ),
-        )
-        coord.exclude_sea = updated_entry.options.get(
-            CONF_EXCLUDE_SEA,
-            updated_entry.data.get(CONF_EXCLUDE_SEA, DEFAULT_EXCLUDE_SEA),
-        )
-        coord.latitude = float(
-            updated_entry.options.get(
-                CONF_LATITUDE,
-                updated_entry.data.get(CONF_LATITUDE, hass.config.latitude),
-            )
-        )
-        coord.longitude = float(
-            updated_entry.options.get(
-                CONF_LONGITUDE,
-                updated_entry.data.get(CONF_LONGITUDE, hass.config.longitude),
-            )
-        )
-        coord.radius_km = float(
-            updated_entry.options.get(
-                CONF_RADIUS_KM,
-                updated_entry.data.get(CONF_RADIUS_KM, DEFAULT_RADIUS_KM),
-            )
-        )
-        await coord.async_request_refresh()
+        coord.apply_entry_options(updated_entry)
+        # Re-filter the cached payload locally; no network round-trip needed.
+        await coord.async_refilter()
 
     entry.async_on_unload(entry.add_update_listener(_options_updated))
 
@@ -151,10 +103,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         # Cleanup domain data for this entry if set by platforms
         hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        await async_release_hub(hass)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the persisted payload when the last entry is removed."""
+    if not any(
+        other.entry_id != entry.entry_id
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        await async_remove_snapshot(hass)
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate config entry to newer version."""
     # We bumped ConfigFlow.VERSION to 2 to introduce filter mode and coordinates.
@@ -0,0 +1,212 @@
+"""Cached catalogue of the SMHI warning areas (districts)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import threading
+from typing import Any
+
+from aiohttp import ClientTimeout
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    AREAS_RETRY,
+    AREAS_SAVE_DELAY,
+    AREAS_STORAGE_KEY,
+    AREAS_TTL,
+    AREAS_URL,
+    DATA_AREAS,
+    DISTRICTS,
+    DOMAIN,
+    STORAGE_VERSION,
+)
+from .geometry import AreaGeometry
+
+try:  # orjson ships with Home Assistant; fall back to the stdlib decoder.
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _decode_areas(body: bytes) -> list[dict[str, Any]]:
+    """Decode the areas document; runs in the executor.
+
+    With polygons it is large enough to block the event loop noticeably.
+    """
+    areas = json_loads(body)
+    if not isinstance(areas, list):
+        raise ValueError("Expected a list of areas")
+    return areas
+
+
+@callback
+def async_get_areas_catalogue(hass: HomeAssistant) -> "AreasCatalogue":
+    """Return the domain-wide areas catalogue, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    catalogue = domain_data.get(DATA_AREAS)
+    if catalogue is None:
+        catalogue = AreasCatalogue(hass)
+        domain_data[DATA_AREAS] = catalogue
+    return catalogue
+
+
+class AreasCatalogue:
+    """The SMHI areas list, persisted and refreshed once per AREAS_TTL.
+
+    Callers never wait for the network: until a download has succeeded the
+    persisted copy, or else the static DISTRICTS table, is served and a
+    refresh runs in the background.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty catalogue."""
+        self.hass = hass
+        # Overridable, e.g. to run against a local stand-in server.
+        self.url = AREAS_URL
+        self.areas: list[dict[str, Any]] = []
+        self._names: dict[str, str] = {}
+        self._fetched_at: datetime | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, AREAS_STORAGE_KEY
+        )
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._refresh_task: asyncio.Task | None = None
+        # Last failed download; no new attempt until AREAS_RETRY has passed.
+        self._failed_at: datetime | None = None
+        # District polygons and point lookups, built on first use.
+        self._geometries: dict[str, AreaGeometry] | None = None
+        self._located: dict[tuple[float, float], tuple[str, ...]] = {}
+        self._geometry_lock = threading.Lock()
+
+    def name(self, area_id: Any) -> str:
+        """Return the display name of an area id, or the id itself."""
+        key = str(area_id)
+        return self._names.get(key) or DISTRICTS.get(key, key)
+
+    def options(self) -> list[dict[str, str]]:
+        """Return select selector options for every known area."""
+        names = self._names or DISTRICTS
+        return [{"label": name, "value": area_id} for area_id, name in names.items()]
+
+    def districts_at(self, lon: float, lat: float) -> tuple[str, ...]:
+        """Return the ids of the areas whose polygon contains (lon, lat).
+
+        Resolved once per point; empty if the catalogue has no geometry.
+        Called from executor jobs, hence the lock.
+        """
+        with self._geometry_lock:
+            located = self._located.get((lon, lat))
+            if located is not None:
+                return located
+            if self._geometries is None:
+                self._geometries = {}
+                for area in self.areas:
+                    if not isinstance(area, dict) or area.get("id") is None:
+                        continue
+                    geometry = AreaGeometry.from_container(
+                        area.get("geometry") or area.get("area")
+                    )
+                    if geometry is not None:
+                        self._geometries[str(area["id"])] = geometry
+            located = tuple(
+                area_id
+                for area_id, geometry in self._geometries.items()
+                if geometry.contains(lon, lat)
+            )
+            self._located[(lon, lat)] = located
+            return located
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the catalogue should be downloaded again."""
+        return (
+            self._fetched_at is None
+            or dt_util.utcnow() - self._fetched_at > AREAS_TTL
+        )
+
+    @property
+    def _retry_pending(self) -> bool:
+        """Return True while a failed download is too recent to retry."""
+        return (
+            self._failed_at is not None
+            and dt_util.utcnow() - self._failed_at < AREAS_RETRY
+        )
+
+    async def async_ensure_loaded(self) -> None:
+        """Load the persisted catalogue and refresh it in the background if stale."""
+        async with self._load_lock:
+            if not self._loaded:
+                self._loaded = True
+                await self._async_load()
+        if self.stale and self._refresh_task is None and not self._retry_pending:
+            self._refresh_task = self.hass.async_create_background_task(
+                self._async_refresh(), name="smhi_alerts areas refresh"
+            )
+
+    async def async_options(self) -> list[dict[str, str]]:
+        """Return select options without waiting for the network."""
+        await self.async_ensure_loaded()
+        return self.options()
+
+    async def _async_load(self) -> None:
+        """Restore the persisted catalogue."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # corrupt or unreadable file
+            _LOGGER.debug("Ignoring unreadable SMHI areas: %s", err)
+            return
+        if not isinstance(stored, dict) or not isinstance(stored.get("areas"), list):
+            return
+        self._set_areas(
+            stored["areas"],
+            dt_util.parse_datetime(str(stored.get("fetched_at") or "")),
+        )
+
+    async def _async_refresh(self) -> None:
+        """Download the areas list and persist it."""
+        try:
+            session = aiohttp_client.async_get_clientsession(self.hass)
+            async with session.get(
+                self.url, timeout=ClientTimeout(total=10)
+            ) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+            areas = await self.hass.async_add_executor_job(_decode_areas, body)
+        except Exception as err:
+            self._failed_at = dt_util.utcnow()
+            _LOGGER.debug(
+                "Could not refresh SMHI areas, retrying in %s: %s", AREAS_RETRY, err
+            )
+            return
+        finally:
+            self._refresh_task = None
+        self._failed_at = None
+        fetched_at = dt_util.utcnow()
+        self._set_areas(areas, fetched_at)
+        snapshot = {"areas": areas, "fetched_at": fetched_at.isoformat()}
+        self._store.async_delay_save(lambda: snapshot, AREAS_SAVE_DELAY)
+
+    def _set_areas(
+        self, areas: list[dict[str, Any]], fetched_at: datetime | None
+    ) -> None:
+        """Replace the catalogue contents."""
+        names: dict[str, str] = {}
+        for area in areas:
+            if not isinstance(area, dict) or area.get("id") is None:
+                continue
+            area_id = str(area["id"])
+            names[area_id] = area.get("sv") or area.get("en") or area_id
+        with self._geometry_lock:
+            self.areas = areas
+            self._names = names
+            self._fetched_at = fetched_at
+            self._geometries = None
+            self._located = {}
@@ -7,7 +7,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceEntryType
 
-from .const import DOMAIN, DISTRICTS, DEFAULT_NAME, DEFAULT_MODE, DEFAULT_RADIUS_KM
+from .const import DOMAIN, DEFAULT_NAME, DEFAULT_MODE, DEFAULT_RADIUS_KM
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,6 +46,9 @@ class SMHIAlertBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         attributes: dict[str, Any] = self.coordinator.data.get("attributes", {})
+        # On while an alert is in effect, flipped on time at its start/end.
+        if "active_count" in attributes:
+            return attributes["active_count"] > 0
         return (attributes.get("alerts_count") or 0) > 0
 
     @property
@@ -56,6 +59,8 @@ class SMHIAlertBinarySensor(CoordinatorEntity, BinarySensorEntity):
             "warnings_count": src.get("warnings_count", 0),
             "messages_count": src.get("messages_count", 0),
             "alerts_count": src.get("alerts_count", 0),
+            "active_count": src.get("active_count", 0),
+            "upcoming_count": src.get("upcoming_count", 0),
             "highest_severity": src.get("highest_severity", "NONE"),
             "last_update": src.get("last_update"),
             "attribution": src.get("attribution"),
@@ -68,9 +73,7 @@ class SMHIAlertBinarySensor(CoordinatorEntity, BinarySensorEntity):
             r = int(round(getattr(self.coordinator, "radius_km", DEFAULT_RADIUS_KM)))
             return f"{DEFAULT_NAME} active ({lat},{lon} @ {r}km)"
         else:
-            return (
-                f"{DEFAULT_NAME} active ({DISTRICTS.get(self.district, self.district)})"
-            )
+            return f"{DEFAULT_NAME} active ({self.coordinator.areas.name(self.district)})"
 
     def _derive_unique_id(self) -> str:
         # IMPORTANT: unique_id must be stable for the lifetime of the config entry.
@@ -0,0 +1,68 @@
+"""Small bounded caches shared by the SMHI Alerts modules."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Container, Hashable
+import threading
+from typing import Generic, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+class LRUCache(Generic[_K, _V]):
+    """Thread-safe least-recently-used cache with a fixed number of entries.
+
+    Used from executor jobs, hence the lock. Hit and miss counters are kept
+    so callers can report how effective the cache is.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize an empty cache holding at most maxsize entries."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[_K, _V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the share of lookups that hit, None before the first."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def get(self, key: _K) -> _V | None:
+        """Return the cached value for key and mark it recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: _K, value: _V) -> None:
+        """Store value under key, evicting the least recently used entry."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def retain(self, keys: Container[_K]) -> None:
+        """Drop every entry whose key is not in keys."""
+        with self._lock:
+            for key in [key for key in self._data if key not in keys]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._data.clear()
@@ -1,9 +1,9 @@
 from homeassistant import config_entries
 from homeassistant.core import callback
 import voluptuous as vol
+from .areas import async_get_areas_catalogue
 from .const import (
     DOMAIN,
-    DISTRICTS,
     CONF_DISTRICT,
     CONF_LANGUAGE,
     LANGUAGE_OPTIONS,
@@ -12,7 +12,6 @@ from .const import (
     DEFAULT_INCLUDE_MESSAGES,
     CONF_INCLUDE_GEOMETRY,
     DEFAULT_INCLUDE_GEOMETRY,
-    AREAS_URL,
     CONF_MODE,
     CONF_LATITUDE,
     CONF_LONGITUDE,
@@ -26,12 +25,49 @@ from .const import (
     DEFAULT_EXCLUDED_MESSAGE_TYPES,
     CONF_MESSAGE_TYPES,
     DEFAULT_MESSAGE_TYPES,
+    CONF_EXTRA_DISTRICTS,
+    CONF_EXTRA_LOCATIONS,
+    CONF_ALERT_ENTITIES,
+    DEFAULT_ALERT_ENTITIES,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
     MESSAGE_EVENT_CATEGORIES,
 )
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.selector import selector
-from homeassistant.helpers import aiohttp_client
-from aiohttp import ClientTimeout
+
+
+EXTRA_LOCATION_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_LATITUDE): vol.All(
+            vol.Coerce(float), vol.Range(min=-90, max=90)
+        ),
+        vol.Required(CONF_LONGITUDE): vol.All(
+            vol.Coerce(float), vol.Range(min=-180, max=180)
+        ),
+        vol.Optional(CONF_RADIUS_KM, default=DEFAULT_RADIUS_KM): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=250)
+        ),
+    }
+)
+EXTRA_LOCATIONS_SCHEMA = vol.Schema(vol.All(cv.ensure_list, [EXTRA_LOCATION_SCHEMA]))
+
+
+def _validate_extra_locations(user_input: dict) -> dict[str, str]:
+    """Normalize the extra locations in user_input; return form errors.
+
+    The object selector accepts anything, so each point is checked here
+    rather than being saved and skipped later when filtering.
+    """
+    try:
+        user_input[CONF_EXTRA_LOCATIONS] = EXTRA_LOCATIONS_SCHEMA(
+            user_input.get(CONF_EXTRA_LOCATIONS)
+        )
+    except vol.Invalid:
+        return {CONF_EXTRA_LOCATIONS: "invalid_extra_locations"}
+    return {}
 
 
 def _build_message_multiselect_options() -> dict[str, str]:
@@ -140,10 +176,22 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_EXCLUDE_SEA,
             entry.data.get(CONF_EXCLUDE_SEA, DEFAULT_EXCLUDE_SEA),
         )
+        current_extra_districts = entry.options.get(
+            CONF_EXTRA_DISTRICTS, entry.data.get(CONF_EXTRA_DISTRICTS, [])
+        )
+        current_extra_locations = entry.options.get(
+            CONF_EXTRA_LOCATIONS, entry.data.get(CONF_EXTRA_LOCATIONS, [])
+        )
+        current_alert_entities = entry.options.get(
+            CONF_ALERT_ENTITIES,
+            entry.data.get(CONF_ALERT_ENTITIES, DEFAULT_ALERT_ENTITIES),
+        )
         current_message_types = _resolve_entry_message_types(entry)
 
         if user_input is not None:
             user_input = dict(user_input)
+            errors = _validate_extra_locations(user_input)
+        if user_input is not None and not errors:
             user_input.setdefault(CONF_MESSAGE_TYPES, DEFAULT_MESSAGE_TYPES)
             # Update entry data to reflect new baseline configuration
             new_data = {
@@ -158,13 +206,18 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_MESSAGE_TYPES: user_input.get(
                     CONF_MESSAGE_TYPES, DEFAULT_MESSAGE_TYPES
                 ),
+                CONF_EXTRA_DISTRICTS: user_input.get(CONF_EXTRA_DISTRICTS, []),
+                CONF_EXTRA_LOCATIONS: user_input.get(CONF_EXTRA_LOCATIONS, []),
+                CONF_ALERT_ENTITIES: user_input.get(
+                    CONF_ALERT_ENTITIES, DEFAULT_ALERT_ENTITIES
+                ),
             }
             if user_input[CONF_MODE] == "district":
                 new_data[CONF_DISTRICT] = user_input[CONF_DISTRICT]
                 new_data[CONF_EXCLUDE_SEA] = user_input.get(
                     CONF_EXCLUDE_SEA, DEFAULT_EXCLUDE_SEA
                 )
-                new_title = f"SMHI Alert ({DISTRICTS.get(new_data[CONF_DISTRICT], new_data[CONF_DISTRICT])})"
+                new_title = f"SMHI Alert ({async_get_areas_catalogue(self.hass).name(new_data[CONF_DISTRICT])})"
             else:
                 # Map location selector to lat/lon plus radius
                 loc = user_input.get(CONF_LOCATION) or {}
@@ -181,6 +234,9 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             new_options = dict(entry.options)
             new_options[CONF_MESSAGE_TYPES] = new_data[CONF_MESSAGE_TYPES]
             new_options.pop(CONF_EXCLUDED_MESSAGE_TYPES, None)
+            new_options.pop(CONF_EXTRA_DISTRICTS, None)
+            new_options.pop(CONF_EXTRA_LOCATIONS, None)
+            new_options.pop(CONF_ALERT_ENTITIES, None)
 
             return self.async_update_reload_and_abort(
                 entry=entry,
@@ -190,24 +246,8 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 title=new_title,
             )
 
-        # Prepare dynamic district options (fallback to static)
-        district_options = []
-        try:
-            session = aiohttp_client.async_get_clientsession(self.hass)
-            timeout = ClientTimeout(total=10)
-            async with session.get(AREAS_URL, timeout=timeout) as resp:
-                if resp.status == 200:
-                    areas = await resp.json()
-                    for area in areas:
-                        area_id = str(area.get("id"))
-                        label = area.get("sv") or area.get("en") or area_id
-                        district_options.append({"label": label, "value": area_id})
-        except Exception:
-            district_options = []
-        if not district_options:
-            district_options = [
-                {"label": name, "value": number} for number, name in DISTRICTS.items()
-            ]
+        # Served from the persisted catalogue; never waits for the network.
+        district_options = await async_get_areas_catalogue(self.hass).async_options()
 
         language_options = [
             {"label": name, "value": code} for code, name in LANGUAGE_OPTIONS.items()
@@ -230,6 +270,17 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_DISTRICT, default=current_district): selector(
                     {"select": {"options": district_options, "mode": "dropdown"}}
                 ),
+                vol.Optional(
+                    CONF_EXTRA_DISTRICTS, default=current_extra_districts
+                ): selector(
+                    {
+                        "select": {
+                            "options": district_options,
+                            "multiple": True,
+                            "mode": "dropdown",
+                        }
+                    }
+                ),
                 vol.Optional(CONF_LOCATION, default=current_location): selector(
                     {"location": {}}
                 ),
@@ -243,6 +294,9 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         }
                     }
                 ),
+                vol.Optional(
+                    CONF_EXTRA_LOCATIONS, default=current_extra_locations
+                ): selector({"object": {}}),
                 vol.Required(CONF_LANGUAGE, default=current_language): selector(
                     {"select": {"options": language_options, "mode": "dropdown"}}
                 ),
@@ -252,6 +306,9 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(
                     CONF_INCLUDE_GEOMETRY, default=current_include_geometry
                 ): cv.boolean,
+                vol.Required(
+                    CONF_ALERT_ENTITIES, default=current_alert_entities
+                ): cv.boolean,
                 vol.Required(CONF_EXCLUDE_SEA, default=current_exclude_sea): cv.boolean,
                 vol.Optional(
                     CONF_MESSAGE_TYPES,
@@ -260,6 +317,9 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
 
+        if errors:
+            # Keep what was typed so it can be corrected.
+            data_schema = self.add_suggested_values_to_schema(data_schema, user_input)
         return self.async_show_form(
             step_id="reconfigure", data_schema=data_schema, errors=errors
         )
@@ -269,6 +329,8 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             user_input = dict(user_input)
+            errors = _validate_extra_locations(user_input)
+        if user_input is not None and not errors:
             mode = user_input[CONF_MODE]
             language = user_input[CONF_LANGUAGE]
             user_input.setdefault(CONF_MESSAGE_TYPES, DEFAULT_MESSAGE_TYPES)
@@ -277,7 +339,7 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 district = user_input[CONF_DISTRICT]
                 await self.async_set_unique_id(f"district:{district}:{language}")
                 self._abort_if_unique_id_configured()
-                title = f"SMHI Alert ({DISTRICTS.get(district, district)})"
+                title = f"SMHI Alert ({async_get_areas_catalogue(self.hass).name(district)})"
             else:
                 loc = user_input.get(CONF_LOCATION) or {}
                 lat = loc.get("latitude", self.hass.config.latitude)
@@ -290,25 +352,8 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 title = f"SMHI Alert ({round(lat, 4)},{round(lon, 4)} @ {radius}km)"
             return self._show_reload_notice_step(title=title, data=user_input)
 
-        # Try fetch dynamic areas list; fallback to static
-        district_options = []
-        try:
-            session = aiohttp_client.async_get_clientsession(self.hass)
-            timeout = ClientTimeout(total=10)
-            async with session.get(AREAS_URL, timeout=timeout) as resp:
-                if resp.status == 200:
-                    areas = await resp.json()
-                    # Expecting list of { id, sv, en }
-                    for area in areas:
-                        area_id = str(area.get("id"))
-                        label = area.get("sv") or area.get("en") or area_id
-                        district_options.append({"label": label, "value": area_id})
-        except Exception:
-            district_options = []
-        if not district_options:
-            district_options = [
-                {"label": name, "value": number} for number, name in DISTRICTS.items()
-            ]
+        # Served from the persisted catalogue; never waits for the network.
+        district_options = await async_get_areas_catalogue(self.hass).async_options()
 
         # Prepare language and mode options
         language_options = [
@@ -334,6 +379,15 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         }
                     }
                 ),
+                vol.Optional(CONF_EXTRA_DISTRICTS, default=[]): selector(
+                    {
+                        "select": {
+                            "options": district_options,
+                            "multiple": True,
+                            "mode": "dropdown",
+                        }
+                    }
+                ),
                 vol.Optional(
                     CONF_LOCATION,
                     default={
@@ -351,6 +405,9 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         }
                     }
                 ),
+                vol.Optional(CONF_EXTRA_LOCATIONS, default=[]): selector(
+                    {"object": {}}
+                ),
                 vol.Required(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): selector(
                     {
                         "select": {
@@ -365,6 +422,9 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(
                     CONF_INCLUDE_GEOMETRY, default=DEFAULT_INCLUDE_GEOMETRY
                 ): cv.boolean,
+                vol.Required(
+                    CONF_ALERT_ENTITIES, default=DEFAULT_ALERT_ENTITIES
+                ): cv.boolean,
                 vol.Required(CONF_EXCLUDE_SEA, default=DEFAULT_EXCLUDE_SEA): cv.boolean,
                 vol.Optional(
                     CONF_MESSAGE_TYPES,
@@ -373,6 +433,9 @@ class SmhiAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
 
+        if errors:
+            # Keep what was typed so it can be corrected.
+            data_schema = self.add_suggested_values_to_schema(data_schema, user_input)
         return self.async_show_form(
             step_id="user",
             data_schema=data_schema,
@@ -393,6 +456,8 @@ class SmhiAlertsOptionsFlowHandler(config_entries.OptionsFlow):
         errors = {}
         if user_input is not None:
             user_input = dict(user_input)
+            errors = _validate_extra_locations(user_input)
+        if user_input is not None and not errors:
             user_input.setdefault(CONF_MESSAGE_TYPES, DEFAULT_MESSAGE_TYPES)
             user_input.setdefault(CONF_INCLUDE_GEOMETRY, DEFAULT_INCLUDE_GEOMETRY)
             # Map location into latitude/longitude for coordinator consumption
@@ -404,24 +469,8 @@ class SmhiAlertsOptionsFlowHandler(config_entries.OptionsFlow):
                 data[CONF_LONGITUDE] = loc.get("longitude", self.hass.config.longitude)
             return self.async_create_entry(title="", data=data)
 
-        # Try dynamic areas again, fallback to static
-        district_options = []
-        try:
-            session = aiohttp_client.async_get_clientsession(self.hass)
-            timeout = ClientTimeout(total=10)
-            async with session.get(AREAS_URL, timeout=timeout) as resp:
-                if resp.status == 200:
-                    areas = await resp.json()
-                    for area in areas:
-                        area_id = str(area.get("id"))
-                        label = area.get("sv") or area.get("en") or area_id
-                        district_options.append({"label": label, "value": area_id})
-        except Exception:
-            district_options = []
-        if not district_options:
-            district_options = [
-                {"label": name, "value": number} for number, name in DISTRICTS.items()
-            ]
+        # Served from the persisted catalogue; never waits for the network.
+        district_options = await async_get_areas_catalogue(self.hass).async_options()
 
         language_options = [
             {"label": name, "value": code} for code, name in LANGUAGE_OPTIONS.items()
@@ -456,6 +505,21 @@ class SmhiAlertsOptionsFlowHandler(config_entries.OptionsFlow):
                         }
                     }
                 ),
+                vol.Optional(
+                    CONF_EXTRA_DISTRICTS,
+                    default=self.config_entry.options.get(
+                        CONF_EXTRA_DISTRICTS,
+                        self.config_entry.data.get(CONF_EXTRA_DISTRICTS, []),
+                    ),
+                ): selector(
+                    {
+                        "select": {
+                            "options": district_options,
+                            "multiple": True,
+                            "mode": "dropdown",
+                        }
+                    }
+                ),
                 vol.Optional(
                     CONF_LOCATION,
                     default=self.config_entry.options.get(
@@ -485,6 +549,13 @@ class SmhiAlertsOptionsFlowHandler(config_entries.OptionsFlow):
                         }
                     }
                 ),
+                vol.Optional(
+                    CONF_EXTRA_LOCATIONS,
+                    default=self.config_entry.options.get(
+                        CONF_EXTRA_LOCATIONS,
+                        self.config_entry.data.get(CONF_EXTRA_LOCATIONS, []),
+                    ),
+                ): selector({"object": {}}),
                 vol.Optional(
                     CONF_LANGUAGE,
                     default=self.config_entry.options.get(
@@ -517,6 +588,15 @@ class SmhiAlertsOptionsFlowHandler(config_entries.OptionsFlow):
                         ),
                     ),
                 ): cv.boolean,
+                vol.Optional(
+                    CONF_ALERT_ENTITIES,
+                    default=self.config_entry.options.get(
+                        CONF_ALERT_ENTITIES,
+                        self.config_entry.data.get(
+                            CONF_ALERT_ENTITIES, DEFAULT_ALERT_ENTITIES
+                        ),
+                    ),
+                ): cv.boolean,
                 vol.Optional(
                     CONF_EXCLUDE_SEA,
                     default=self.config_entry.options.get(
@@ -530,9 +610,44 @@ class SmhiAlertsOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_MESSAGE_TYPES,
                     default=current_message_types,
                 ): cv.multi_select(message_options),
+                vol.Optional(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MIN_SCAN_INTERVAL,
+                        DEFAULT_MIN_SCAN_INTERVAL.total_seconds() / 60,
+                    ),
+                ): selector(
+                    {
+                        "number": {
+                            "min": 1,
+                            "max": 60,
+                            "step": 1,
+                            "unit_of_measurement": "min",
+                        }
+                    }
+                ),
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_SCAN_INTERVAL,
+                        DEFAULT_MAX_SCAN_INTERVAL.total_seconds() / 60,
+                    ),
+                ): selector(
+                    {
+                        "number": {
+                            "min": 5,
+                            "max": 360,
+                            "step": 5,
+                            "unit_of_measurement": "min",
+                        }
+                    }
+                ),
             }
         )
 
+        if errors:
+            # Keep what was typed so it can be corrected.
+            data_schema = self.add_suggested_values_to_schema(data_schema, user_input)
         return self.async_show_form(
             step_id="init",
             data_schema=data_schema,
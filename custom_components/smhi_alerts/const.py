@@ -12,6 +12,39 @@ CARD_SIDECAR_SUFFIXES = (".svg", ".png", ".jpg", ".jpeg", ".webp", ".gif")
 FRONTEND_DATA_KEY = f"{DOMAIN}_frontend"
 FRONTEND_DATA_COMPONENT_LISTENER = f"{DOMAIN}_component_listener"
 
+# Keys in hass.data[DOMAIN] holding the shared warnings hub and areas catalogue
+DATA_HUB = "hub"
+DATA_AREAS = "areas"
+# Sent when an entry gives up the feed's diagnostic sensors
+SIGNAL_FEED_DIAGNOSTICS_RELEASED = f"{DOMAIN}_feed_diagnostics_released"
+
+# Persisted copy of the last warnings payload and its cache validators
+STORAGE_KEY = f"{DOMAIN}.warnings"
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds
+SNAPSHOT_MAX_AGE = timedelta(hours=24)
+# Persisted areas catalogue; districts rarely change
+AREAS_STORAGE_KEY = f"{DOMAIN}.areas"
+AREAS_SAVE_DELAY = 10  # seconds
+AREAS_TTL = timedelta(days=7)
+# Wait after a failed areas download before trying again
+AREAS_RETRY = timedelta(minutes=30)
+# Bus events fired by the alert diff, with the changed alert as payload
+EVENT_ALERT_NEW = f"{DOMAIN}_alert_new"
+EVENT_ALERT_UPDATED = f"{DOMAIN}_alert_updated"
+EVENT_ALERT_EXPIRED = f"{DOMAIN}_alert_expired"
+# Rendered messages kept per entry between polls. Only those of the last
+# pass are kept, so this bounds entries that match very many areas.
+RENDER_CACHE_SIZE = 512
+# Recent samples kept per performance counter (diagnostics)
+METRICS_SAMPLES = 100
+# profile_next_updates service
+SERVICE_PROFILE_NEXT_UPDATES = "profile_next_updates"
+ATTR_UPDATES = "updates"
+PROFILE_MAX_UPDATES = 20
+# Time the entry builds of the last profiled update get before the report
+PROFILE_SETTLE_DELAY = 30  # seconds
+
 CONF_MODE = "mode"
 CONF_LATITUDE = "latitude"
 CONF_LONGITUDE = "longitude"
@@ -24,6 +57,13 @@ CONF_INCLUDE_MESSAGES = "include_messages"
 CONF_INCLUDE_GEOMETRY = "include_geometry"
 CONF_EXCLUDED_MESSAGE_TYPES = "excluded_message_types"  # legacy support
 CONF_MESSAGE_TYPES = "message_types"
+# Additional selectors evaluated by the same entry
+CONF_EXTRA_DISTRICTS = "extra_districts"
+CONF_EXTRA_LOCATIONS = "extra_locations"
+# One sensor per active alert instead of a full messages attribute
+CONF_ALERT_ENTITIES = "alert_entities"
+DEFAULT_ALERT_ENTITIES = False
+ALERT_ENTITY_UNIQUE_ID_INFIX = "_alert_"
 LANGUAGES = ["en", "sv"]
 LANGUAGE_OPTIONS = {"en": "Engelska", "sv": "Svenska"}
 DEFAULT_NAME = "SMHI Alerts"
@@ -36,6 +76,19 @@ DEFAULT_MODE = "district"  # "district" | "coordinate"
 DEFAULT_RADIUS_KM = 10
 DEFAULT_EXCLUDE_SEA = False
 SCAN_INTERVAL = timedelta(minutes=5)
+# Adaptive polling, see scheduler.py. Bounds are options in minutes.
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+# Used while an orange or red alert that an entry shows is active or near
+DEFAULT_MIN_SCAN_INTERVAL = timedelta(minutes=1)
+DEFAULT_MAX_SCAN_INTERVAL = timedelta(minutes=30)
+ESCALATION_CODES = frozenset({"ORANGE", "RED"})
+ESCALATION_LOOKAHEAD = timedelta(hours=3)
+QUIET_PERIOD = timedelta(hours=1)
+PUBLISH_GRACE = timedelta(minutes=1)
+PUBLISH_HISTORY = 8
+# Shortest time between two network fetches, however many refreshes arrive
+FETCH_MIN_GAP = 10  # seconds
 
 # Static fallback; prefer dynamically fetched areas from SMHI API when available
 DISTRICTS = {
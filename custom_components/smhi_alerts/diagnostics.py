@@ -0,0 +1,78 @@
+"""Diagnostics for SMHI Alert: fetch and processing performance counters."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_EXTRA_LOCATIONS,
+    CONF_LATITUDE,
+    CONF_LOCATION,
+    CONF_LONGITUDE,
+    DATA_AREAS,
+    DATA_HUB,
+    DOMAIN,
+)
+from .geometry import simplified_cache
+from .metrics import Samples, attributes_size
+from .sensor import SmhiAlertCoordinator, mode_label
+
+# Coordinates may point at someone's home.
+TO_REDACT = {CONF_LATITUDE, CONF_LONGITUDE, CONF_LOCATION, CONF_EXTRA_LOCATIONS}
+
+
+def _seconds(value: Any) -> float | None:
+    return None if value is None else value.total_seconds()
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return counters of the shared hub, this entry and every mode."""
+    domain_data = hass.data.get(DOMAIN, {})
+    coordinator: SmhiAlertCoordinator = domain_data[entry.entry_id]["coordinator"]
+    hub = coordinator.hub
+    coordinators = [
+        value["coordinator"]
+        for key, value in domain_data.items()
+        if key not in (DATA_HUB, DATA_AREAS)
+    ]
+
+    # _process_data time over every entry, by filter mode.
+    by_mode: dict[str, Samples] = {}
+    for other in coordinators:
+        samples = by_mode.setdefault(mode_label(other), Samples(maxlen=None))
+        for seconds in other.process_times:
+            samples.add(seconds)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "hub": {
+            "update_interval_s": _seconds(hub.update_interval),
+            "base_interval_s": _seconds(hub.base_interval),
+            "failure_count": hub.failure_count,
+            "publish_cadence_s": _seconds(hub.scheduler.cadence),
+            "last_success": hub.last_success,
+            "last_update_success": hub.last_update_success,
+            "entries": len(coordinators),
+            **hub.metrics.as_dict(),
+            "geometry_cache_hit_rate": simplified_cache().hit_rate,
+        },
+        "this_entry": {
+            "mode": mode_label(coordinator),
+            "process_ms": coordinator.process_times.summary(1000),
+            "render_cache_entries": len(coordinator.render_cache),
+            "render_cache_hit_rate": coordinator.render_cache.hit_rate,
+            "attributes_bytes": attributes_size(coordinator.data),
+        },
+        "process_ms_by_mode": {
+            mode: samples.summary(1000) for mode, samples in sorted(by_mode.items())
+        },
+    }
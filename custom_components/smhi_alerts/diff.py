@@ -0,0 +1,55 @@
+"""Compare consecutive filtered alert lists of one entry."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def message_key(msg: dict[str, Any]) -> str:
+    """Return the stable identity of a rendered message.
+
+    SMHI warning and area ids are used when present; otherwise the event,
+    area and start time identify the alert.
+    """
+    if msg.get("id"):
+        return str(msg["id"])
+    return "|".join(str(msg.get(key, "")) for key in ("event", "area", "start"))
+
+
+def compact_message(msg: dict[str, Any]) -> dict[str, Any]:
+    """Return the message without its (potentially large) geometry."""
+    return {key: value for key, value in msg.items() if key != "geometry"}
+
+
+@dataclass(slots=True)
+class AlertDiff:
+    """Alerts that appeared, changed or disappeared between two updates."""
+
+    new: list[dict[str, Any]] = field(default_factory=list)
+    updated: list[dict[str, Any]] = field(default_factory=list)
+    expired: list[dict[str, Any]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.new or self.updated or self.expired)
+
+
+def diff_messages(
+    previous: list[dict[str, Any]], current: list[dict[str, Any]]
+) -> AlertDiff:
+    """Diff two message lists by stable identity."""
+    diff = AlertDiff()
+    before = {message_key(msg): msg for msg in previous}
+    seen: set[str] = set()
+    for msg in current:
+        key = message_key(msg)
+        seen.add(key)
+        old = before.get(key)
+        if old is None:
+            diff.new.append(msg)
+        # Unchanged areas reuse the same rendered dict, so identity is cheap.
+        elif old is not msg and old != msg:
+            diff.updated.append(msg)
+    diff.expired = [msg for key, msg in before.items() if key not in seen]
+    return diff
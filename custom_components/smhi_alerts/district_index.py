@@ -0,0 +1,72 @@
+"""District lookup index for district-mode filtering."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import MARINE_AREA_IDS, MARINE_EVENT_CODES
+
+
+def is_marine_event(event_code: str, mho_class: str | None) -> bool:
+    """Return True if the event itself is a sea warning."""
+    return (
+        event_code in MARINE_EVENT_CODES
+        or event_code.endswith("_SEA")
+        or mho_class == "OCE"
+    )
+
+
+class PayloadDistrictIndex:
+    """Affected districts of every warning area in one payload.
+
+    Built once per fetched payload and shared by all district-mode
+    coordinators. Each affected area is stored as (names, marine), with the
+    sea decision made here once instead of once per entry.
+    Warning areas are keyed by object identity; the index keeps a
+    reference to the payload so those identities stay valid.
+    """
+
+    def __init__(self, payload: list[dict[str, Any]]) -> None:
+        """Index the affectedAreas of every warning area of the payload."""
+        self.payload = payload
+        self._affected: dict[int, list[tuple[dict[str, Any], bool]]] = {}
+        self._marine_areas: set[int] = set()
+        self._districts: dict[
+            str, dict[int, list[tuple[dict[str, Any], bool]]]
+        ] = {}
+        for alert in payload or []:
+            event_obj = alert.get("event", {}) or {}
+            event_code = str(event_obj.get("code", "")).upper()
+            mho_class = (event_obj.get("mhoClassification", {}) or {}).get("code")
+            mho_class = str(mho_class).upper() if mho_class else None
+            marine_event = is_marine_event(event_code, mho_class)
+            for area in alert.get("warningAreas") or []:
+                key = id(area)
+                affected: list[tuple[dict[str, Any], bool]] = []
+                marine_area = False
+                for item in area.get("affectedAreas", []) or []:
+                    district = str(item.get("id"))
+                    marine_district = district in MARINE_AREA_IDS
+                    marine_area = marine_area or marine_district
+                    entry = (item, marine_event or marine_district)
+                    affected.append(entry)
+                    self._districts.setdefault(district, {}).setdefault(
+                        key, []
+                    ).append(entry)
+                self._affected[key] = affected
+                if marine_event or marine_area:
+                    self._marine_areas.add(key)
+
+    def affected(self, area: dict[str, Any]) -> list[tuple[dict[str, Any], bool]]:
+        """Return (names, marine) for each affected area of a warning area."""
+        return self._affected.get(id(area), [])
+
+    def district(
+        self, district: str
+    ) -> dict[int, list[tuple[dict[str, Any], bool]]]:
+        """Return {id(warning area): [(names, marine)]} for one district."""
+        return self._districts.get(district, {})
+
+    def is_marine(self, area: dict[str, Any]) -> bool:
+        """Return True if the warning area is a sea area or a sea warning."""
+        return id(area) in self._marine_areas
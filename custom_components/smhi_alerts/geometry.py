@@ -0,0 +1,603 @@
+"""Geometry indexing for coordinate-mode filtering."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from hashlib import sha1
+import json
+from math import cos, degrees, floor, radians
+from typing import Any
+
+from .cache import LRUCache
+
+try:  # Optional: vectorized path for large rings.
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Same sphere as the equirectangular projection used by the coordinator.
+EARTH_RADIUS_M = 6371000.0
+# Meters per degree of latitude on that sphere.
+METERS_PER_DEGREE = radians(1.0) * EARTH_RADIUS_M
+# Rings with at least this many vertices use NumPy when it is installed.
+NUMPY_MIN_VERTICES = 256
+# Cell size of the uniform lat/lon grid over warning-area boxes.
+GRID_CELL_DEGREES = 0.5
+# Geometry sent to the UI: Douglas-Peucker tolerance in degrees (~100 m)
+# and coordinate precision (5 decimals is ~1 m).
+SIMPLIFY_TOLERANCE = 0.001
+COORDINATE_DECIMALS = 5
+# Simplified geometries kept, keyed by upstream hash and tolerance.
+_SIMPLIFIED: LRUCache[tuple[str, float], Any] = LRUCache(256)
+
+
+def simplified_cache() -> LRUCache[tuple[str, float], Any]:
+    """Return the cache of simplified geometries, e.g. for its hit rate."""
+    return _SIMPLIFIED
+
+
+def radius_to_degrees(lat: float, radius_m: float) -> tuple[float, float]:
+    """Return the (lon, lat) degree span of radius_m around latitude lat.
+
+    This matches the equirectangular projection used for the exact test, so
+    a geometry whose box is farther away than this span can never match.
+    """
+    dlat = degrees(radius_m / EARTH_RADIUS_M)
+    scale = cos(radians(lat))
+    if scale <= 1e-9:
+        return 360.0, dlat
+    return degrees(radius_m / (EARTH_RADIUS_M * scale)), dlat
+
+
+def project(
+    lons: array, lats: array, lon0: float, lat0: float
+) -> tuple[Any, Any]:
+    """Project vertices to meters around (lon0, lat0), each exactly once.
+
+    Returns flat x/y buffers: array('d') normally, NumPy arrays for large
+    rings when NumPy is available.
+    """
+    kx = METERS_PER_DEGREE * cos(radians(lat0))
+    ky = METERS_PER_DEGREE
+    if np is not None and len(lons) >= NUMPY_MIN_VERTICES:
+        xs = (np.frombuffer(lons, dtype=np.float64) - lon0) * kx
+        ys = (np.frombuffer(lats, dtype=np.float64) - lat0) * ky
+        return xs, ys
+    return (
+        array("d", [(lon - lon0) * kx for lon in lons]),
+        array("d", [(lat - lat0) * ky for lat in lats]),
+    )
+
+
+def ring_contains(xs: Any, ys: Any, px: float, py: float) -> bool:
+    """Ray-cast (px, py) against a projected ring (implicitly closed)."""
+    n = len(xs)
+    if n == 0:
+        return False
+    if np is not None and isinstance(xs, np.ndarray):
+        xj = np.roll(xs, 1)
+        yj = np.roll(ys, 1)
+        crosses = (ys > py) != (yj > py)
+        x_at = (xj - xs) * (py - ys) / (yj - ys + 1e-12) + xs
+        return bool(np.count_nonzero(crosses & (px < x_at)) % 2)
+    inside = False
+    xj = xs[n - 1]
+    yj = ys[n - 1]
+    for i in range(n):
+        xi = xs[i]
+        yi = ys[i]
+        if ((yi > py) != (yj > py)) and (
+            px < (xj - xi) * (py - yi) / (yj - yi + 1e-12) + xi
+        ):
+            inside = not inside
+        xj = xi
+        yj = yi
+    return inside
+
+
+def within_distance(
+    xs: Any, ys: Any, px: float, py: float, radius_m: float, closed: bool
+) -> bool:
+    """Return True if any segment of the projected path is within radius_m."""
+    n = len(xs)
+    if n < 2:
+        return False
+    r2 = radius_m * radius_m
+    if np is not None and isinstance(xs, np.ndarray):
+        if closed:
+            bx = np.roll(xs, -1)
+            by = np.roll(ys, -1)
+            ax, ay = xs, ys
+        else:
+            ax, ay, bx, by = xs[:-1], ys[:-1], xs[1:], ys[1:]
+        abx = bx - ax
+        aby = by - ay
+        denom = abx * abx + aby * aby
+        dot = (px - ax) * abx + (py - ay) * aby
+        t = np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
+        np.clip(t, 0.0, 1.0, out=t)
+        dx = ax + t * abx - px
+        dy = ay + t * aby - py
+        return bool(np.any(dx * dx + dy * dy <= r2))
+
+    last = n if closed else n - 1
+    for i in range(last):
+        ax = xs[i]
+        ay = ys[i]
+        j = i + 1 if i + 1 < n else 0
+        abx = xs[j] - ax
+        aby = ys[j] - ay
+        denom = abx * abx + aby * aby
+        if denom > 0:
+            t = ((px - ax) * abx + (py - ay) * aby) / denom
+            if t < 0.0:
+                t = 0.0
+            elif t > 1.0:
+                t = 1.0
+            dx = ax + t * abx - px
+            dy = ay + t * aby - py
+        else:
+            dx = ax - px
+            dy = ay - py
+        if dx * dx + dy * dy <= r2:
+            return True
+    return False
+
+
+@dataclass(slots=True)
+class GeometryPart:
+    """One Polygon (outer ring first) or LineString with its lon/lat box.
+
+    The outer ring (or line) is also kept as flat lon/lat buffers so it can
+    be projected once per test instead of once per edge.
+    """
+
+    kind: str  # "polygon" | "line"
+    coords: list[Any]
+    lons: array
+    lats: array
+    min_lon: float
+    min_lat: float
+    max_lon: float
+    max_lat: float
+
+    def near(self, lon: float, lat: float, dlon: float, dlat: float) -> bool:
+        """Return True if (lon, lat) is inside the box grown by (dlon, dlat)."""
+        return (
+            self.min_lon - dlon <= lon <= self.max_lon + dlon
+            and self.min_lat - dlat <= lat <= self.max_lat + dlat
+        )
+
+    def within_radius(
+        self, lon: float, lat: float, radius_m: float, inside: bool = True
+    ) -> bool:
+        """Exact test: point inside the polygon or within radius_m of it.
+
+        inside=False skips the point-in-polygon part, for callers that
+        already know from contains that the point is outside.
+        """
+        # Project around the point itself, so the point is the origin.
+        xs, ys = project(self.lons, self.lats, lon, lat)
+        if self.kind == "polygon":
+            # Only the outer ring counts; holes are ignored for simplicity.
+            if inside and ring_contains(xs, ys, 0.0, 0.0):
+                return True
+            return within_distance(xs, ys, 0.0, 0.0, radius_m, closed=True)
+        return within_distance(xs, ys, 0.0, 0.0, radius_m, closed=False)
+
+    def contains(self, lon: float, lat: float) -> bool:
+        """Return True if a polygon part's outer ring contains (lon, lat).
+
+        The projection is linear, so the ray cast runs on the raw degrees.
+        """
+        return self.kind == "polygon" and ring_contains(
+            self.lons, self.lats, lon, lat
+        )
+
+    @classmethod
+    def from_coords(cls, kind: str, coords: Any) -> GeometryPart | None:
+        """Build from Polygon rings or LineString coordinates."""
+        points = coords[0] if kind == "polygon" and coords else coords
+        if not isinstance(points, list) or len(points) < 2:
+            # Degenerate parts can never match the exact tests either.
+            return None
+        try:
+            lons = array("d", [float(pt[0]) for pt in points])
+            lats = array("d", [float(pt[1]) for pt in points])
+        except (TypeError, ValueError, IndexError):
+            return None
+        return cls(
+            kind, coords, lons, lats, min(lons), min(lats), max(lons), max(lats)
+        )
+
+
+@dataclass(slots=True)
+class AreaGeometry:
+    """All geometry parts of one warning area plus their combined box."""
+
+    parts: list[GeometryPart]
+    min_lon: float
+    min_lat: float
+    max_lon: float
+    max_lat: float
+
+    def near(self, lon: float, lat: float, dlon: float, dlat: float) -> bool:
+        """Return True if (lon, lat) is inside the box grown by (dlon, dlat)."""
+        return (
+            self.min_lon - dlon <= lon <= self.max_lon + dlon
+            and self.min_lat - dlat <= lat <= self.max_lat + dlat
+        )
+
+    def within_radius(
+        self,
+        lon: float,
+        lat: float,
+        radius_m: float,
+        dlon: float,
+        dlat: float,
+        inside: bool = True,
+    ) -> bool:
+        """Return True if any part is within radius_m of (lon, lat).
+
+        (dlon, dlat) is the degree span of the radius, see radius_to_degrees.
+        inside=False only measures the distance, see GeometryPart.
+        """
+        # Constant-time rejection: the point must lie in the bounding box
+        # grown by the radius before any exact test is worth running.
+        if not self.near(lon, lat, dlon, dlat):
+            return False
+        for part in self.parts:
+            if part.near(lon, lat, dlon, dlat) and part.within_radius(
+                lon, lat, radius_m, inside
+            ):
+                return True
+        return False
+
+    def contains(self, lon: float, lat: float) -> bool:
+        """Return True if (lon, lat) is inside any polygon part."""
+        if not self.near(lon, lat, 0.0, 0.0):
+            return False
+        return any(
+            part.near(lon, lat, 0.0, 0.0) and part.contains(lon, lat)
+            for part in self.parts
+        )
+
+    @classmethod
+    def from_container(cls, container: Any) -> AreaGeometry | None:
+        """Build from an area's GeoJSON FeatureCollection, Feature or geometry."""
+        if not isinstance(container, dict):
+            return None
+        if container.get("type") == "FeatureCollection":
+            features = container.get("features") or []
+        else:
+            # Feature or raw geometry
+            features = [container]
+
+        parts: list[GeometryPart] = []
+        for feature in features:
+            if not isinstance(feature, dict):
+                continue
+            geom = feature.get("geometry", feature)
+            if not isinstance(geom, dict):
+                continue
+            gtype = geom.get("type")
+            coords = geom.get("coordinates")
+            if not gtype or coords is None:
+                continue
+            if gtype == "Polygon":
+                candidates = [("polygon", coords)]
+            elif gtype == "LineString":
+                candidates = [("line", coords)]
+            elif gtype == "MultiPolygon":
+                candidates = [("polygon", poly) for poly in coords or []]
+            elif gtype == "MultiLineString":
+                candidates = [("line", line) for line in coords or []]
+            else:
+                continue
+            for kind, part_coords in candidates:
+                part = GeometryPart.from_coords(kind, part_coords)
+                if part is not None:
+                    parts.append(part)
+
+        if not parts:
+            return None
+        return cls(
+            parts,
+            min(p.min_lon for p in parts),
+            min(p.min_lat for p in parts),
+            max(p.max_lon for p in parts),
+            max(p.max_lat for p in parts),
+        )
+
+
+class PayloadGeometryIndex:
+    """Precomputed geometry boxes for every warning area in one payload.
+
+    Built once per fetched payload and shared by all coordinate-mode
+    coordinators. Areas are keyed by object identity; the index keeps a
+    reference to the payload so those identities stay valid.
+
+    Area boxes are also bucketed into a uniform lat/lon grid, so a radius
+    query only looks at areas whose box shares a cell with the query box.
+    """
+
+    def __init__(self, payload: list[dict[str, Any]]) -> None:
+        """Index every warning area of the payload."""
+        self.payload = payload
+        self._areas: dict[int, AreaGeometry | None] = {}
+        self._grid: dict[tuple[int, int], list[int]] = {}
+        self._matches: dict[
+            tuple[float, float, float, frozenset[int]], frozenset[int]
+        ] = {}
+        for alert in payload or []:
+            for area in alert.get("warningAreas") or []:
+                geometry = AreaGeometry.from_container(area.get("area"))
+                self._areas[id(area)] = geometry
+                if geometry is None:
+                    continue
+                for cell in _cells(
+                    geometry.min_lon,
+                    geometry.min_lat,
+                    geometry.max_lon,
+                    geometry.max_lat,
+                ):
+                    self._grid.setdefault(cell, []).append(id(area))
+        if self._grid:
+            self._cell_bounds = (
+                min(cx for cx, _ in self._grid),
+                min(cy for _, cy in self._grid),
+                max(cx for cx, _ in self._grid),
+                max(cy for _, cy in self._grid),
+            )
+
+    def get(self, area: dict[str, Any]) -> AreaGeometry | None:
+        """Return the indexed geometry of a warning area."""
+        try:
+            return self._areas[id(area)]
+        except KeyError:
+            return AreaGeometry.from_container(area.get("area"))
+
+    def query(
+        self,
+        lon: float,
+        lat: float,
+        radius_m: float,
+        known: frozenset[int] = frozenset(),
+    ) -> frozenset[int]:
+        """Return id() of every area within radius_m of (lon, lat).
+
+        known (the areas of the district containing the point) are settled
+        by a point-in-polygon test on the raw vertices, which needs no
+        projection; only when the point is outside is the distance to their
+        edges measured. Other areas get the exact radius test. Results are
+        cached per point, radius and known set, so entries watching the
+        same location share one evaluation.
+        """
+        key = (lon, lat, radius_m, known)
+        cached = self._matches.get(key)
+        if cached is not None:
+            return cached
+        dlon, dlat = radius_to_degrees(lat, radius_m)
+        candidates: set[int] = set()
+        if self._grid:
+            min_cx, min_cy, max_cx, max_cy = self._cell_bounds
+            for cell in _cells(
+                lon - dlon,
+                lat - dlat,
+                lon + dlon,
+                lat + dlat,
+                (min_cx, min_cy, max_cx, max_cy),
+            ):
+                candidates.update(self._grid.get(cell, ()))
+        matched: set[int] = set()
+        for key_id in candidates:
+            geometry = self._areas[key_id]
+            if key_id in known:
+                if geometry.contains(lon, lat) or geometry.within_radius(
+                    lon, lat, radius_m, dlon, dlat, inside=False
+                ):
+                    matched.add(key_id)
+            elif geometry.within_radius(lon, lat, radius_m, dlon, dlat):
+                matched.add(key_id)
+        matches = frozenset(matched)
+        # Dict assignment is atomic; a concurrent duplicate just recomputes.
+        self._matches[key] = matches
+        return matches
+
+
+def _cells(
+    min_lon: float,
+    min_lat: float,
+    max_lon: float,
+    max_lat: float,
+    clamp: tuple[int, int, int, int] | None = None,
+):
+    """Yield the grid cells covered by a lon/lat box."""
+    x0 = floor(min_lon / GRID_CELL_DEGREES)
+    y0 = floor(min_lat / GRID_CELL_DEGREES)
+    x1 = floor(max_lon / GRID_CELL_DEGREES)
+    y1 = floor(max_lat / GRID_CELL_DEGREES)
+    if clamp is not None:
+        x0, y0 = max(x0, clamp[0]), max(y0, clamp[1])
+        x1, y1 = min(x1, clamp[2]), min(y1, clamp[3])
+    for cx in range(x0, x1 + 1):
+        for cy in range(y0, y1 + 1):
+            yield cx, cy
+
+
+class PayloadGeometryRefs:
+    """Warning-area geometry of one payload by reference, for the UI.
+
+    A reference is "<warning id>:<area id>", the same value as a message's
+    id. Geometry is served simplified and quantized; the ETag is the hash
+    of the upstream geometry plus the tolerance, computed on first request.
+    """
+
+    def __init__(self, payload: list[dict[str, Any]]) -> None:
+        """Collect the geometry of every identifiable warning area."""
+        self.payload = payload
+        self._geometries: dict[str, Any] = {}
+        self._hashes: dict[str, str] = {}
+        for alert in payload or []:
+            warning_id = alert.get("id")
+            for area in alert.get("warningAreas") or []:
+                area_id = area.get("id")
+                geometry = area.get("area")
+                if warning_id is None or area_id is None or not geometry:
+                    continue
+                self._geometries[geometry_ref(warning_id, area_id)] = geometry
+
+    def get(
+        self, ref: str, tolerance: float = SIMPLIFY_TOLERANCE
+    ) -> tuple[Any, str] | None:
+        """Return (simplified geometry, etag) for a reference, or None."""
+        geometry = self._geometries.get(ref)
+        if geometry is None:
+            return None
+        digest = self._hashes.get(ref)
+        if digest is None:
+            digest = self._hashes[ref] = geometry_hash(geometry)
+        # Same upstream polygon in a later payload: reuse the simplified copy.
+        key = (digest, tolerance)
+        simplified = _SIMPLIFIED.get(key)
+        if simplified is None:
+            simplified = simplify_geometry(geometry, tolerance)
+            _SIMPLIFIED.put(key, simplified)
+        return simplified, f'"{digest}-{tolerance:g}"'
+
+
+def geometry_ref(warning_id: Any, area_id: Any) -> str:
+    """Return the reference of a warning area's geometry."""
+    return f"{warning_id}:{area_id}"
+
+
+def geometry_hash(geometry: Any) -> str:
+    """Return a content hash of a GeoJSON object."""
+    body = json.dumps(geometry, sort_keys=True, separators=(",", ":"))
+    return sha1(body.encode(), usedforsecurity=False).hexdigest()
+
+
+def simplify_line(points: list[Any], tolerance: float) -> list[Any]:
+    """Douglas-Peucker simplification of a line or closed ring (degrees)."""
+    n = len(points)
+    if tolerance <= 0 or n < 3:
+        return list(points)
+    tolerance2 = tolerance * tolerance
+    keep = [False] * n
+    keep[0] = keep[n - 1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first][0], points[first][1]
+        dx = points[last][0] - ax
+        dy = points[last][1] - ay
+        denom = dx * dx + dy * dy
+        farthest = -1.0
+        index = first
+        for i in range(first + 1, last):
+            px, py = points[i][0], points[i][1]
+            if denom > 0:
+                t = ((px - ax) * dx + (py - ay) * dy) / denom
+                t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+                ex = ax + t * dx - px
+                ey = ay + t * dy - py
+            else:
+                # Closed ring: measure from the shared start/end point.
+                ex = px - ax
+                ey = py - ay
+            distance2 = ex * ex + ey * ey
+            if distance2 > farthest:
+                farthest = distance2
+                index = i
+        if farthest > tolerance2:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _quantize(points: list[Any], decimals: int) -> list[list[float]]:
+    """Round coordinates and drop consecutive duplicates this creates."""
+    out: list[list[float]] = []
+    for point in points:
+        rounded = [round(float(value), decimals) for value in point[:2]]
+        if not out or out[-1] != rounded:
+            out.append(rounded)
+    return out
+
+
+def _simplify_path(
+    points: Any, tolerance: float, decimals: int, ring: bool
+) -> Any:
+    """Simplify and quantize one path, keeping rings valid."""
+    if not isinstance(points, list):
+        return points
+    minimum = 4 if ring else 2
+    simplified = _quantize(simplify_line(points, tolerance), decimals)
+    if len(simplified) < minimum:
+        # Too small to simplify: fall back to quantizing only.
+        quantized = _quantize(points, decimals)
+        return quantized if len(quantized) >= minimum else points
+    return simplified
+
+
+def simplify_geometry(
+    geojson: Any,
+    tolerance: float = SIMPLIFY_TOLERANCE,
+    decimals: int = COORDINATE_DECIMALS,
+) -> Any:
+    """Return a simplified, quantized copy of a GeoJSON object.
+
+    Unknown or malformed members are copied unchanged.
+    """
+    if not isinstance(geojson, dict):
+        return geojson
+    gtype = geojson.get("type")
+    coords = geojson.get("coordinates")
+    try:
+        if gtype == "FeatureCollection":
+            return {
+                **geojson,
+                "features": [
+                    simplify_geometry(feature, tolerance, decimals)
+                    for feature in geojson.get("features") or []
+                ],
+            }
+        if gtype == "Feature":
+            return {
+                **geojson,
+                "geometry": simplify_geometry(
+                    geojson.get("geometry"), tolerance, decimals
+                ),
+            }
+        if gtype == "GeometryCollection":
+            return {
+                **geojson,
+                "geometries": [
+                    simplify_geometry(geometry, tolerance, decimals)
+                    for geometry in geojson.get("geometries") or []
+                ],
+            }
+        if gtype == "LineString":
+            coords = _simplify_path(coords, tolerance, decimals, ring=False)
+        elif gtype == "MultiLineString":
+            coords = [
+                _simplify_path(line, tolerance, decimals, ring=False)
+                for line in coords
+            ]
+        elif gtype == "Polygon":
+            coords = [
+                _simplify_path(ring, tolerance, decimals, ring=True)
+                for ring in coords
+            ]
+        elif gtype == "MultiPolygon":
+            coords = [
+                [_simplify_path(ring, tolerance, decimals, ring=True) for ring in poly]
+                for poly in coords
+            ]
+        else:
+            return geojson
+    except (TypeError, ValueError, IndexError):
+        return geojson
+    return {**geojson, "coordinates": coords}
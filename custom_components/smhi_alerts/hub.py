@@ -0,0 +1,594 @@
+"""Shared SMHI warnings feed used by every SMHI Alert config entry."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import random
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError, ClientTimeout
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_AREAS,
+    DATA_HUB,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_NAME,
+    DOMAIN,
+    FETCH_MIN_GAP,
+    SCAN_INTERVAL,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    WARNINGS_URL,
+)
+from .district_index import PayloadDistrictIndex
+from .geometry import PayloadGeometryIndex, PayloadGeometryRefs
+from .metrics import FetchMetrics
+from .scheduler import PollScheduler
+
+if TYPE_CHECKING:
+    from .profiler import UpdateProfiler
+
+try:  # orjson ships with Home Assistant; fall back to the stdlib decoder.
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _decode_payload(body: bytes) -> tuple[list[dict[str, Any]], float]:
+    """Decode the warnings document; runs in the executor.
+
+    Returns the payload and the time spent decoding, which is how long the
+    event loop used to be blocked by ``response.json()``.
+    """
+    decode_start = monotonic()
+    payload = json_loads(body)
+    if not isinstance(payload, list):
+        raise ValueError("Expected a list of warnings")
+    return payload, monotonic() - decode_start
+
+
+def async_get_hub(hass: HomeAssistant) -> "SmhiWarningsHub":
+    """Return the domain-wide hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(DATA_HUB)
+    if hub is None:
+        hub = SmhiWarningsHub(hass)
+        domain_data[DATA_HUB] = hub
+    return hub
+
+
+async def async_release_hub(hass: HomeAssistant) -> None:
+    """Shut down and drop the hub once no config entry uses it anymore."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if any(key not in (DATA_HUB, DATA_AREAS) for key in domain_data):
+        return
+    hub: SmhiWarningsHub | None = domain_data.pop(DATA_HUB, None)
+    if hub is not None:
+        await hub.async_shutdown()
+
+
+async def async_remove_snapshot(hass: HomeAssistant) -> None:
+    """Delete the persisted payload snapshot."""
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY).async_remove()
+
+
+class SmhiWarningsHub(DataUpdateCoordinator[list[dict[str, Any]]]):
+    """Fetch the SMHI warnings document once per interval for all entries.
+
+    The hub owns the HTTP session, the conditional request headers and the
+    decoded payload. Entry coordinators subscribe as listeners and apply
+    their own filters to the shared payload.
+
+    The last payload and its ETag/Last-Modified are persisted, so after a
+    restart entries are built from the snapshot right away and the hub
+    revalidates it with a conditional request in the background.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.session = aiohttp_client.async_get_clientsession(hass)
+        # Overridable, e.g. to run against a local stand-in server.
+        self.warnings_url = WARNINGS_URL
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._last_success: str | None = None
+        self._failure_count: int = 0
+        self._base_interval = SCAN_INTERVAL
+        # Retry-After of the last 429, the least the next backoff may wait.
+        self._retry_after: timedelta | None = None
+        self._first_fetch_lock = asyncio.Lock()
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._snapshot_loaded = False
+        self._revalidate_snapshot = False
+        self._indexes: dict[type, Any] = {}
+        self._index_lock = threading.Lock()
+        self._scheduler = PollScheduler()
+        self._inflight: asyncio.Task[list[dict[str, Any]]] | None = None
+        self._last_fetch: float | None = None
+        self._poll_bounds: dict[str, tuple[timedelta, timedelta]] = {}
+        # Orange and red alert windows each entry shows, see scheduler.py.
+        self._escalations: dict[str, tuple[tuple[float, float], ...]] = {}
+        # Request counters for diagnostics, in bounded ring buffers.
+        self.metrics = FetchMetrics()
+        # Armed by the profile_next_updates service, None otherwise.
+        self.profiler: UpdateProfiler | None = None
+        # Called after every poll; regular listeners only on new payloads.
+        self._poll_listeners: list[CALLBACK_TYPE] = []
+        # Entry whose sensor platform holds the hub's diagnostic sensors.
+        self.diagnostics_owner: str | None = None
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            # The hub is shared by all entries and must not be tied to the
+            # lifecycle of whichever entry happened to create it.
+            config_entry=None,
+            name=DEFAULT_NAME,
+            update_interval=SCAN_INTERVAL,
+            # A 304 returns the same payload; entries need not be woken.
+            always_update=False,
+        )
+
+    @property
+    def last_success(self) -> str | None:
+        """Return the UTC ISO timestamp of the last successful poll."""
+        return self._last_success
+
+    @property
+    def scheduler(self) -> PollScheduler:
+        """Return the adaptive poll scheduler."""
+        return self._scheduler
+
+    @property
+    def failure_count(self) -> int:
+        """Return the number of polls that failed in a row."""
+        return self._failure_count
+
+    @property
+    def base_interval(self) -> timedelta:
+        """Return the interval that failures back off from."""
+        return self._base_interval
+
+    @callback
+    def async_add_poll_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call update_callback after every poll, including 304s and failures.
+
+        Returns a function that removes the listener again.
+        """
+        self._poll_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in self._poll_listeners:
+                self._poll_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Notify the poll listeners; regular listeners follow if data changed."""
+        for update_callback in list(self._poll_listeners):
+            update_callback()
+
+    @callback
+    def async_claim_diagnostics(self, entry_id: str) -> bool:
+        """Return True if entry_id now holds the hub's diagnostic sensors.
+
+        The counters belong to the shared feed, so only one entry creates
+        them: the first to ask, until it releases them.
+        """
+        if self.diagnostics_owner in (None, entry_id):
+            self.diagnostics_owner = entry_id
+            return True
+        return False
+
+    @callback
+    def async_release_diagnostics(self, entry_id: str) -> None:
+        """Give up the diagnostic sensors if entry_id holds them."""
+        if self.diagnostics_owner == entry_id:
+            self.diagnostics_owner = None
+
+    @callback
+    def async_set_poll_bounds(
+        self, entry_id: str, bounds: tuple[timedelta, timedelta] | None
+    ) -> None:
+        """Set or drop (bounds=None) the poll interval bounds of an entry.
+
+        The hub serves every entry, so the shortest minimum and the shortest
+        maximum of all entries apply. Takes effect from the next poll.
+        """
+        if bounds is None:
+            self._poll_bounds.pop(entry_id, None)
+        else:
+            self._poll_bounds[entry_id] = bounds
+        if self._poll_bounds:
+            low = min(lo for lo, _ in self._poll_bounds.values())
+            high = min(hi for _, hi in self._poll_bounds.values())
+        else:
+            low = DEFAULT_MIN_SCAN_INTERVAL
+            high = DEFAULT_MAX_SCAN_INTERVAL
+        self._scheduler.min_interval = low
+        self._scheduler.max_interval = max(low, high)
+
+    @callback
+    def async_set_escalations(
+        self, entry_id: str, windows: tuple[tuple[float, float], ...] | None
+    ) -> None:
+        """Set or drop (windows=None) the orange and red windows of an entry.
+
+        Only alerts that some entry shows may speed up polling, not every
+        warning in Sweden. Entries report after filtering, which is after
+        the hub picked the next interval, so a change reschedules the poll.
+        """
+        if windows:
+            if self._escalations.get(entry_id) == windows:
+                return
+            self._escalations[entry_id] = windows
+        elif self._escalations.pop(entry_id, None) is None:
+            return
+        if self._failure_count or self.data is None:
+            # Backing off, or not polled yet: the next success decides.
+            return
+        self.update_interval = self._scheduler.next_interval(
+            self._escalation_windows(), dt_util.utcnow()
+        )
+        self._base_interval = max(self.update_interval, SCAN_INTERVAL)
+        if self._unsub_refresh is not None:
+            self._schedule_refresh()
+
+    def _escalation_windows(self) -> list[tuple[float, float]]:
+        return [w for windows in self._escalations.values() for w in windows]
+
+    def geometry_index(self, payload: list[dict[str, Any]]) -> PayloadGeometryIndex:
+        """Return the geometry index for payload, building it once."""
+        return self._payload_index(PayloadGeometryIndex, payload)
+
+    def district_index(self, payload: list[dict[str, Any]]) -> PayloadDistrictIndex:
+        """Return the district index for payload, building it once."""
+        return self._payload_index(PayloadDistrictIndex, payload)
+
+    def geometry_refs(self, payload: list[dict[str, Any]]) -> PayloadGeometryRefs:
+        """Return the geometry-by-reference lookup for payload."""
+        return self._payload_index(PayloadGeometryRefs, payload)
+
+    def _payload_index(self, factory: type, payload: list[dict[str, Any]]) -> Any:
+        """Return the cached factory(payload), rebuilding it for a new payload.
+
+        Called from executor jobs of several coordinators, hence the lock.
+        """
+        with self._index_lock:
+            index = self._indexes.get(factory)
+            if index is None or index.payload is not payload:
+                index = factory(payload)
+                self._indexes[factory] = index
+                self.metrics.index_misses += 1
+            else:
+                self.metrics.index_hits += 1
+            return index
+
+    async def async_ensure_data(self) -> list[dict[str, Any]]:
+        """Return the shared payload, fetching it if nothing is loaded yet.
+
+        Entries that are set up concurrently wait for the same first fetch
+        instead of each starting their own request. A persisted snapshot is
+        served immediately and revalidated in the background.
+        """
+        async with self._first_fetch_lock:
+            if self.data is None and not self._snapshot_loaded:
+                await self._async_load_snapshot()
+            if self.data is None:
+                await self.async_refresh()
+            elif self._revalidate_snapshot:
+                self._revalidate_snapshot = False
+                self.hass.async_create_background_task(
+                    self.async_refresh(), name=f"{self.name} - revalidate snapshot"
+                )
+        if self.data is None:
+            raise UpdateFailed(
+                f"No SMHI data available: {self.last_exception}"
+            ) from self.last_exception
+        return self.data
+
+    async def _async_load_snapshot(self) -> None:
+        """Restore the last persisted payload and cache validators."""
+        self._snapshot_loaded = True
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # corrupt or unreadable file
+            _LOGGER.debug("Ignoring unreadable SMHI snapshot: %s", err)
+            return
+        if not isinstance(stored, dict) or not isinstance(
+            stored.get("payload"), list
+        ):
+            return
+        fetched_at = dt_util.parse_datetime(str(stored.get("fetched_at") or ""))
+        if fetched_at is None or dt_util.utcnow() - fetched_at > SNAPSHOT_MAX_AGE:
+            _LOGGER.debug("Ignoring stale SMHI snapshot from %s", fetched_at)
+            return
+
+        self.data = stored["payload"]
+        self._etag = stored.get("etag")
+        self._last_modified = stored.get("last_modified")
+        self._last_success = fetched_at.isoformat()
+        self._revalidate_snapshot = True
+        _LOGGER.debug(
+            "Restored SMHI snapshot from %s (warnings=%s, etag=%s)",
+            self._last_success,
+            len(self.data),
+            self._etag,
+        )
+
+    @callback
+    def _async_schedule_snapshot_save(self, payload: list[dict[str, Any]]) -> None:
+        """Persist a freshly downloaded payload together with its validators."""
+        snapshot = {
+            "payload": payload,
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "fetched_at": self._last_success,
+        }
+        self._store.async_delay_save(lambda: snapshot, SNAPSHOT_SAVE_DELAY)
+
+    async def _async_update_data(self) -> list[dict[str, Any]]:
+        """Return the warnings document, sharing one request per burst.
+
+        Refreshes that arrive while a fetch is running await that fetch
+        instead of starting their own. A refresh within FETCH_MIN_GAP of the
+        last successful fetch is answered from the current payload.
+        """
+        if self._inflight is None:
+            if (
+                self.data is not None
+                and self.last_update_success
+                and self._last_fetch is not None
+                and monotonic() - self._last_fetch < FETCH_MIN_GAP
+            ):
+                _LOGGER.debug(
+                    "Skipping SMHI fetch within %ss of the last one", FETCH_MIN_GAP
+                )
+                return self.data
+            self._inflight = self.hass.loop.create_task(
+                self._async_fetch(), name=f"{self.name} - fetch"
+            )
+            self._inflight.add_done_callback(self._async_fetch_done)
+        # Shielded so one cancelled caller does not abort the shared fetch.
+        return await asyncio.shield(self._inflight)
+
+    @callback
+    def _async_fetch_done(self, task: asyncio.Task) -> None:
+        """Forget the finished fetch so the next refresh starts a new one."""
+        if self._inflight is task:
+            self._inflight = None
+        self._last_fetch = monotonic()
+        if not task.cancelled():
+            # Retrieved here so a fetch nobody awaits anymore is not logged.
+            task.exception()
+
+    async def _async_fetch(self) -> list[dict[str, Any]]:
+        """Fetch the warnings document using conditional requests."""
+        req_start = monotonic()
+        profiler = self.profiler
+        record = profiler.async_begin_update() if profiler is not None else None
+        headers: dict[str, str] = {}
+        # Help upstream diagnose issues; also useful if SMHI applies any heuristics/rate-limits.
+        headers["User-Agent"] = (
+            f"HomeAssistant/{HA_VERSION} (custom_components.smhi_alerts)"
+        )
+        headers["Accept"] = "application/json"
+        headers["Accept-Encoding"] = "gzip, deflate"
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        downloaded = False
+        status: int | None = None
+        # Until the body is read; None if it was not.
+        request_seconds: float | None = None
+        cancelled = False
+
+        try:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Fetching SMHI warnings (timeout=%ss, failure_count=%s, interval=%s, listeners=%s, headers=%s)",
+                    15,
+                    self._failure_count,
+                    self.update_interval,
+                    len(self._listeners),
+                    {
+                        k: headers.get(k)
+                        for k in ("If-None-Match", "If-Modified-Since")
+                        if k in headers
+                    },
+                )
+            timeout = ClientTimeout(total=15)
+            async with self.session.get(
+                self.warnings_url, headers=headers, timeout=timeout
+            ) as response:
+                status = response.status
+                if record is not None:
+                    record.status = status
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug(
+                        "SMHI response received in %.3fs (status=%s, etag=%s, last_modified=%s, content-encoding=%s)",
+                        monotonic() - req_start,
+                        response.status,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        response.headers.get("Content-Encoding", "none"),
+                    )
+
+                # Handle rate limiting
+                if response.status == 429:
+                    retry_after_header = response.headers.get("Retry-After")
+                    if retry_after_header:
+                        try:
+                            # Retry-After can be seconds (integer) or HTTP date
+                            retry_seconds = int(retry_after_header)
+                        except ValueError:
+                            # If it's a date, default to 60 seconds
+                            retry_seconds = 60
+                    else:
+                        retry_seconds = 60
+
+                    _LOGGER.warning(
+                        "SMHI API rate limit exceeded (429), will retry after %s seconds",
+                        retry_seconds,
+                    )
+                    self._retry_after = timedelta(seconds=retry_seconds)
+                    raise UpdateFailed(
+                        f"Rate limit exceeded, retry after {retry_seconds}s",
+                        retry_after=timedelta(seconds=retry_seconds),
+                    )
+
+                if response.status == 304 and self.data is not None:
+                    # Cache hit - log it
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug(
+                            "Cache hit (304 Not Modified) in %.3fs, reusing existing data",
+                            monotonic() - req_start,
+                        )
+                    payload = self.data
+                    request_seconds = monotonic() - req_start
+                    if record is not None:
+                        record.stages["fetch"] = request_seconds
+                else:
+                    response.raise_for_status()
+                    body = await response.read()
+                    request_seconds = monotonic() - req_start
+                    decode = _decode_payload
+                    if record is not None:
+                        record.stages["fetch"] = request_seconds
+                        record.bytes = len(body)
+                        decode = profiler.profiled(decode)
+                    loop_start = monotonic()
+                    payload, decode_seconds = await self.hass.async_add_executor_job(
+                        decode, body
+                    )
+                    if record is not None:
+                        record.stages["decode"] = decode_seconds
+                    # Content-Length is the compressed size when gzipped.
+                    self.metrics.record_download(
+                        response.content_length or len(body), len(body), decode_seconds
+                    )
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        # decode_seconds is how long the loop used to be blocked;
+                        # the remainder is executor hand-off overhead.
+                        _LOGGER.debug(
+                            "Decoded %s bytes in %.3fs in executor (handoff %.4fs)",
+                            len(body),
+                            decode_seconds,
+                            monotonic() - loop_start - decode_seconds,
+                        )
+
+                    # Save caching headers
+                    self._etag = response.headers.get("ETag")
+                    self._last_modified = response.headers.get("Last-Modified")
+                    downloaded = True
+
+            self._last_success = dt_util.utcnow().isoformat()
+            if downloaded:
+                self._async_schedule_snapshot_save(payload)
+
+            # Reset backoff on success and let the scheduler pick the interval
+            self._failure_count = 0
+            self._scheduler.observe(payload, self._last_modified)
+            self.update_interval = self._scheduler.next_interval(
+                self._escalation_windows(), dt_util.utcnow()
+            )
+            # Failures back off from the regular interval at least, never
+            # from the shorter one of an escalation.
+            self._base_interval = max(self.update_interval, SCAN_INTERVAL)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "SMHI fetch success in %.3fs (warnings=%s, next poll in %s, cadence=%s)",
+                    monotonic() - req_start,
+                    len(payload),
+                    self.update_interval,
+                    self._scheduler.cadence,
+                )
+            return payload
+
+        except asyncio.CancelledError:
+            # Allow Home Assistant to cancel updates cleanly (shutdown/reload)
+            cancelled = True
+            raise
+        except (ClientError, asyncio.TimeoutError) as err:
+            # Exponential backoff
+            self._failure_count += 1
+            self._apply_backoff()
+            detail = str(err) or err.__class__.__name__
+            _LOGGER.debug(
+                "SMHI fetch failed in %.3fs (%s); applying backoff to interval=%s (failure_count=%s)",
+                monotonic() - req_start,
+                detail,
+                self.update_interval,
+                self._failure_count,
+            )
+            raise UpdateFailed(f"Communication error: {detail}") from err
+        except ValueError as err:
+            self._failure_count += 1
+            self._apply_backoff()
+            raise UpdateFailed(f"Invalid response: {err}") from err
+        except Exception as err:
+            self._failure_count += 1
+            self._apply_backoff()
+            raise UpdateFailed(str(err)) from err
+        finally:
+            if not cancelled:
+                self.metrics.record_request(
+                    status, request_seconds or monotonic() - req_start
+                )
+
+    async def async_shutdown(self) -> None:
+        """Cancel a running fetch and stop polling."""
+        if self._inflight is not None:
+            self._inflight.cancel()
+        if self.profiler is not None:
+            self.profiler.async_cancel()
+        await super().async_shutdown()
+
+    def _apply_backoff(self) -> None:
+        # Cap backoff to 60 minutes
+        factor = min(self._failure_count, 5)
+        seconds = self._base_interval.total_seconds() * (2**factor)
+        max_seconds = 60 * 60
+        capped_seconds = min(seconds, max_seconds)
+        retry_after, self._retry_after = self._retry_after, None
+        if retry_after is not None:
+            # Never retry before the server asked us to.
+            capped_seconds = max(capped_seconds, retry_after.total_seconds())
+        # Add a little jitter so multiple instances don't retry in lock-step.
+        jitter = random.uniform(0, min(5.0, capped_seconds * 0.05))
+        new_interval = timedelta(seconds=capped_seconds + jitter)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Backoff update_interval: base=%s failure_count=%s seconds=%.3f jitter=%.3f -> %s",
+                self._base_interval,
+                self._failure_count,
+                capped_seconds,
+                jitter,
+                new_interval,
+            )
+        self.update_interval = new_interval
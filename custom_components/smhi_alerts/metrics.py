@@ -0,0 +1,143 @@
+"""Bounded performance counters for diagnostics and diagnostic sensors.
+
+Every measurement keeps only its most recent METRICS_SAMPLES values in a
+ring buffer, so recording is an append and memory stays flat however long
+Home Assistant runs. Percentiles are computed when they are read.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Iterator
+from math import ceil
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+
+from .const import METRICS_SAMPLES
+
+# Outcomes counted per request; anything else is "error".
+COUNTED_STATUSES = (200, 304, 429)
+
+
+def _round(value: float | None, digits: int = 2) -> float | None:
+    return None if value is None else round(value, digits)
+
+
+class Samples:
+    """The most recent values of one measurement."""
+
+    def __init__(self, maxlen: int | None = METRICS_SAMPLES) -> None:
+        """Initialize an empty ring buffer of maxlen values."""
+        self._values: deque[float] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        """Return the number of values kept."""
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterate over the kept values, oldest first."""
+        return iter(self._values)
+
+    def add(self, value: float) -> None:
+        """Record value, dropping the oldest one when full."""
+        self._values.append(value)
+
+    @property
+    def last(self) -> float | None:
+        """Return the most recent value."""
+        return self._values[-1] if self._values else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest-rank percentile of the kept values."""
+        if not self._values:
+            return None
+        ordered = sorted(self._values)
+        rank = ceil(percent / 100 * len(ordered)) - 1
+        return ordered[max(0, min(rank, len(ordered) - 1))]
+
+    def summary(self, scale: float = 1.0) -> dict[str, Any]:
+        """Return count, last, p50, p95 and p99, multiplied by scale."""
+
+        def scaled(value: float | None) -> float | None:
+            return _round(None if value is None else value * scale)
+
+        return {
+            "samples": len(self._values),
+            "last": scaled(self.last),
+            "p50": scaled(self.percentile(50)),
+            "p95": scaled(self.percentile(95)),
+            "p99": scaled(self.percentile(99)),
+        }
+
+
+class FetchMetrics:
+    """Request counters of the shared hub."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        # Seconds from sending the request to having the body
+        self.latency = Samples()
+        # Seconds spent decoding JSON in the executor
+        self.decode = Samples()
+        # Outcome of the most recent requests, and of all since startup
+        self.recent: deque[str] = deque(maxlen=METRICS_SAMPLES)
+        self.totals: Counter[str] = Counter()
+        # (bytes on the wire, bytes decompressed) of recent downloads
+        self.transfers: deque[tuple[int, int]] = deque(maxlen=METRICS_SAMPLES)
+        self.bytes_received = 0
+        self.payload_bytes: int | None = None
+        # Shared payload indexes reused vs rebuilt
+        self.index_hits = 0
+        self.index_misses = 0
+
+    def record_request(self, status: int | None, seconds: float) -> None:
+        """Count one finished request; status None means it failed."""
+        outcome = str(status) if status in COUNTED_STATUSES else "error"
+        self.recent.append(outcome)
+        self.totals[outcome] += 1
+        self.latency.add(seconds)
+
+    def record_download(self, wire: int, size: int, decode_seconds: float) -> None:
+        """Record a downloaded document and how long decoding it took."""
+        self.transfers.append((wire, size))
+        self.bytes_received += wire
+        self.payload_bytes = size
+        self.decode.add(decode_seconds)
+
+    def responses(self) -> dict[str, int]:
+        """Return the outcome counts of the recent requests."""
+        return dict(Counter(self.recent))
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Return decompressed over transferred bytes of recent downloads."""
+        wire = sum(transfer[0] for transfer in self.transfers)
+        size = sum(transfer[1] for transfer in self.transfers)
+        return round(size / wire, 2) if wire else None
+
+    @property
+    def index_hit_rate(self) -> float | None:
+        """Return the share of index lookups served from the cache."""
+        lookups = self.index_hits + self.index_misses
+        return self.index_hits / lookups if lookups else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every counter in milliseconds and bytes."""
+        return {
+            "latency_ms": self.latency.summary(1000),
+            "decode_ms": self.decode.summary(1000),
+            "responses_recent": self.responses(),
+            "responses_total": dict(self.totals),
+            "bytes_received": self.bytes_received,
+            "payload_bytes": self.payload_bytes,
+            "compression_ratio": self.compression_ratio,
+            "index_hit_rate": _round(self.index_hit_rate, 3),
+        }
+
+
+def attributes_size(data: dict[str, Any] | None) -> int | None:
+    """Return the size in bytes of an entry's attributes as JSON."""
+    if not data:
+        return None
+    return len(json_bytes(data.get("attributes") or {}))
@@ -0,0 +1,257 @@
+"""On-demand profiling of the update pipeline.
+
+The profile_next_updates service arms an UpdateProfiler on the hub. The
+hub and the entry coordinators only look at hub.profiler, which is None
+otherwise, so nothing is timed or profiled unless a capture is running.
+"""
+
+from __future__ import annotations
+
+import cProfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+import io
+import logging
+import pstats
+import threading
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PROFILE_SETTLE_DELAY
+
+if TYPE_CHECKING:
+    from .hub import SmhiWarningsHub
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+STAGES = ("fetch", "decode", "filter", "geometry", "render")
+# Calls made by _process_data that count as geometry rather than filtering,
+# besides anything in geometry.py. Rendering is _render_area.
+GEOMETRY_CALLS = frozenset({"geometry_index", "districts_at"})
+RENDER_CALLS = frozenset({"_render_area"})
+# Functions listed in the report
+REPORT_FUNCTIONS = 40
+
+_Key = tuple[str, int, str]
+
+
+def _code_key(func: Callable[..., Any]) -> _Key:
+    """Return the pstats key of a Python function or bound method."""
+    code = getattr(func, "__func__", func).__code__
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def split_process_time(stats: pstats.Stats, root: _Key) -> dict[str, float]:
+    """Split the time of root into filter, geometry and render seconds.
+
+    Work root hands to a geometry or render call is attributed to that
+    stage through the caller edges; the rest of root is filtering.
+    """
+    entry = stats.stats.get(root)  # type: ignore[attr-defined]
+    if entry is None:
+        return {"filter": 0.0, "geometry": 0.0, "render": 0.0}
+    geometry = render = 0.0
+    for (filename, _line, name), value in stats.stats.items():  # type: ignore[attr-defined]
+        via_root = value[4].get(root)
+        if via_root is None:
+            continue
+        if name in RENDER_CALLS:
+            render += via_root[3]
+        elif name in GEOMETRY_CALLS or filename.endswith("geometry.py"):
+            geometry += via_root[3]
+    return {
+        "filter": max(entry[3] - geometry - render, 0.0),
+        "geometry": geometry,
+        "render": render,
+    }
+
+
+@dataclass
+class ProfiledUpdate:
+    """Stage timings of one hub update and the entry builds it triggered."""
+
+    number: int
+    started: datetime
+    status: int | None = None
+    bytes: int = 0
+    stages: dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(STAGES, 0.0)
+    )
+    # {entry_id: {stage: seconds}} for filter, geometry and render
+    entries: dict[str, dict[str, float]] = field(default_factory=dict)
+
+
+class UpdateProfiler:
+    """Capture cProfile stats and stage timings of the next N hub updates.
+
+    An update is one fetch by the hub plus the entry builds that run until
+    the next fetch. Once the last update has settled the profiler detaches
+    from the hub and writes a text report and the raw .cprof stats to the
+    config directory.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, hub: SmhiWarningsHub, updates: int
+    ) -> None:
+        """Initialize a profiler for the given number of hub updates."""
+        self.hass = hass
+        self.hub = hub
+        self.updates = updates
+        self.records: list[ProfiledUpdate] = []
+        self.stats: pstats.Stats | None = None
+        self.path: str | None = None
+        # Only one cProfile profiler may be active per interpreter.
+        self._lock = threading.Lock()
+        # Profiled builds handed to the executor, and those finished there
+        self._started = 0
+        self._finished = 0
+        self._unsub_finish: CALLBACK_TYPE | None = None
+
+    @property
+    def current(self) -> ProfiledUpdate | None:
+        """Return the update being recorded, if any."""
+        return self.records[-1] if self.records else None
+
+    @callback
+    def async_begin_update(self) -> ProfiledUpdate | None:
+        """Start recording a hub update; None once all are recorded."""
+        if len(self.records) >= self.updates:
+            return None
+        record = ProfiledUpdate(len(self.records) + 1, dt_util.utcnow())
+        self.records.append(record)
+        if len(self.records) == self.updates:
+            self._async_schedule_finish()
+        return record
+
+    def profiled(self, func: Callable[..., _T]) -> Callable[..., _T]:
+        """Return func wrapped to run under cProfile in the executor."""
+        return partial(self._run, func, None)
+
+    @callback
+    def async_profiled_process(
+        self, entry_id: str, func: Callable[..., _T]
+    ) -> Callable[..., _T]:
+        """Return _process_data wrapped to record its stage split.
+
+        Builds before the first profiled fetch are not recorded.
+        """
+        record = self.current
+        if record is None:
+            return func
+        self._started += 1
+        return partial(self._run, func, (record, entry_id))
+
+    def _run(
+        self,
+        func: Callable[..., _T],
+        target: tuple[ProfiledUpdate, str] | None,
+        *args: Any,
+    ) -> _T:
+        """Run func under cProfile and merge the stats; executor only."""
+        profile = cProfile.Profile()
+        with self._lock:
+            try:
+                return profile.runcall(func, *args)
+            finally:
+                stats = pstats.Stats(profile)
+                if target is not None:
+                    record, entry_id = target
+                    split = split_process_time(stats, _code_key(func))
+                    entry = record.entries.setdefault(
+                        entry_id, dict.fromkeys(split, 0.0)
+                    )
+                    for stage, seconds in split.items():
+                        entry[stage] += seconds
+                        record.stages[stage] += seconds
+                    self._finished += 1
+                if self.stats is None:
+                    self.stats = stats
+                else:
+                    self.stats.add(stats)
+
+    @callback
+    def _async_schedule_finish(self) -> None:
+        """Finish once the builds of the last update had time to run."""
+        self._unsub_finish = async_call_later(
+            self.hass, PROFILE_SETTLE_DELAY, self._async_finish_later
+        )
+
+    async def _async_finish_later(self, _now: datetime) -> None:
+        self._unsub_finish = None
+        if self._started > self._finished:
+            # A slow build is still running; give it another period.
+            self._async_schedule_finish()
+            return
+        await self.async_finish()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop capturing without writing a report."""
+        if self._unsub_finish is not None:
+            self._unsub_finish()
+            self._unsub_finish = None
+        if self.hub.profiler is self:
+            self.hub.profiler = None
+
+    async def async_finish(self) -> str:
+        """Detach from the hub and write the report; returns its path."""
+        self.async_cancel()
+        stamp = dt_util.utcnow().strftime("%Y%m%d-%H%M%S")
+        base = self.hass.config.path(f"{DOMAIN}_profile.{stamp}")
+        self.path = f"{base}.txt"
+        await self.hass.async_add_executor_job(self._write, base)
+        _LOGGER.info(
+            "Profile of %s SMHI update(s) written to %s", len(self.records), self.path
+        )
+        return self.path
+
+    def _write(self, base: str) -> None:
+        """Write the report and the raw stats; executor only."""
+        with self._lock:
+            report = self.report()
+            if self.stats is not None:
+                self.stats.dump_stats(f"{base}.cprof")
+        with open(f"{base}.txt", "w", encoding="utf-8") as file:
+            file.write(report)
+
+    def report(self) -> str:
+        """Return the stage table followed by the top functions."""
+        header = f"{'update':<16}{'status':>7}{'bytes':>10}" + "".join(
+            f"{stage + ' ms':>13}" for stage in STAGES
+        )
+        lines = [
+            f"SMHI Alert update profile, {len(self.records)} of {self.updates} "
+            f"update(s) from {self.records[0].started.isoformat() if self.records else '-'}",
+            "",
+            header,
+            "-" * len(header),
+        ]
+        totals = dict.fromkeys(STAGES, 0.0)
+        for record in self.records:
+            lines.append(
+                f"{record.number:<16}{record.status or '-':>7}{record.bytes:>10}"
+                + "".join(f"{record.stages[s] * 1000:>13.2f}" for s in STAGES)
+            )
+            for entry_id, split in sorted(record.entries.items()):
+                lines.append(
+                    f"  {entry_id[:14]:<14}{'':>17}{'':>26}"
+                    + "".join(f"{split[s] * 1000:>13.2f}" for s in split)
+                )
+            for stage in STAGES:
+                totals[stage] += record.stages[stage]
+        lines.append("-" * len(header))
+        lines.append(
+            f"{'total':<33}" + "".join(f"{totals[s] * 1000:>13.2f}" for s in STAGES)
+        )
+        if self.stats is not None:
+            stream = io.StringIO()
+            self.stats.stream = stream  # type: ignore[attr-defined]
+            self.stats.sort_stats("cumulative").print_stats(REPORT_FUNCTIONS)
+            lines.extend(["", stream.getvalue()])
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,150 @@
+"""Adaptive poll interval for the shared warnings hub."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from statistics import median
+from typing import Any
+
+from .const import (
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    ESCALATION_CODES,
+    ESCALATION_LOOKAHEAD,
+    PUBLISH_GRACE,
+    PUBLISH_HISTORY,
+    QUIET_PERIOD,
+    SCAN_INTERVAL,
+)
+from .timeline import _timestamp
+
+
+def _http_date(value: str | None) -> float | None:
+    """Return a POSIX timestamp for a Last-Modified header, None if invalid."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def latest_published(payload: list[dict[str, Any]]) -> float | None:
+    """Return the newest published time of any warning area in payload."""
+    latest = None
+    for warning in payload:
+        for area in warning.get("warningAreas") or ():
+            published = _timestamp(area.get("published"))
+            if published is not None and (latest is None or published > latest):
+                latest = published
+    return latest
+
+
+def escalation_windows(
+    messages: list[dict[str, Any]],
+) -> tuple[tuple[float, float], ...]:
+    """Return the (start, end) timestamps of the orange and red messages.
+
+    messages is an entry's filtered result, so only alerts the entry shows
+    count. An unknown start or end leaves the window open on that side.
+    """
+    windows = []
+    for msg in messages:
+        if msg.get("code") not in ESCALATION_CODES:
+            continue
+        start = _timestamp(msg.get("start"))
+        end = _timestamp(msg.get("end"))
+        windows.append(
+            (
+                float("-inf") if start is None else start,
+                float("inf") if end is None else end,
+            )
+        )
+    return tuple(sorted(windows))
+
+
+def has_escalation(
+    windows: Iterable[tuple[float, float]], now: datetime
+) -> bool:
+    """Return True if an orange or red window is active or starts soon."""
+    ts = now.timestamp()
+    horizon = ts + ESCALATION_LOOKAHEAD.total_seconds()
+    return any(start <= horizon and end > ts for start, end in windows)
+
+
+class PollScheduler:
+    """Pick the next poll interval from upstream activity.
+
+    Every distinct publish time, taken from Last-Modified or the newest
+    ``published`` in the payload, is remembered. The median gap between
+    them is the learned cadence, and the next poll is placed just after the
+    next expected publish. Without escalations the interval doubles for
+    every QUIET_PERIOD without a publish; an orange or red alert that an
+    entry shows and that is active or about to start polls at the lower
+    bound instead.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with the default bounds and no history."""
+        self.min_interval = DEFAULT_MIN_SCAN_INTERVAL
+        self.max_interval = DEFAULT_MAX_SCAN_INTERVAL
+        self._publishes: deque[float] = deque(maxlen=PUBLISH_HISTORY)
+
+    @property
+    def last_publish(self) -> float | None:
+        """Return the most recent observed publish time."""
+        return self._publishes[-1] if self._publishes else None
+
+    @property
+    def cadence(self) -> timedelta | None:
+        """Return the median gap between observed publishes, if known."""
+        if len(self._publishes) < 3:
+            return None
+        times = list(self._publishes)
+        return timedelta(
+            seconds=median(b - a for a, b in zip(times, times[1:]))
+        )
+
+    def observe(
+        self, payload: list[dict[str, Any]], last_modified: str | None
+    ) -> None:
+        """Record the publish time of a payload if it is new."""
+        candidates = [
+            ts
+            for ts in (_http_date(last_modified), latest_published(payload))
+            if ts is not None
+        ]
+        if not candidates:
+            return
+        published = max(candidates)
+        last = self.last_publish
+        if last is None or published > last:
+            self._publishes.append(published)
+
+    def next_interval(
+        self, escalations: Iterable[tuple[float, float]], now: datetime
+    ) -> timedelta:
+        """Return the interval until the next poll.
+
+        escalations are the orange and red windows the entries reported,
+        see escalation_windows.
+        """
+        if has_escalation(escalations, now):
+            return self.min_interval
+
+        interval = SCAN_INTERVAL
+        last = self.last_publish
+        if last is not None:
+            quiet = now.timestamp() - last
+            periods = int(quiet // QUIET_PERIOD.total_seconds())
+            if periods > 0:
+                interval = SCAN_INTERVAL * 2 ** min(periods, 8)
+            cadence = self.cadence
+            if cadence is not None:
+                due = last + cadence.total_seconds() - now.timestamp()
+                if due > 0:
+                    interval = min(interval, timedelta(seconds=due) + PUBLISH_GRACE)
+        return max(self.min_interval, min(interval, self.max_interval))
@@ -1,25 +1,48 @@
-import logging
 import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+import logging
 import unicodedata
-from datetime import timedelta
 from time import monotonic
-import random
-from typing import Any, Dict, List, Tuple, Optional
-from aiohttp import ClientError, ClientTimeout
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
-from homeassistant.const import __version__ as HA_VERSION
+from typing import Any, Callable, Dict, List, Tuple, Optional
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
-    UpdateFailed,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.util import dt as dt_util
 from .const import (
     DOMAIN,
+    DATA_HUB,
+    SIGNAL_FEED_DIAGNOSTICS_RELEASED,
+    ALERT_ENTITY_UNIQUE_ID_INFIX,
+    CONF_ALERT_ENTITIES,
+    DEFAULT_ALERT_ENTITIES,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
     CONF_DISTRICT,
     CONF_LANGUAGE,
     CONF_INCLUDE_MESSAGES,
@@ -31,22 +54,39 @@ from .const import (
     CONF_EXCLUDE_SEA,
     CONF_EXCLUDED_MESSAGE_TYPES,
     CONF_MESSAGE_TYPES,
+    CONF_EXTRA_DISTRICTS,
+    CONF_EXTRA_LOCATIONS,
     DEFAULT_NAME,
-    SCAN_INTERVAL,
-    DISTRICTS,
+    RENDER_CACHE_SIZE,
+    EVENT_ALERT_EXPIRED,
+    EVENT_ALERT_NEW,
+    EVENT_ALERT_UPDATED,
     DEFAULT_LANGUAGE,
     DEFAULT_INCLUDE_MESSAGES,
     DEFAULT_INCLUDE_GEOMETRY,
+    DEFAULT_EXCLUDE_SEA,
     DEFAULT_MODE,
     DEFAULT_RADIUS_KM,
     DEFAULT_EXCLUDED_MESSAGE_TYPES,
     DEFAULT_MESSAGE_TYPES,
     WARNINGS_URL,
     SEVERITY_ORDER,
-    MARINE_AREA_IDS,
-    MARINE_EVENT_CODES,
     MESSAGE_EVENT_DEFINITIONS,
 )
+from .areas import async_get_areas_catalogue
+from .cache import LRUCache
+from .diff import AlertDiff, compact_message, diff_messages, message_key
+from .metrics import Samples, attributes_size
+from .geometry import (
+    AreaGeometry,
+    PayloadGeometryIndex,
+    geometry_ref,
+    radius_to_degrees,
+    simplified_cache,
+)
+from .hub import SmhiWarningsHub, async_get_hub
+from .scheduler import escalation_windows
+from .timeline import AlertTimeline
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -70,7 +110,46 @@ async def async_setup_entry(
         return False
 
     sensor = SMHIAlertSensor(coordinator, entry)
-    async_add_entities([sensor], True)
+    entities: List[SensorEntity] = [
+        sensor,
+        *(
+            SmhiAlertDiagnosticSensor(coordinator, entry, description)
+            for description in DIAGNOSTIC_SENSORS
+        ),
+    ]
+    async_add_entities(entities, True)
+
+    # The feed's sensors live on one entry; another one takes them over when
+    # it unloads, without reloading anything.
+    hub = coordinator.hub
+
+    @callback
+    def _async_claim_hub_diagnostics() -> None:
+        # An entry being unloaded has already left hass.data.
+        if entry.entry_id not in hass.data.get(DOMAIN, {}):
+            return
+        if not hub.async_claim_diagnostics(entry.entry_id):
+            return
+        async_add_entities(
+            [
+                SmhiHubDiagnosticSensor(hub, description)
+                for description in HUB_DIAGNOSTIC_SENSORS
+            ]
+        )
+        entry.async_on_unload(
+            partial(_async_release_hub_diagnostics, hass, hub, entry.entry_id)
+        )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_FEED_DIAGNOSTICS_RELEASED, _async_claim_hub_diagnostics
+        )
+    )
+    _async_claim_hub_diagnostics()
+
+    # Optional per-alert entities, added and removed as alerts come and go.
+    tracker = AlertEntityTracker(hass, entry, coordinator, async_add_entities)
+    entry.async_on_unload(tracker.async_start())
 
     _LOGGER.debug(
         "sensor.async_setup_entry done in %.3fs (entry_id=%s)",
@@ -82,56 +161,10 @@ async def async_setup_entry(
 
 async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry):
     """Handle options update."""
-    _LOGGER.debug("Options updated, refreshing coordinator")
+    _LOGGER.debug("Options updated, re-filtering cached payload")
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    # Update coordinator configuration
-    coordinator.mode = entry.options.get(
-        CONF_MODE, entry.data.get(CONF_MODE, DEFAULT_MODE)
-    )
-    coordinator.district = entry.options.get(
-        CONF_DISTRICT, entry.data.get(CONF_DISTRICT, "all")
-    )
-    coordinator.language = entry.options.get(
-        CONF_LANGUAGE, entry.data.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
-    )
-    coordinator.include_messages = entry.options.get(
-        CONF_INCLUDE_MESSAGES,
-        entry.data.get(CONF_INCLUDE_MESSAGES, DEFAULT_INCLUDE_MESSAGES),
-    )
-    coordinator.include_geometry = entry.options.get(
-        CONF_INCLUDE_GEOMETRY,
-        entry.data.get(CONF_INCLUDE_GEOMETRY, DEFAULT_INCLUDE_GEOMETRY),
-    )
-    coordinator.set_message_types(
-        entry.options.get(
-            CONF_MESSAGE_TYPES,
-            entry.data.get(CONF_MESSAGE_TYPES, DEFAULT_MESSAGE_TYPES),
-        ),
-        entry.options.get(
-            CONF_EXCLUDED_MESSAGE_TYPES,
-            entry.data.get(CONF_EXCLUDED_MESSAGE_TYPES, DEFAULT_EXCLUDED_MESSAGE_TYPES),
-        ),
-    )
-    coordinator.exclude_sea = entry.options.get(
-        CONF_EXCLUDE_SEA,
-        entry.data.get(CONF_EXCLUDE_SEA, False),
-    )
-    coordinator.latitude = float(
-        entry.options.get(
-            CONF_LATITUDE, entry.data.get(CONF_LATITUDE, hass.config.latitude)
-        )
-    )
-    coordinator.longitude = float(
-        entry.options.get(
-            CONF_LONGITUDE, entry.data.get(CONF_LONGITUDE, hass.config.longitude)
-        )
-    )
-    coordinator.radius_km = float(
-        entry.options.get(
-            CONF_RADIUS_KM, entry.data.get(CONF_RADIUS_KM, DEFAULT_RADIUS_KM)
-        )
-    )
-    await coordinator.async_request_refresh()
+    coordinator.apply_entry_options(entry)
+    await coordinator.async_refilter()
 
 
 class SMHIAlertSensor(CoordinatorEntity, SensorEntity):
@@ -162,21 +195,22 @@ class SMHIAlertSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        return self.coordinator.data.get("attributes")
+        attributes = self.coordinator.data.get("attributes")
+        if getattr(self.coordinator, "alert_entities", False) and attributes:
+            # Each alert has its own entity; don't ship the full list too.
+            return {
+                key: value
+                for key, value in attributes.items()
+                if key not in ("messages", "notice")
+            }
+        return attributes
 
     @property
     def name(self) -> str:
         return self._derive_name()
 
     def _derive_name(self) -> str:
-        if getattr(self.coordinator, "mode", DEFAULT_MODE) == "coordinate":
-            lat = round(getattr(self.coordinator, "latitude", 0.0), 4)
-            lon = round(getattr(self.coordinator, "longitude", 0.0), 4)
-            r = int(round(getattr(self.coordinator, "radius_km", DEFAULT_RADIUS_KM)))
-            return f"{DEFAULT_NAME} ({lat},{lon} @ {r}km)"
-        else:
-            district = getattr(self.coordinator, "district", "all")
-            return f"{DEFAULT_NAME} ({DISTRICTS.get(district, district)})"
+        return f"{DEFAULT_NAME} ({_entry_location(self.coordinator)})"
 
     def _derive_unique_id(self) -> str:
         # IMPORTANT: unique_id must be stable for the lifetime of the config entry.
@@ -185,13 +219,451 @@ class SMHIAlertSensor(CoordinatorEntity, SensorEntity):
         return f"{self.entry.entry_id}_smhi_alert_sensor"
 
 
+def _entry_location(coordinator: "SmhiAlertCoordinator") -> str:
+    """Return the district name or point and radius an entry watches."""
+    if getattr(coordinator, "mode", DEFAULT_MODE) == "coordinate":
+        lat = round(getattr(coordinator, "latitude", 0.0), 4)
+        lon = round(getattr(coordinator, "longitude", 0.0), 4)
+        r = int(round(getattr(coordinator, "radius_km", DEFAULT_RADIUS_KM)))
+        return f"{lat},{lon} @ {r}km"
+    return coordinator.areas.name(getattr(coordinator, "district", "all"))
+
+
+def mode_label(coordinator: "SmhiAlertCoordinator") -> str:
+    """Return district, all or coordinate; "all" costs far more than one district."""
+    mode = getattr(coordinator, "mode", DEFAULT_MODE)
+    if mode != "coordinate" and getattr(coordinator, "district", "all") == "all":
+        return "all"
+    return mode
+
+
+def _rate(value: float | None) -> float | None:
+    return None if value is None else round(value * 100, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SmhiDiagnosticDescription(SensorEntityDescription):
+    """A processing counter of one entry shown as a diagnostic sensor."""
+
+    value_fn: Callable[["SmhiAlertCoordinator"], Any]
+    attributes_fn: Callable[["SmhiAlertCoordinator"], Dict[str, Any]] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class SmhiHubDiagnosticDescription(SensorEntityDescription):
+    """A counter of the shared feed shown as a diagnostic sensor."""
+
+    value_fn: Callable[[SmhiWarningsHub], Any]
+    attributes_fn: Callable[[SmhiWarningsHub], Dict[str, Any]] | None = None
+
+
+HUB_DIAGNOSTIC_SENSORS: Tuple[SmhiHubDiagnosticDescription, ...] = (
+    # Whether polling works; entry state only changes with the result. The
+    # time of the last poll is in the diagnostics, so quiet polls write nothing.
+    SmhiHubDiagnosticDescription(
+        key="last_poll",
+        name="last poll",
+        device_class=SensorDeviceClass.ENUM,
+        options=["ok", "failed"],
+        value_fn=lambda hub: "ok" if hub.last_update_success else "failed",
+    ),
+    SmhiHubDiagnosticDescription(
+        key="request_latency",
+        name="request latency",
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda hub: hub.metrics.latency.summary(1000)["p50"],
+        attributes_fn=lambda hub: {
+            **hub.metrics.latency.summary(1000),
+            "responses_recent": hub.metrics.responses(),
+            "responses_total": dict(hub.metrics.totals),
+        },
+    ),
+    SmhiHubDiagnosticDescription(
+        key="decode_time",
+        name="decode time",
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda hub: hub.metrics.decode.summary(1000)["p50"],
+        attributes_fn=lambda hub: hub.metrics.decode.summary(1000),
+    ),
+    SmhiHubDiagnosticDescription(
+        key="poll_interval",
+        name="poll interval",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda hub: (
+            hub.update_interval.total_seconds() if hub.update_interval else None
+        ),
+        attributes_fn=lambda hub: {
+            "base_interval": hub.base_interval.total_seconds(),
+        },
+    ),
+    SmhiHubDiagnosticDescription(
+        key="payload_size",
+        name="payload size",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda hub: hub.metrics.payload_bytes,
+        attributes_fn=lambda hub: {
+            "bytes_received": hub.metrics.bytes_received,
+            "compression_ratio": hub.metrics.compression_ratio,
+        },
+    ),
+)
+
+DIAGNOSTIC_SENSORS: Tuple[SmhiDiagnosticDescription, ...] = (
+    SmhiDiagnosticDescription(
+        key="process_time",
+        name="process time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: c.process_times.summary(1000)["p50"],
+        attributes_fn=lambda c: {
+            "mode": mode_label(c),
+            **c.process_times.summary(1000),
+        },
+    ),
+    SmhiDiagnosticDescription(
+        key="attributes_size",
+        name="attributes size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda c: attributes_size(c.data),
+    ),
+    SmhiDiagnosticDescription(
+        key="render_cache_hit_rate",
+        name="render cache hit rate",
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda c: _rate(c.render_cache.hit_rate),
+        attributes_fn=lambda c: {
+            "render_cache_entries": len(c.render_cache),
+            "index_hit_rate": _rate(c.hub.metrics.index_hit_rate),
+            "geometry_cache_hit_rate": _rate(simplified_cache().hit_rate),
+        },
+    ),
+)
+
+
+# Attributes that only record when the result was built
+HEARTBEAT_ATTRIBUTES = ("last_update", "last_update_local")
+
+
+def _content(data: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+    """Return state and attributes without the heartbeat timestamps."""
+    attributes = data.get("attributes", {})
+    return data.get("state"), {
+        key: value
+        for key, value in attributes.items()
+        if key not in HEARTBEAT_ATTRIBUTES
+    }
+
+
+def _parse_locations(value: Any) -> List[Tuple[float, float, float]]:
+    """Return (lat, lon, radius_km) for each valid extra location.
+
+    Accepts a list of mappings with latitude/longitude and an optional
+    radius_km; malformed items are skipped.
+    """
+    locations: List[Tuple[float, float, float]] = []
+    if not isinstance(value, list):
+        return locations
+    for item in value:
+        if not isinstance(item, dict):
+            continue
+        try:
+            locations.append(
+                (
+                    float(item[CONF_LATITUDE]),
+                    float(item[CONF_LONGITUDE]),
+                    float(item.get(CONF_RADIUS_KM, DEFAULT_RADIUS_KM)),
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring invalid extra location: %s", item)
+    return locations
+
+
+def _to_local_iso(value: Any) -> Any:
+    """Return an SMHI UTC timestamp as local ISO time, or None."""
+    if not isinstance(value, str):
+        return None
+    try:
+        dt_utc = dt_util.parse_datetime(value)
+        if dt_utc is None:
+            return None
+        return dt_util.as_local(dt_utc).isoformat()
+    except Exception:
+        return None
+
+
+class SmhiAlertDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """One processing counter of an entry; disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    entity_description: SmhiDiagnosticDescription
+
+    def __init__(
+        self,
+        coordinator: "SmhiAlertCoordinator",
+        entry: ConfigEntry,
+        description: SmhiDiagnosticDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = (
+            f"{DEFAULT_NAME} {description.name} ({_entry_location(coordinator)})"
+        )
+        self._attr_unique_id = f"{entry.entry_id}_diagnostic_{description.key}"
+        self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
+
+    @property
+    def available(self) -> bool:
+        # Counters matter most while polls fail, so they stay available.
+        return True
+
+    @property
+    def native_value(self):
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
+
+
+class SmhiHubDiagnosticSensor(SensorEntity):
+    """One counter of the shared feed; checked after every poll.
+
+    The hub only wakes its regular listeners when the payload changes, so
+    these sensors use a poll listener to keep up with 304s and failures.
+    State is only written when the value or attributes changed. They exist
+    once, on the entry that claimed them, under a feed device.
+    """
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: SmhiHubDiagnosticDescription
+
+    def __init__(
+        self, hub: SmhiWarningsHub, description: SmhiHubDiagnosticDescription
+    ) -> None:
+        self.hub = hub
+        self.entity_description = description
+        self._attr_name = f"{DEFAULT_NAME} feed {description.name}"
+        # Not tied to an entry, so the entity survives a change of owner.
+        self._attr_unique_id = f"{DOMAIN}_feed_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, DATA_HUB)},
+            "name": f"{DEFAULT_NAME} feed",
+            "manufacturer": "Nicxe",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+        self._written: Tuple[Any, Any] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(self.hub.async_add_poll_listener(self._async_on_poll))
+
+    @callback
+    def _async_on_poll(self) -> None:
+        """Write state unless the poll changed nothing this sensor shows."""
+        shown = (self.native_value, self.extra_state_attributes)
+        if shown != self._written:
+            self._written = shown
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        return self.entity_description.value_fn(self.hub)
+
+    @property
+    def extra_state_attributes(self):
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.hub)
+
+
+@callback
+def _async_release_hub_diagnostics(
+    hass: HomeAssistant, hub: SmhiWarningsHub, entry_id: str
+) -> None:
+    """Release the feed's diagnostic sensors and offer them to other entries."""
+    hub.async_release_diagnostics(entry_id)
+    if not hass.is_stopping:
+        async_dispatcher_send(hass, SIGNAL_FEED_DIAGNOSTICS_RELEASED)
+
+
+class SmhiAlertItemSensor(SensorEntity):
+    """One active alert of an entry; its state is the severity code."""
+
+    _attr_should_poll = False
+    _attr_icon = "mdi:alert"
+
+    def __init__(self, entry: ConfigEntry, key: str, message: Dict[str, Any]) -> None:
+        self._message = message
+        self._attr_name = (
+            f"{DEFAULT_NAME} {message.get('event', '')} ({message.get('area', '')})"
+        )
+        self._attr_unique_id = f"{entry.entry_id}{ALERT_ENTITY_UNIQUE_ID_INFIX}{key}"
+        self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
+
+    @property
+    def native_value(self):
+        return self._message.get("code")
+
+    @property
+    def extra_state_attributes(self):
+        return compact_message(self._message)
+
+    @callback
+    def async_set_message(self, message: Dict[str, Any]) -> None:
+        """Show an updated version of the alert."""
+        self._message = message
+        if self.hass is not None:
+            self.async_write_ha_state()
+
+
+class AlertEntityTracker:
+    """Keep one SmhiAlertItemSensor per active alert of an entry.
+
+    Only the alerts that appeared, changed or expired since the last update
+    are touched, so each state change carries a single alert.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: "SmhiAlertCoordinator",
+        async_add_entities,
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self._async_add_entities = async_add_entities
+        self.entities: Dict[str, SmhiAlertItemSensor] = {}
+        self._messages: List[Dict[str, Any]] = []
+
+    @callback
+    def async_start(self):
+        """Create entities for the current alerts and follow the coordinator."""
+        self._async_remove_stale()
+        self.async_sync()
+        return self.coordinator.async_add_listener(self.async_sync)
+
+    def _current_messages(self) -> List[Dict[str, Any]]:
+        """Return the alerts that should have an entity now."""
+        data = self.coordinator.data
+        if getattr(self.coordinator, "alert_entities", False) and data:
+            return data.get("attributes", {}).get("messages") or []
+        return []
+
+    @callback
+    def async_sync(self) -> None:
+        """Apply the difference between the tracked and the current alerts."""
+        current = self._current_messages()
+        diff = diff_messages(self._messages, current)
+        if not diff:
+            return
+        self._messages = list(current)
+
+        added: List[SmhiAlertItemSensor] = []
+        for message in diff.new:
+            key = message_key(message)
+            if key not in self.entities:
+                entity = SmhiAlertItemSensor(self.entry, key, message)
+                self.entities[key] = entity
+                added.append(entity)
+        if added:
+            self._async_add_entities(added)
+        for message in diff.updated:
+            entity = self.entities.get(message_key(message))
+            if entity is not None:
+                entity.async_set_message(message)
+        for message in diff.expired:
+            entity = self.entities.pop(message_key(message), None)
+            if entity is not None:
+                self._async_remove_entity(entity)
+
+    @callback
+    def _async_remove_entity(self, entity: SmhiAlertItemSensor) -> None:
+        """Remove an expired alert entity, including its registry entry."""
+        registry = er.async_get(self.hass)
+        if entity.entity_id and registry.async_get(entity.entity_id):
+            # Removing the registry entry also removes the entity.
+            registry.async_remove(entity.entity_id)
+        elif entity.hass is not None:
+            self.hass.async_create_task(entity.async_remove())
+
+    @callback
+    def _async_remove_stale(self) -> None:
+        """Drop alert entities left over from alerts that expired meanwhile.
+
+        Entities of alerts that are still active keep their registry entry,
+        and with it any name, icon or area the user gave them.
+        """
+        registry = er.async_get(self.hass)
+        prefix = f"{self.entry.entry_id}{ALERT_ENTITY_UNIQUE_ID_INFIX}"
+        live = {f"{prefix}{message_key(m)}" for m in self._current_messages()}
+        for reg_entry in er.async_entries_for_config_entry(
+            registry, self.entry.entry_id
+        ):
+            unique_id = reg_entry.unique_id
+            if unique_id.startswith(prefix) and unique_id not in live:
+                registry.async_remove(reg_entry.entity_id)
+
+
 class SmhiAlertCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from SMHI."""
+    """Class to apply one entry's filters to the shared SMHI feed."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
         """Initialize."""
         self.hass = hass
         self.entry = entry
+        self.hub = async_get_hub(hass)
+        self.areas = async_get_areas_catalogue(hass)
+        self.message_types: List[str] = []
+        self._allowed_message_tokens: set[str] = set()
+        # Rendered (message, notice) per warning area, see _process_data.
+        self._render_cache: LRUCache = LRUCache(RENDER_CACHE_SIZE)
+        # Recent _process_data times in seconds, for diagnostics.
+        self.process_times = Samples()
+        self.apply_entry_options(entry)
+        # Last shared payload this entry filtered; lets 304s reuse the result.
+        self._payload: List[Dict[str, Any]] | None = None
+        # Changes between the last two filtered results.
+        self.last_diff = AlertDiff()
+        self._timeline = AlertTimeline([])
+        self._unsub_transition: CALLBACK_TYPE | None = None
+        self._apply_lock = asyncio.Lock()
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DEFAULT_NAME} ({self.areas.name(self.district)})",
+            # Polling is driven by the shared hub, see async_handle_hub_update.
+            update_interval=None,
+            # Unchanged results must not write state or add recorder rows.
+            always_update=False,
+            config_entry=entry,
+        )
+
+    @property
+    def render_cache(self) -> LRUCache:
+        """Return the rendered messages kept between polls."""
+        return self._render_cache
+
+    def apply_entry_options(self, entry: ConfigEntry) -> None:
+        """Load filter settings from the entry (options override data)."""
+        hass = self.hass
+        # Rendered messages depend on these settings.
+        self._render_cache.clear()
         self.mode = entry.options.get(
             CONF_MODE, entry.data.get(CONF_MODE, DEFAULT_MODE)
         )
@@ -211,7 +683,32 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
         )
         self.exclude_sea = entry.options.get(
             CONF_EXCLUDE_SEA,
-            entry.data.get(CONF_EXCLUDE_SEA, False),
+            entry.data.get(CONF_EXCLUDE_SEA, DEFAULT_EXCLUDE_SEA),
+        )
+        self.alert_entities = entry.options.get(
+            CONF_ALERT_ENTITIES,
+            entry.data.get(CONF_ALERT_ENTITIES, DEFAULT_ALERT_ENTITIES),
+        )
+        self.hub.async_set_poll_bounds(
+            entry.entry_id,
+            (
+                timedelta(
+                    minutes=float(
+                        entry.options.get(
+                            CONF_MIN_SCAN_INTERVAL,
+                            DEFAULT_MIN_SCAN_INTERVAL.total_seconds() / 60,
+                        )
+                    )
+                ),
+                timedelta(
+                    minutes=float(
+                        entry.options.get(
+                            CONF_MAX_SCAN_INTERVAL,
+                            DEFAULT_MAX_SCAN_INTERVAL.total_seconds() / 60,
+                        )
+                    )
+                ),
+            ),
         )
         self.latitude = float(
             entry.options.get(
@@ -228,9 +725,18 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
                 CONF_RADIUS_KM, entry.data.get(CONF_RADIUS_KM, DEFAULT_RADIUS_KM)
             )
         )
-        self.session = aiohttp_client.async_get_clientsession(hass)
-        self.message_types: List[str] = []
-        self._allowed_message_tokens: set[str] = set()
+        self.extra_districts = [
+            str(district)
+            for district in entry.options.get(
+                CONF_EXTRA_DISTRICTS, entry.data.get(CONF_EXTRA_DISTRICTS)
+            )
+            or []
+        ]
+        self.extra_locations = _parse_locations(
+            entry.options.get(
+                CONF_EXTRA_LOCATIONS, entry.data.get(CONF_EXTRA_LOCATIONS)
+            )
+        )
         self.set_message_types(
             entry.options.get(
                 CONF_MESSAGE_TYPES,
@@ -243,19 +749,14 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
                 ),
             ),
         )
-        self._etag: str | None = None
-        self._last_modified: str | None = None
-        self._last_success: str | None = None
-        self._failure_count: int = 0
-        self._base_interval = SCAN_INTERVAL
 
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=f"{DEFAULT_NAME} ({DISTRICTS.get(self.district, self.district)})",
-            update_interval=SCAN_INTERVAL,
-            config_entry=entry,
-        )
+    async def async_refilter(self) -> None:
+        """Re-evaluate the last payload with the current filters.
+
+        Used after an options change so new filters apply immediately and
+        without a network round-trip, even when upstream answers 304.
+        """
+        await self._async_apply_payload(reprocess=True)
 
     def set_message_types(
         self,
@@ -326,21 +827,63 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
                 return True
         return False
 
-    async def _async_update_data(self) -> Dict[str, Any]:
-        """Fetch data from SMHI with conditional requests and build derived metrics."""
-        req_start = monotonic()
-        headers: Dict[str, str] = {}
-        # Help upstream diagnose issues; also useful if SMHI applies any heuristics/rate-limits.
-        headers["User-Agent"] = (
-            f"HomeAssistant/{HA_VERSION} (custom_components.smhi_alerts)"
+    async def async_request_refresh(self) -> None:
+        """Request a refresh of the shared feed.
+
+        The hub coalesces requests from all entries and notifies every
+        coordinator once new data is available.
+        """
+        await self.hub.async_request_refresh()
+
+    @callback
+    def async_handle_hub_update(self) -> None:
+        """Apply this entry's filters to the latest shared payload."""
+        if not self.hub.last_update_success:
+            # The hub already logged the failure; only propagate availability.
+            self.last_exception = self.hub.last_exception
+            if self.last_update_success:
+                self.last_update_success = False
+                self.async_update_listeners()
+            return
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_apply_payload(),
+            name=f"{self.name} - apply payload",
         )
-        headers["Accept"] = "application/json"
-        headers["Accept-Encoding"] = "gzip, deflate"
-        if self._etag:
-            headers["If-None-Match"] = self._etag
-        if self._last_modified:
-            headers["If-Modified-Since"] = self._last_modified
 
+    async def _async_apply_payload(self, reprocess: bool = False) -> None:
+        """Filter the newest shared payload and publish the result."""
+        async with self._apply_lock:
+            # Always take the newest payload so results never go backwards.
+            payload = self._payload if self.hub.data is None else self.hub.data
+            if payload is None:
+                return
+            data = await self._async_build_data(payload, reprocess)
+        if data == self.data and self.last_update_success:
+            # The poll succeeded but the filtered result is unchanged; the
+            # heartbeat lives on the hub (last_success), not in our state.
+            return
+        self.async_set_updated_data(data)
+
+    async def _async_update_data(self) -> Dict[str, Any]:
+        """Build this entry's state from the shared SMHI payload."""
+        # Area names for entity names; cached on disk, refreshed in the background.
+        await self.areas.async_ensure_loaded()
+        payload = await self.hub.async_ensure_data()
+        async with self._apply_lock:
+            # A hub update applied meanwhile must not be overwritten by an
+            # older payload, so build from the newest one.
+            return await self._async_build_data(self.hub.data or payload)
+
+    async def _async_build_data(
+        self, payload: List[Dict[str, Any]], reprocess: bool = False
+    ) -> Dict[str, Any]:
+        """Filter the shared payload and build derived metrics.
+
+        Filtering walks every warning area (and polygon vertex in coordinate
+        mode), so it runs in the executor to keep the event loop responsive.
+        """
+        build_start = monotonic()
         data: Dict[str, Any] = {
             "state": "No Alerts" if self.language == "en" else "Inga varningar",
             "attributes": {
@@ -359,6 +902,16 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
                 "filter_radius_km": getattr(self, "radius_km", None),
                 "filter_exclude_sea": getattr(self, "exclude_sea", False),
                 "filter_include_geometry": getattr(self, "include_geometry", False),
+                "filter_alert_entities": getattr(self, "alert_entities", False),
+                "filter_extra_districts": list(getattr(self, "extra_districts", [])),
+                "filter_extra_locations": [
+                    {
+                        CONF_LATITUDE: lat,
+                        CONF_LONGITUDE: lon,
+                        CONF_RADIUS_KM: radius_km,
+                    }
+                    for lat, lon, radius_km in getattr(self, "extra_locations", [])
+                ],
                 "filter_message_types": list(
                     getattr(self, "message_types", DEFAULT_MESSAGE_TYPES)
                     or DEFAULT_MESSAGE_TYPES
@@ -366,164 +919,159 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
             },
         }
 
-        try:
+        if payload is self._payload and self.data and not reprocess:
+            # Unchanged upstream document (304): reuse the filtered result.
+            data.update(self.data)
+            data["attributes"] = dict(self.data.get("attributes", {}))
+        else:
+            process = self._process_data
+            if self.hub.profiler is not None:
+                process = self.hub.profiler.async_profiled_process(
+                    self.entry.entry_id, process
+                )
+
+            def _timed_process() -> Tuple[Tuple[Any, ...], float]:
+                process_start = monotonic()
+                result = process(payload)
+                return result, monotonic() - process_start
+
+            loop_start = monotonic()
+            (
+                (messages, notice, derived),
+                process_seconds,
+            ) = await self.hass.async_add_executor_job(_timed_process)
+            self.process_times.add(process_seconds)
             if _LOGGER.isEnabledFor(logging.DEBUG):
+                # process_seconds is how long the loop used to be blocked;
+                # the remainder is executor hand-off overhead.
                 _LOGGER.debug(
-                    "Fetching SMHI warnings (mode=%s, district=%s, timeout=%ss, failure_count=%s, interval=%s, headers=%s)",
-                    getattr(self, "mode", DEFAULT_MODE),
-                    getattr(self, "district", None),
-                    15,
-                    self._failure_count,
-                    self.update_interval,
-                    {
-                        k: headers.get(k)
-                        for k in ("If-None-Match", "If-Modified-Since")
-                        if k in headers
-                    },
+                    "Processed %s warnings in %.3fs in executor (handoff %.4fs, entry_id=%s)",
+                    len(payload),
+                    process_seconds,
+                    monotonic() - loop_start - process_seconds,
+                    self.entry.entry_id,
                 )
-            timeout = ClientTimeout(total=15)
-            async with self.session.get(
-                WARNINGS_URL, headers=headers, timeout=timeout
-            ) as response:
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug(
-                        "SMHI response received in %.3fs (status=%s, etag=%s, last_modified=%s, content-encoding=%s)",
-                        monotonic() - req_start,
-                        response.status,
-                        response.headers.get("ETag"),
-                        response.headers.get("Last-Modified"),
-                        response.headers.get("Content-Encoding", "none"),
-                    )
-
-                # Handle rate limiting
-                if response.status == 429:
-                    retry_after_header = response.headers.get("Retry-After")
-                    if retry_after_header:
-                        try:
-                            # Retry-After can be seconds (integer) or HTTP date
-                            retry_seconds = int(retry_after_header)
-                        except ValueError:
-                            # If it's a date, default to 60 seconds
-                            retry_seconds = 60
-                    else:
-                        retry_seconds = 60
-
-                    _LOGGER.warning(
-                        "SMHI API rate limit exceeded (429), will retry after %s seconds",
-                        retry_seconds,
-                    )
-                    raise UpdateFailed(
-                        f"Rate limit exceeded, retry after {retry_seconds}s",
-                        retry_after=timedelta(seconds=retry_seconds),
-                    )
+            if derived["alerts_count"] > 0:
+                data["state"] = "Alert" if self.language == "en" else "Varning"
+            data["attributes"]["messages"] = messages
+            data["attributes"]["notice"] = notice
+            data["attributes"].update(derived)
+            self._payload = payload
+            if self.data is not None:
+                self.last_diff = diff_messages(
+                    self.data.get("attributes", {}).get("messages") or [], messages
+                )
+                # A filter change is not news; only upstream changes fire events.
+                if not reprocess:
+                    self._fire_diff_events(self.last_diff)
 
-                if response.status == 304:
-                    # Cache hit - log it
-                    if _LOGGER.isEnabledFor(logging.DEBUG):
-                        _LOGGER.debug(
-                            "Cache hit (304 Not Modified) in %.3fs, reusing existing data",
-                            monotonic() - req_start,
-                        )
-                    data.update(self.data or {})
-                else:
-                    response.raise_for_status()
-                    json_data = await response.json()
-                    messages, notice, derived = self._process_data(json_data)
-                    if derived["alerts_count"] > 0:
-                        data["state"] = "Alert" if self.language == "en" else "Varning"
-                    data["attributes"]["messages"] = messages
-                    data["attributes"]["notice"] = notice
-                    data["attributes"].update(derived)
-                    data["attributes"]["filter_message_types"] = list(
-                        self.message_types or DEFAULT_MESSAGE_TYPES
-                    )
+        data["attributes"]["filter_message_types"] = list(
+            self.message_types or DEFAULT_MESSAGE_TYPES
+        )
 
-                    # Save caching headers
-                    self._etag = response.headers.get("ETag")
-                    self._last_modified = response.headers.get("Last-Modified")
+        # Active/upcoming counts follow the clock between polls.
+        self._timeline = AlertTimeline(data["attributes"]["messages"])
+        self._apply_timeline(data, dt_util.utcnow())
+        self._async_schedule_transition()
+        # Poll faster while an orange or red alert of this entry is near.
+        self.hub.async_set_escalations(
+            self.entry.entry_id, escalation_windows(data["attributes"]["messages"])
+        )
 
-            self._last_success = dt_util.utcnow().isoformat()
-            data["attributes"]["last_update"] = self._last_success
+        previous = self.data
+        if previous is not None and _content(previous) == _content(data):
+            # Nothing visible changed: keep the previous timestamps so the
+            # result equals self.data and no state is written.
+            for key in HEARTBEAT_ATTRIBUTES:
+                data["attributes"][key] = previous["attributes"].get(key)
+        else:
+            last_success = self.hub.last_success
+            data["attributes"]["last_update"] = last_success
             # Localized timestamp
             try:
                 data["attributes"]["last_update_local"] = dt_util.as_local(
-                    dt_util.parse_datetime(self._last_success)
+                    dt_util.parse_datetime(last_success)
                 ).isoformat()
             except Exception:
                 data["attributes"]["last_update_local"] = None
-            data["attributes"]["filter_message_types"] = list(
-                self.message_types or DEFAULT_MESSAGE_TYPES
-            )
 
-            # Reset backoff on success
-            self._failure_count = 0
-            self.update_interval = self._base_interval
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug(
-                    "SMHI update success in %.3fs (warnings=%s, messages=%s, alerts=%s)",
-                    monotonic() - req_start,
-                    data["attributes"].get("warnings_count"),
-                    data["attributes"].get("messages_count"),
-                    data["attributes"].get("alerts_count"),
-                )
-            return data
-
-        except asyncio.CancelledError:
-            # Allow Home Assistant to cancel updates cleanly (shutdown/reload)
-            raise
-        except (ClientError, asyncio.TimeoutError) as err:
-            # Exponential backoff
-            self._failure_count += 1
-            self._apply_backoff()
-            detail = str(err) or err.__class__.__name__
-            _LOGGER.debug(
-                "SMHI fetch failed in %.3fs (%s); applying backoff to interval=%s (failure_count=%s)",
-                monotonic() - req_start,
-                detail,
-                self.update_interval,
-                self._failure_count,
-            )
-            raise UpdateFailed(f"Communication error: {detail}") from err
-        except ValueError as err:
-            self._failure_count += 1
-            self._apply_backoff()
-            raise UpdateFailed(f"Invalid response: {err}") from err
-        except Exception as err:
-            self._failure_count += 1
-            self._apply_backoff()
-            raise UpdateFailed(str(err)) from err
-
-    def _apply_backoff(self) -> None:
-        # Cap backoff to 60 minutes
-        factor = min(self._failure_count, 5)
-        seconds = self._base_interval.total_seconds() * (2**factor)
-        max_seconds = 60 * 60
-        capped_seconds = min(seconds, max_seconds)
-        # Add a little jitter so multiple instances don't retry in lock-step.
-        jitter = random.uniform(0, min(5.0, capped_seconds * 0.05))
-        new_interval = timedelta(seconds=capped_seconds + jitter)
         if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug(
-                "Backoff update_interval: base=%s failure_count=%s seconds=%.3f jitter=%.3f -> %s",
-                self._base_interval,
-                self._failure_count,
-                capped_seconds,
-                jitter,
-                new_interval,
+                "SMHI filters applied in %.3fs (entry_id=%s, warnings=%s, messages=%s, alerts=%s)",
+                monotonic() - build_start,
+                self.entry.entry_id,
+                data["attributes"].get("warnings_count"),
+                data["attributes"].get("messages_count"),
+                data["attributes"].get("alerts_count"),
             )
-        self.update_interval = new_interval
+        return data
+
+    def _apply_timeline(self, data: Dict[str, Any], now: datetime) -> None:
+        """Set the active/upcoming counts of data as of now."""
+        active, upcoming = self._timeline.counts(now)
+        next_transition = self._timeline.next_transition(now)
+        data["attributes"]["active_count"] = active
+        data["attributes"]["upcoming_count"] = upcoming
+        data["attributes"]["next_transition"] = (
+            next_transition.isoformat() if next_transition else None
+        )
+
+    @callback
+    def _async_schedule_transition(self) -> None:
+        """Wake up at the next alert start or end, replacing any earlier timer."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        next_transition = self._timeline.next_transition(dt_util.utcnow())
+        if next_transition is not None:
+            self._unsub_transition = async_track_point_in_time(
+                self.hass, self._async_handle_transition, next_transition
+            )
+
+    @callback
+    def _async_handle_transition(self, now: datetime) -> None:
+        """Flip active/upcoming counts on time, without re-filtering."""
+        self._unsub_transition = None
+        if self.data is not None:
+            data = {**self.data, "attributes": dict(self.data["attributes"])}
+            self._apply_timeline(data, now)
+            self.async_set_updated_data(data)
+        self._async_schedule_transition()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the transition timer and release the poll bounds."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        self.hub.async_set_poll_bounds(self.entry.entry_id, None)
+        self.hub.async_set_escalations(self.entry.entry_id, None)
+        await super().async_shutdown()
+
+    def _fire_diff_events(self, diff: AlertDiff) -> None:
+        """Fire one compact bus event per new, updated or expired alert."""
+        for event_type, alerts in (
+            (EVENT_ALERT_NEW, diff.new),
+            (EVENT_ALERT_UPDATED, diff.updated),
+            (EVENT_ALERT_EXPIRED, diff.expired),
+        ):
+            for alert in alerts:
+                self.hass.bus.async_fire(
+                    event_type,
+                    {"entry_id": self.entry.entry_id, "alert": compact_message(alert)},
+                )
 
     def _process_data(
         self, data: List[Dict[str, Any]]
     ) -> Tuple[List[Dict[str, Any]], str, Dict[str, Any]]:
         """Process data, compute derived metrics, and build messages and notice."""
-        messages: List[Dict[str, Any]] = []
-        notice_lines: List[str] = []
+        # (message dict, notice fragment) per matching warning area
+        messages: List[Tuple[Dict[str, Any], str]] = []
         highest_severity: str = "NONE"
         warnings_count = 0
         messages_count = 0
 
         if not data:
+            self._render_cache.clear()
             return (
                 messages,
                 "",
@@ -535,51 +1083,83 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
                 },
             )
 
+        # Both indexes are built once per payload and shared via the hub.
+        districts = self.hub.district_index(data)
+        district_ids, locations = self._selectors()
+        # {selector: {id(warning area): [(names, marine)]}} for each district.
+        district_areas = {
+            district: districts.district(district)
+            for district in district_ids
+            if district != "all"
+        }
+        # [(selector, {id(warning area)})] for each location within radius.
+        location_areas: List[Tuple[str, frozenset[int]]] = []
+        if locations:
+            index = self.hub.geometry_index(data)
+            for label, lon, lat, radius_m in locations:
+                # Warning areas of the district(s) containing the point are
+                # tried first; every match still passes an exact test.
+                known = frozenset(
+                    key
+                    for district in self.areas.districts_at(lon, lat)
+                    for key in districts.district(district)
+                )
+                location_areas.append(
+                    (label, index.query(lon, lat, radius_m, known))
+                )
+
+        # Render cache keys of this pass; the rest belong to withdrawn alerts.
+        used_keys: set[Tuple[Any, ...]] = set()
         for alert in data:
             event = alert.get("event", {}).get(self.language, "")
             event_obj = alert.get("event", {})
-            event_code = str(event_obj.get("code", "")).upper()
-            mho_class = (event_obj.get("mhoClassification", {}) or {}).get("code")
-            mho_class = str(mho_class).upper() if mho_class else None
             warning_areas = alert.get("warningAreas", [])
             for area in warning_areas:
+                key = id(area)
                 valid_areas: List[str] = []
+                matched_by: List[str] = []
 
-                if getattr(self, "mode", DEFAULT_MODE) == "coordinate":
-                    if self.exclude_sea and self._is_marine_area(
-                        area, event_code, mho_class
-                    ):
-                        continue
-                    if self._area_matches_coordinate_filter(area):
+                if "all" in district_ids:
+                    affected = [("district:all", districts.affected(area))]
+                else:
+                    affected = [
+                        (f"district:{district}", areas[key])
+                        for district, areas in district_areas.items()
+                        if key in areas
+                    ]
+                for selector_id, affected_areas in affected:
+                    names = [
+                        affected_area.get(self.language)
+                        for affected_area, marine in affected_areas
+                        if not (self.exclude_sea and marine)
+                    ]
+                    names = [name for name in names if name]
+                    if names:
+                        valid_areas.extend(
+                            name for name in names if name not in valid_areas
+                        )
+                        matched_by.append(selector_id)
+
+                if location_areas and not (
+                    self.exclude_sea and districts.is_marine(area)
+                ):
+                    located = [
+                        selector_id
+                        for selector_id, matched in location_areas
+                        if key in matched
+                    ]
+                    matched_by.extend(located)
+                    if located and not valid_areas:
                         name_obj = area.get("areaName", {})
                         label = (
                             name_obj.get(self.language)
                             or name_obj.get("en")
                             or name_obj.get("sv")
                         )
-                        if label:
-                            valid_areas.append(label)
-                        else:
-                            valid_areas.append("Area")
-                    else:
-                        continue
-                else:
-                    affected_areas = area.get("affectedAreas", [])
-                    for affected_area in affected_areas:
-                        area_id = str(affected_area.get("id"))
-                        area_name = affected_area.get(self.language)
-                        if self.exclude_sea and (
-                            area_id in MARINE_AREA_IDS
-                            or event_code in MARINE_EVENT_CODES
-                            or mho_class == "OCE"
-                            or event_code.endswith("_SEA")
-                        ):
-                            continue
-                        if area_id == self.district or self.district == "all":
-                            if area_name:
-                                valid_areas.append(area_name)
-                    if not valid_areas:
-                        continue
+                        valid_areas.append(label or "Area")
+
+                if not valid_areas:
+                    continue
 
                 severity_info = area.get("warningLevel", {})
                 code = str(severity_info.get("code", "")).upper()
@@ -599,63 +1179,41 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
                 ) > SEVERITY_ORDER.index(highest_severity):
                     highest_severity = code
 
-                descr = area.get("eventDescription", {}).get(self.language, "")
-                start_time = area.get("approximateStart", "")
-                end_time = area.get("approximateEnd", "") or (
-                    "Unknown" if self.language == "en" else "Okänt"
-                )
-                published = area.get("published", "")
-
-                # Local time conversions
-                def to_local_iso(value: Any) -> Any:
-                    if not isinstance(value, str):
-                        return None
-                    try:
-                        dt_utc = dt_util.parse_datetime(value)
-                        if dt_utc is None:
-                            return None
-                        return dt_util.as_local(dt_utc).isoformat()
-                    except Exception:
-                        return None
-
-                start_local = to_local_iso(start_time)
-                end_local = to_local_iso(end_time)
-                published_local = to_local_iso(published)
-
-                details_lines: List[str] = []
-                descriptions = area.get("descriptions", [])
-                for desc in descriptions:
-                    title = desc.get("title", {}).get(self.language, "")
-                    text = desc.get("text", {}).get(self.language, "")
-                    if title or text:
-                        details_lines.append(f"{title}: {text}".strip())
-                details = "\n".join(details_lines)
-
-                msg = {
-                    "event": event,
-                    "start": start_time,
-                    "start_local": start_local,
-                    "end": end_time,
-                    "end_local": end_local,
-                    "published": published,
-                    "published_local": published_local,
-                    "code": code,
-                    "severity": severity,
-                    "level": severity,
-                    "descr": descr,
-                    "details": details,
-                    "area": ", ".join(valid_areas),
-                    "event_color": self._get_event_color(code),
-                }
-                # Optional: include geometry (GeoJSON) for the warning area so UI cards can render a map.
-                # This can be large, so it's opt-in via config/options.
-                if getattr(self, "include_geometry", False):
-                    geom = area.get("area")
-                    if geom:
-                        msg["geometry"] = geom
-
-                messages.append(msg)
-                notice_lines.append(self._format_notice(msg))
+                # Unchanged areas reuse the message rendered on an earlier poll.
+                warning_id = alert.get("id")
+                area_id = area.get("id")
+                cache_key = None
+                rendered = None
+                if warning_id is not None and area_id is not None:
+                    cache_key = (
+                        warning_id,
+                        area_id,
+                        area.get("published"),
+                        self.language,
+                        # Part of the key so a pass racing an options change
+                        # cannot leave renderings of the old setting behind.
+                        getattr(self, "include_geometry", False),
+                        tuple(valid_areas),
+                        tuple(matched_by),
+                    )
+                    rendered = self._render_cache.get(cache_key)
+                    used_keys.add(cache_key)
+                if rendered is None:
+                    rendered = self._render_area(
+                        event,
+                        area,
+                        warning_id if cache_key is not None else None,
+                        code,
+                        severity,
+                        valid_areas,
+                        matched_by,
+                    )
+                    if cache_key is not None:
+                        self._render_cache.put(cache_key, rendered)
+                messages.append(rendered)
+
+        if len(self._render_cache) > len(used_keys):
+            self._render_cache.retain(used_keys)
 
         alerts_count = warnings_count + (messages_count if self.include_messages else 0)
         derived = {
@@ -669,200 +1227,127 @@ class SmhiAlertCoordinator(DataUpdateCoordinator):
         def _rank(code: str) -> int:
             return SEVERITY_ORDER.index(code if code in SEVERITY_ORDER else "NONE")
 
-        messages_sorted = sorted(
-            messages, key=lambda m: _rank(m.get("code", "NONE")), reverse=True
+        rendered_sorted = sorted(
+            messages, key=lambda r: _rank(r[0].get("code", "NONE")), reverse=True
         )
-        # Rebuild notice to reflect sorted order
-        notice_sorted = "".join(self._format_notice(m) for m in messages_sorted)
-        return messages_sorted, notice_sorted, derived
+        # Join notice fragments in sorted order
+        notice_sorted = "".join(notice for _, notice in rendered_sorted)
+        return [msg for msg, _ in rendered_sorted], notice_sorted, derived
 
-    # --- Geometry helpers for coordinate filtering ---
-    def _area_matches_coordinate_filter(self, area: Dict[str, Any]) -> bool:
-        geometry_container = area.get("area")
-        if not geometry_container:
-            return False
+    def _render_area(
+        self,
+        event: str,
+        area: Dict[str, Any],
+        warning_id: Any,
+        code: str,
+        severity: str,
+        valid_areas: List[str],
+        matched_by: List[str],
+    ) -> Tuple[Dict[str, Any], str]:
+        """Render the message and notice fragment of one matching warning area.
+
+        warning_id is None when the area cannot be cached (no ids); the
+        message then has no id and carries its geometry inline.
+        """
+        area_id = area.get("id")
+        descr = area.get("eventDescription", {}).get(self.language, "")
+        start_time = area.get("approximateStart", "")
+        end_time = area.get("approximateEnd", "") or (
+            "Unknown" if self.language == "en" else "Okänt"
+        )
+        published = area.get("published", "")
+
+        # Local time conversions
+        start_local = _to_local_iso(start_time)
+        end_local = _to_local_iso(end_time)
+        published_local = _to_local_iso(published)
+
+        details_lines: List[str] = []
+        descriptions = area.get("descriptions", [])
+        for desc in descriptions:
+            title = desc.get("title", {}).get(self.language, "")
+            text = desc.get("text", {}).get(self.language, "")
+            if title or text:
+                details_lines.append(f"{title}: {text}".strip())
+        details = "\n".join(details_lines)
+
+        msg = {
+            "id": f"{warning_id}:{area_id}" if warning_id is not None else None,
+            "event": event,
+            "start": start_time,
+            "start_local": start_local,
+            "end": end_time,
+            "end_local": end_local,
+            "published": published,
+            "published_local": published_local,
+            "code": code,
+            "severity": severity,
+            "level": severity,
+            "descr": descr,
+            "details": details,
+            "area": ", ".join(valid_areas),
+            "matched_by": matched_by,
+            "event_color": self._get_event_color(code),
+        }
+        # Optional: let UI cards render the warning area on a map.
+        # The GeoJSON can be large, so messages only carry a
+        # reference the card resolves via smhi_alerts/geometry.
+        if getattr(self, "include_geometry", False):
+            geom = area.get("area")
+            if geom and warning_id is not None:
+                msg["geometry_ref"] = geometry_ref(warning_id, area_id)
+            elif geom:
+                msg["geometry"] = geom
+
+        return msg, self._format_notice(msg)
 
-        center_lon = float(getattr(self, "longitude", 0.0))
-        center_lat = float(getattr(self, "latitude", 0.0))
-        radius_m = float(getattr(self, "radius_km", DEFAULT_RADIUS_KM)) * 1000.0
-
-        def feature_matches(feature: Dict[str, Any]) -> bool:
-            geom = feature.get("geometry", feature)  # feature or raw geometry
-            if not isinstance(geom, dict):
-                return False
-            gtype = geom.get("type")
-            coords = geom.get("coordinates")
-            if not gtype or coords is None:
-                return False
-            if gtype == "Polygon":
-                return self._polygon_within_radius(
-                    center_lon, center_lat, radius_m, coords
-                )
-            if gtype == "LineString":
-                return self._linestring_within_radius(
-                    center_lon, center_lat, radius_m, coords
-                )
-            if gtype == "MultiPolygon":
-                for poly in coords or []:
-                    if self._polygon_within_radius(
-                        center_lon, center_lat, radius_m, poly
-                    ):
-                        return True
-                return False
-            if gtype == "MultiLineString":
-                for line in coords or []:
-                    if self._linestring_within_radius(
-                        center_lon, center_lat, radius_m, line
-                    ):
-                        return True
-                return False
+    # --- Geometry helpers for coordinate filtering ---
+    def _area_matches_coordinate_filter(
+        self,
+        area: Dict[str, Any],
+        index: Optional[PayloadGeometryIndex] = None,
+    ) -> bool:
+        geometry = (
+            index.get(area)
+            if index is not None
+            else AreaGeometry.from_container(area.get("area"))
+        )
+        if geometry is None:
             return False
 
-        gtype = geometry_container.get("type")
-        if gtype == "FeatureCollection":
-            for feat in geometry_container.get("features", []) or []:
-                if feature_matches(feat):
-                    return True
-            return False
-        if gtype == "Feature":
-            return feature_matches(geometry_container)
-        # Some payloads embed raw geometry directly
-        return feature_matches(geometry_container)
+        center_lon, center_lat, radius_m = self._coordinate_filter()
+        dlon, dlat = radius_to_degrees(center_lat, radius_m)
+        return geometry.within_radius(center_lon, center_lat, radius_m, dlon, dlat)
 
-    def _is_marine_area(
-        self, area: Dict[str, Any], event_code: str, mho_class: Optional[str]
-    ) -> bool:
-        # Marine by event classification
-        if event_code in MARINE_EVENT_CODES or (
-            event_code and event_code.endswith("_SEA")
-        ):
-            return True
-        if mho_class == "OCE":
-            return True
-        # Marine by affectedAreas IDs
-        for affected in area.get("affectedAreas", []) or []:
-            if str(affected.get("id")) in MARINE_AREA_IDS:
-                return True
-        return False
+    def _selectors(self) -> Tuple[List[str], List[Tuple[str, float, float, float]]]:
+        """Return this entry's district ids and (label, lon, lat, radius_m) points.
 
-    def _project(
-        self, lon: float, lat: float, lon0: float, lat0: float
-    ) -> Tuple[float, float]:
-        # Equirectangular projection around (lon0, lat0) in meters
-        from math import radians, cos
-
-        R = 6371000.0
-        lat_r = radians(lat)
-        lon_r = radians(lon)
-        lat0_r = radians(lat0)
-        lon0_r = radians(lon0)
-        x = (lon_r - lon0_r) * cos(lat0_r) * R
-        y = (lat_r - lat0_r) * R
-        return x, y
-
-    def _point_in_polygon(
-        self,
-        point_xy: Tuple[float, float],
-        poly_lonlat_rings: List[List[List[float]]],
-        center_lon: float,
-        center_lat: float,
-    ) -> bool:
-        # Only consider outer ring for inclusion; ignore holes for simplicity
-        if not poly_lonlat_rings:
-            return False
-        outer = poly_lonlat_rings[0]
-        if not outer:
-            return False
-        x, y = point_xy
-        inside = False
-        # Ray casting
-        for i in range(len(outer)):
-            lon_i, lat_i = outer[i]
-            lon_j, lat_j = outer[i - 1] if i > 0 else outer[-1]
-            xi, yi = self._project(lon_i, lat_i, center_lon, center_lat)
-            xj, yj = self._project(lon_j, lat_j, center_lon, center_lat)
-            intersect = ((yi > y) != (yj > y)) and (
-                x < (xj - xi) * (y - yi) / (yj - yi + 1e-12) + xi
-            )
-            if intersect:
-                inside = not inside
-        return inside
-
-    def _distance_point_to_segment(
-        self, px: float, py: float, ax: float, ay: float, bx: float, by: float
-    ) -> float:
-        # Return min distance from point P to segment AB in meters
-        from math import hypot
-
-        abx = bx - ax
-        aby = by - ay
-        apx = px - ax
-        apy = py - ay
-        denom = abx * abx + aby * aby
-        if denom <= 0:
-            return hypot(px - ax, py - ay)
-        t = max(0.0, min(1.0, (apx * abx + apy * aby) / denom))
-        cx = ax + t * abx
-        cy = ay + t * aby
-        return hypot(px - cx, py - cy)
-
-    def _polygon_within_radius(
-        self,
-        center_lon: float,
-        center_lat: float,
-        radius_m: float,
-        poly_coords: List[List[List[float]]],
-    ) -> bool:
-        px, py = self._project(center_lon, center_lat, center_lon, center_lat)
-        if self._point_in_polygon((px, py), poly_coords, center_lon, center_lat):
-            return True
-        # Min distance to outer ring
-        outer = poly_coords[0] if poly_coords else []
-        if len(outer) < 2:
-            return False
-        min_d = 1e20
-        prev = None
-        for pt in outer:
-            if prev is None:
-                prev = pt
-                continue
-            ax, ay = self._project(prev[0], prev[1], center_lon, center_lat)
-            bx, by = self._project(pt[0], pt[1], center_lon, center_lat)
-            d = self._distance_point_to_segment(px, py, ax, ay, bx, by)
-            if d < min_d:
-                min_d = d
-            prev = pt
-        # Close ring
-        ax, ay = self._project(outer[-1][0], outer[-1][1], center_lon, center_lat)
-        bx, by = self._project(outer[0][0], outer[0][1], center_lon, center_lat)
-        d = self._distance_point_to_segment(px, py, ax, ay, bx, by)
-        if d < min_d:
-            min_d = d
-        return min_d <= radius_m
-
-    def _linestring_within_radius(
-        self,
-        center_lon: float,
-        center_lat: float,
-        radius_m: float,
-        line_coords: List[List[float]],
-    ) -> bool:
-        if not line_coords or len(line_coords) < 2:
-            return False
-        px, py = self._project(center_lon, center_lat, center_lon, center_lat)
-        min_d = 1e20
-        prev = None
-        for pt in line_coords:
-            if prev is None:
-                prev = pt
-                continue
-            ax, ay = self._project(prev[0], prev[1], center_lon, center_lat)
-            bx, by = self._project(pt[0], pt[1], center_lon, center_lat)
-            d = self._distance_point_to_segment(px, py, ax, ay, bx, by)
-            if d < min_d:
-                min_d = d
-            prev = pt
-        return min_d <= radius_m
+        The primary district or location comes first, followed by the extra
+        ones; every warning area is evaluated against all of them in one pass.
+        """
+        districts: List[str] = []
+        locations: List[Tuple[str, float, float, float]] = []
+        if getattr(self, "mode", DEFAULT_MODE) == "coordinate":
+            points = [(self.latitude, self.longitude, self.radius_km)]
+        else:
+            points = []
+            districts.append(str(self.district))
+        points.extend(getattr(self, "extra_locations", []))
+        for district in getattr(self, "extra_districts", []):
+            if district not in districts:
+                districts.append(district)
+        for lat, lon, radius_km in points:
+            label = f"coordinate:{round(lat, 4)},{round(lon, 4)}@{radius_km:g}km"
+            locations.append((label, lon, lat, radius_km * 1000.0))
+        return districts, locations
+
+    def _coordinate_filter(self) -> Tuple[float, float, float]:
+        """Return the configured (lon, lat, radius in meters)."""
+        return (
+            float(getattr(self, "longitude", 0.0)),
+            float(getattr(self, "latitude", 0.0)),
+            float(getattr(self, "radius_km", DEFAULT_RADIUS_KM)) * 1000.0,
+        )
 
     def _get_event_color(self, code):
         """Return color code based on severity code."""
@@ -0,0 +1,45 @@
+"""Services of the SMHI Alert integration."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import voluptuous as vol
+
+from .const import (
+    ATTR_UPDATES,
+    DATA_HUB,
+    DOMAIN,
+    PROFILE_MAX_UPDATES,
+    SERVICE_PROFILE_NEXT_UPDATES,
+)
+from .profiler import UpdateProfiler
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_UPDATES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_UPDATES)
+        ),
+    }
+)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def _async_profile_next_updates(call: ServiceCall) -> None:
+        """Profile the next N updates of the shared feed."""
+        hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+        if hub is None:
+            raise HomeAssistantError("No SMHI Alert entry is set up")
+        if hub.profiler is not None:
+            raise HomeAssistantError("A profile is already being captured")
+        hub.profiler = UpdateProfiler(hass, hub, call.data[ATTR_UPDATES])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_NEXT_UPDATES,
+        _async_profile_next_updates,
+        schema=PROFILE_SCHEMA,
+    )
@@ -0,0 +1,205 @@
+"""Benchmarks for the coordinator hot path over synthetic payloads.
+
+Run from the repository root:
+
+    python custom_components/smhi_alerts/tests/bench_process_data.py [--quick] [--json FILE]
+
+Every mode (one district, "all", coordinate) is measured with geometry on
+and off over payloads of increasing size. Cold runs rebuild the shared
+indexes and the render cache, warm runs reuse them as a steady-state poll
+does. Peak memory is the tracemalloc peak of one cold run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from statistics import median
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import Any
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from helpers import FakeSession, FakeStore, make_entry, make_hass  # noqa: E402
+from synthetic import make_payload  # noqa: E402
+
+from custom_components.smhi_alerts import areas as areas_module  # noqa: E402
+from custom_components.smhi_alerts import hub as hub_module  # noqa: E402
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator  # noqa: E402
+
+# (warnings, areas per warning, vertices per polygon)
+SIZES = [(10, 5, 32), (50, 10, 128), (200, 20, 512)]
+QUICK_SIZES = [(5, 3, 16)]
+MODES = {
+    "district": {"district": "1"},
+    "all": {"district": "all"},
+    "coordinate": {
+        "mode": "coordinate",
+        "latitude": 59.3,
+        "longitude": 18.0,
+        "radius_km": 50,
+    },
+}
+
+
+def _time(func, repeat: int) -> float:
+    """Return the median wall time of func in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        samples.append(perf_counter() - start)
+    return median(samples)
+
+
+def _peak_bytes(func) -> int:
+    """Return the tracemalloc peak while running func once."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_process_data(
+    coordinator: SmhiAlertCoordinator, payload: list[dict[str, Any]], repeat: int
+) -> dict[str, Any]:
+    """Measure _process_data cold (no caches) and warm."""
+
+    def cold() -> None:
+        coordinator.hub._indexes.clear()
+        coordinator.render_cache.clear()
+        coordinator._process_data(payload)
+
+    def warm() -> None:
+        coordinator._process_data(payload)
+
+    areas = sum(len(alert["warningAreas"]) for alert in payload)
+    cold_s = _time(cold, repeat)
+    warm()
+    warm_s = _time(warm, repeat)
+    return {
+        "cold_ms": cold_s * 1000,
+        "warm_ms": warm_s * 1000,
+        "areas_per_s": areas / cold_s if cold_s else float("inf"),
+        "peak_kib": _peak_bytes(cold) / 1024,
+    }
+
+
+def bench_coordinate_filter(
+    coordinator: SmhiAlertCoordinator, payload: list[dict[str, Any]], repeat: int
+) -> float:
+    """Return _area_matches_coordinate_filter calls per second."""
+    index = coordinator.hub.geometry_index(payload)
+    areas = [area for alert in payload for area in alert["warningAreas"]]
+
+    def run() -> None:
+        for area in areas:
+            coordinator._area_matches_coordinate_filter(area, index)
+
+    seconds = _time(run, repeat)
+    return len(areas) / seconds if seconds else float("inf")
+
+
+def bench_should_include(
+    coordinator: SmhiAlertCoordinator, payload: list[dict[str, Any]], repeat: int
+) -> float:
+    """Return _should_include_message calls per second."""
+    events = [alert["event"] for alert in payload]
+
+    def run() -> None:
+        for event in events:
+            coordinator._should_include_message(event)
+
+    seconds = _time(run, repeat)
+    return len(events) / seconds if seconds else float("inf")
+
+
+async def async_run(
+    sizes: list[tuple[int, int, int]] = SIZES, repeat: int = 5
+) -> list[dict[str, Any]]:
+    """Run every scenario; the hub's session and Store must be faked."""
+    hass = make_hass()
+    results = []
+    for mode, data in MODES.items():
+        for geometry in (False, True):
+            coordinator = SmhiAlertCoordinator(
+                hass,
+                make_entry(
+                    f"{mode}-{geometry}",
+                    include_geometry=geometry,
+                    include_messages=True,
+                    **data,
+                ),
+            )
+            for warnings, areas, vertices in sizes:
+                payload = make_payload(warnings, areas, vertices, geometry=geometry)
+                row = {
+                    "mode": mode,
+                    "geometry": geometry,
+                    "warnings": warnings,
+                    "areas": areas,
+                    "vertices": vertices,
+                    **bench_process_data(coordinator, payload, repeat),
+                    "include_msg_per_s": bench_should_include(
+                        coordinator, payload, repeat
+                    ),
+                }
+                if mode == "coordinate" and geometry:
+                    row["coord_filter_per_s"] = bench_coordinate_filter(
+                        coordinator, payload, repeat
+                    )
+                results.append(row)
+    await coordinator.hub.async_shutdown()
+    return results
+
+
+def format_table(results: list[dict[str, Any]]) -> str:
+    """Return the results as a fixed-width table."""
+    header = (
+        f"{'mode':<11}{'geom':<6}{'size':>14}{'cold ms':>10}{'warm ms':>10}"
+        f"{'areas/s':>11}{'peak KiB':>10}{'filter/s':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in results:
+        size = f"{row['warnings']}x{row['areas']}x{row['vertices']}"
+        coord = row.get("coord_filter_per_s")
+        lines.append(
+            f"{row['mode']:<11}{'on' if row['geometry'] else 'off':<6}{size:>14}"
+            f"{row['cold_ms']:>10.2f}{row['warm_ms']:>10.2f}"
+            f"{row['areas_per_s']:>11.0f}{row['peak_kib']:>10.0f}"
+            f"{(f'{coord:.0f}' if coord else '-'):>11}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    """Run the benchmarks outside pytest with a faked session and Store."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smallest size only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    fake = FakeSession()
+    hub_module.aiohttp_client.async_get_clientsession = lambda _hass: fake
+    hub_module.Store = FakeStore
+    areas_module.Store = FakeStore
+
+    results = asyncio.run(
+        async_run(QUICK_SIZES if args.quick else SIZES, args.repeat)
+    )
+    print(format_table(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,23 @@
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.smhi_alerts import areas as areas_module
+from custom_components.smhi_alerts import hub as hub_module
+from helpers import AREAS, FakeSession, FakeStore
+
+
+@pytest.fixture
+def session(monkeypatch) -> FakeSession:
+    fake = FakeSession()
+    monkeypatch.setattr(
+        hub_module.aiohttp_client, "async_get_clientsession", lambda _hass: fake
+    )
+    monkeypatch.setattr(hub_module, "Store", FakeStore)
+    monkeypatch.setattr(areas_module, "Store", FakeStore)
+    # Tests refresh back to back; the gap has its own test.
+    monkeypatch.setattr(hub_module, "FETCH_MIN_GAP", 0)
+    FakeStore.saved = None
+    # A fresh catalogue on disk, so tests do not start a background refresh.
+    FakeStore.areas = {"areas": AREAS, "fetched_at": dt_util.utcnow().isoformat()}
+    return fake
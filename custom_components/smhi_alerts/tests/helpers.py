@@ -0,0 +1,174 @@
+"""Fakes shared by the tests and the standalone tools next to them.
+
+Plain module without pytest, so soak.py and bench_process_data.py can
+import it too; the pytest fixtures live in conftest.py.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from custom_components.smhi_alerts.const import AREAS_URL
+
+PAYLOAD = [
+    {
+        "event": {"sv": "Vind", "en": "Wind", "code": "WIND"},
+        "warningAreas": [
+            {
+                "warningLevel": {"code": "YELLOW", "sv": "Gul", "en": "Yellow"},
+                "affectedAreas": [{"id": 1, "sv": "Stockholms län", "en": "Stockholm"}],
+                "approximateStart": "2026-01-01T10:00:00Z",
+                "published": "2026-01-01T08:00:00Z",
+            },
+            {
+                "warningLevel": {"code": "ORANGE", "sv": "Orange", "en": "Orange"},
+                "affectedAreas": [{"id": 12, "sv": "Skåne län", "en": "Skåne"}],
+                "approximateStart": "2026-01-01T10:00:00Z",
+                "published": "2026-01-01T08:00:00Z",
+            },
+        ],
+    }
+]
+
+
+AREAS = [
+    {"id": 1, "sv": "Stockholms län", "en": "Stockholm County"},
+    {"id": 12, "sv": "Skåne län", "en": "Skåne County"},
+]
+
+# Same warning with ids, for tests that track warnings across polls.
+WARNINGS = [
+    {
+        "id": 100,
+        "event": {"en": "Wind", "code": "WIND"},
+        "warningAreas": [
+            {
+                "id": 1,
+                "published": "2026-01-01T08:00:00Z",
+                "warningLevel": {"code": "YELLOW", "en": "Yellow"},
+                "affectedAreas": [{"id": 1, "en": "Stockholm"}],
+                "approximateStart": "2026-01-01T10:00:00Z",
+            },
+            {
+                "id": 2,
+                "published": "2026-01-01T08:00:00Z",
+                "warningLevel": {"code": "ORANGE", "en": "Orange"},
+                "affectedAreas": [{"id": 12, "en": "Skåne"}],
+                "approximateStart": "2026-01-01T10:00:00Z",
+            },
+        ],
+    }
+]
+
+POLYGON = {"type": "Polygon", "coordinates": [[[18, 59], [19, 59], [19, 60], [18, 59]]]}
+
+
+class FakeResponse:
+    def __init__(self, status: int, payload, headers=None, delay=0.0) -> None:
+        self.status = status
+        self._payload = payload
+        self.headers = headers or {}
+        self._delay = delay
+        self.content_length = None
+
+    async def __aenter__(self):
+        await asyncio.sleep(self._delay)
+        return self
+
+    async def __aexit__(self, *_exc):
+        return False
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return json.dumps(self._payload).encode()
+
+    async def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.area_calls = 0
+        self.payload = PAYLOAD
+        self.delay = 0.0
+
+    def get(self, url, headers=None, timeout=None):
+        if url == AREAS_URL:
+            self.area_calls += 1
+            return FakeResponse(200, AREAS)
+        self.calls.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304, None, delay=self.delay)
+        return FakeResponse(200, self.payload, {"ETag": '"v1"'}, self.delay)
+
+
+class FakeStore:
+    # Warnings snapshot and areas catalogue, by storage key.
+    saved: dict | None = None
+    areas: dict | None = None
+
+    def __init__(self, _hass, _version, key) -> None:
+        self._slot = "areas" if key.endswith(".areas") else "saved"
+
+    async def async_load(self):
+        return getattr(FakeStore, self._slot)
+
+    def async_delay_save(self, data_func, _delay) -> None:
+        setattr(FakeStore, self._slot, data_func())
+
+
+def make_hass() -> SimpleNamespace:
+    tasks: list[asyncio.Task] = []
+
+    def _create_task(coro, name=None, eager_start=False):
+        task = asyncio.ensure_future(coro)
+        tasks.append(task)
+        return task
+
+    async def _add_executor_job(target, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+    def _run_hass_job(job, *args):
+        # Timers and debouncers run their HassJob through this.
+        result = job.target(*args)
+        if asyncio.iscoroutine(result):
+            return _create_task(result)
+        return result
+
+    events: list[tuple[str, dict]] = []
+    bus = SimpleNamespace(
+        async_fire=lambda event_type, data: events.append((event_type, data))
+    )
+
+    return SimpleNamespace(
+        data={},
+        is_stopping=False,
+        loop=asyncio.get_running_loop(),
+        config=SimpleNamespace(latitude=59.3, longitude=18.0),
+        async_create_background_task=_create_task,
+        async_add_executor_job=_add_executor_job,
+        async_run_hass_job=_run_hass_job,
+        tasks=tasks,
+        bus=bus,
+        events=events,
+    )
+
+
+def make_entry(entry_id: str, district: str = "all", **data) -> SimpleNamespace:
+    def _create_task(hass, coro, name=None):
+        return hass.async_create_background_task(coro, name)
+
+    return SimpleNamespace(
+        entry_id=entry_id,
+        title=entry_id,
+        data={"district": district, "language": "en", **data},
+        options={},
+        pref_disable_polling=False,
+        async_on_unload=lambda _cb: None,
+        async_create_background_task=_create_task,
+    )
+
+
@@ -0,0 +1,318 @@
+"""Soak-test harness: many entries over days of virtual time.
+
+Drives a set of SmhiAlertCoordinator instances through the shared hub
+against the local stand-in server. A fake clock replaces utcnow, the
+hub's monotonic clock and the transition timers, so days of publishes,
+escalations, expiries, 304 streaks and outages run in seconds. Run from
+the repository root:
+
+    python custom_components/smhi_alerts/tests/soak.py [--entries 20] [--days 14]
+
+The run fails (exit code 1) if traced memory or the number of live
+objects keeps growing after the first cycle.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import gc
+import heapq
+from itertools import count
+from pathlib import Path
+from statistics import quantiles
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import Any, Callable
+
+import aiohttp
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from helpers import FakeStore, make_entry, make_hass  # noqa: E402
+from standin_server import StandInServer  # noqa: E402
+from synthetic import EPOCH, LEVELS, make_payload  # noqa: E402
+
+from custom_components.smhi_alerts import areas as areas_module  # noqa: E402
+from custom_components.smhi_alerts import hub as hub_module  # noqa: E402
+from custom_components.smhi_alerts import sensor as sensor_module  # noqa: E402
+from custom_components.smhi_alerts.const import DISTRICTS  # noqa: E402
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator  # noqa: E402
+
+CYCLE = timedelta(hours=12)
+# Memory or object count may exceed the first half's peak by this much.
+GROWTH_RATIO = 0.10
+MEMORY_SLACK = 512 * 1024
+OBJECT_SLACK = 2000
+
+
+class FakeClock:
+    """Virtual UTC time with point-in-time timers."""
+
+    def __init__(self, start: datetime) -> None:
+        """Start the clock at start."""
+        self.start = start
+        self.now = start
+        self._timers: list[tuple[datetime, int, Callable[[datetime], Any]]] = []
+        self._seq = count()
+        self._cancelled: set[int] = set()
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+    def monotonic(self) -> float:
+        return (self.now - self.start).total_seconds()
+
+    def track_point_in_time(
+        self, _hass: Any, action: Callable[[datetime], Any], when: datetime
+    ) -> Callable[[], None]:
+        """Call action(when) once the clock reaches when."""
+        seq = next(self._seq)
+        heapq.heappush(self._timers, (when, seq, action))
+        return lambda: self._cancelled.add(seq)
+
+    def advance_to(self, when: datetime) -> None:
+        """Move to when, firing due timers in order on the way."""
+        while self._timers and self._timers[0][0] <= when:
+            fire_at, seq, action = heapq.heappop(self._timers)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+            self.now = max(self.now, fire_at)
+            action(self.now)
+        self.now = max(self.now, when)
+
+    @property
+    def pending_timers(self) -> int:
+        return len(self._timers) - len(self._cancelled)
+
+
+class Patches:
+    """Attribute replacements that are undone together."""
+
+    def __init__(self) -> None:
+        self._undo: list[tuple[Any, str, Any]] = []
+
+    def set(self, target: Any, name: str, value: Any) -> None:
+        self._undo.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def undo(self) -> None:
+        while self._undo:
+            target, name, value = self._undo.pop()
+            setattr(target, name, value)
+
+
+@dataclass
+class SoakResult:
+    """Measurements of one soak run."""
+
+    updates: int = 0
+    latencies: list[float] = field(default_factory=list)
+    memory: list[int] = field(default_factory=list)
+    objects: list[int] = field(default_factory=list)
+    peak_memory: int = 0
+    statuses: Counter[int] = field(default_factory=Counter)
+    intervals: Counter[timedelta] = field(default_factory=Counter)
+    pending_timers: int = 0
+
+    def latency_percentiles(self) -> tuple[float, float, float]:
+        """Return p50, p95 and p99 update latency in milliseconds."""
+        if len(self.latencies) < 2:
+            value = self.latencies[0] * 1000 if self.latencies else 0.0
+            return value, value, value
+        cuts = quantiles(self.latencies, n=100)
+        return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+    def growth_errors(self) -> list[str]:
+        """Return why memory or object counts look unbounded, if they do."""
+        errors = []
+        for label, samples, slack in (
+            ("traced memory", self.memory, MEMORY_SLACK),
+            ("live objects", self.objects, OBJECT_SLACK),
+        ):
+            # The first cycle warms caches and is not judged.
+            steady = samples[1:]
+            if len(steady) < 4:
+                continue
+            half = len(steady) // 2
+            limit = max(steady[:half]) * (1 + GROWTH_RATIO) + slack
+            if max(steady[half:]) > limit:
+                errors.append(
+                    f"{label} grew from {max(steady[:half])} to "
+                    f"{max(steady[half:])} (limit {limit:.0f})"
+                )
+        return errors
+
+    def summary(self) -> str:
+        p50, p95, p99 = self.latency_percentiles()
+        return "\n".join(
+            [
+                f"updates: {self.updates}",
+                f"latency ms p50/p95/p99: {p50:.2f}/{p95:.2f}/{p99:.2f}",
+                f"responses: {dict(sorted(self.statuses.items()))}",
+                "poll intervals: "
+                + ", ".join(
+                    f"{interval}x{n}" for interval, n in sorted(self.intervals.items())
+                ),
+                f"traced memory per cycle (KiB): {[m // 1024 for m in self.memory]}",
+                f"peak traced memory (KiB): {self.peak_memory // 1024}",
+                f"live objects per cycle: {self.objects}",
+                f"pending timers: {self.pending_timers}",
+            ]
+        )
+
+
+def _entry_data(index: int) -> dict[str, Any]:
+    """Return varied entry settings: districts, "all" and coordinates."""
+    districts = [key for key in DISTRICTS if key.isdigit()]
+    kind = index % 4
+    if kind == 0:
+        return {"district": "all", "include_messages": True}
+    if kind == 3:
+        return {
+            "mode": "coordinate",
+            "latitude": 56.0 + (index % 12),
+            "longitude": 12.0 + (index % 10),
+            "radius_km": 25,
+            "include_geometry": True,
+        }
+    return {"district": districts[index % len(districts)]}
+
+
+def _scenario(start: datetime) -> list[tuple[datetime, str]]:
+    """Return the (time, action) steps of one cycle starting at start."""
+    return [
+        (start, "publish"),
+        (start + timedelta(hours=2), "escalate"),
+        (start + timedelta(hours=6), "expire"),
+        (start + timedelta(hours=8), "outage"),
+        (start + timedelta(hours=9), "rate_limit"),
+    ]
+
+
+def _apply(server: StandInServer, action: str, now: datetime, seed: int) -> None:
+    """Change what the stand-in serves."""
+    if action == "publish":
+        server.publish(
+            make_payload(8, 3, 32, seed=seed, published=now, levels=LEVELS[:1],
+                         message_ratio=0.25),
+            now,
+        )
+    elif action == "escalate":
+        server.publish(
+            make_payload(10, 3, 32, seed=seed, published=now, levels=LEVELS[1:],
+                         start_after=timedelta(minutes=30),
+                         duration=timedelta(hours=3)),
+            now,
+        )
+    elif action == "expire":
+        server.publish([], now)
+    elif action == "outage":
+        server.fail(count=4)
+    elif action == "rate_limit":
+        server.rate_limit(retry_after=300)
+
+
+async def async_soak(
+    entries: int = 20, days: float = 3.0, seed: int = 0
+) -> SoakResult:
+    """Run the soak and return its measurements."""
+    clock = FakeClock(EPOCH)
+    patches = Patches()
+    result = SoakResult()
+    tracemalloc.start()
+    try:
+        async with aiohttp.ClientSession() as session, StandInServer(
+            warnings=[]
+        ) as server:
+            patches.set(
+                hub_module.aiohttp_client,
+                "async_get_clientsession",
+                lambda _hass: session,
+            )
+            patches.set(hub_module, "Store", FakeStore)
+            patches.set(areas_module, "Store", FakeStore)
+            patches.set(hub_module, "monotonic", clock.monotonic)
+            patches.set(sensor_module.dt_util, "utcnow", clock.utcnow)
+            patches.set(
+                sensor_module, "async_track_point_in_time", clock.track_point_in_time
+            )
+            FakeStore.saved = FakeStore.areas = None
+
+            hass = make_hass()
+            coordinators = [
+                SmhiAlertCoordinator(hass, make_entry(f"e{i}", **_entry_data(i)))
+                for i in range(entries)
+            ]
+            hub = coordinators[0].hub
+            hub.warnings_url = server.warnings_url
+            coordinators[0].areas.url = server.areas_url
+            for coordinator in coordinators:
+                coordinator.data = await coordinator._async_update_data()
+                hub.async_add_listener(coordinator.async_handle_hub_update)
+
+            end = clock.now + timedelta(days=days)
+            cycle_start = clock.now
+            cycle = 0
+            steps = _scenario(cycle_start)
+            while clock.now < end:
+                next_poll = clock.now + hub.update_interval
+                if steps and steps[0][0] <= next_poll:
+                    when, action = steps.pop(0)
+                    clock.advance_to(when)
+                    _apply(server, action, clock.now, seed + cycle)
+                    continue
+                clock.advance_to(next_poll)
+                started = perf_counter()
+                await hub.async_refresh()
+                await asyncio.gather(*hass.tasks)
+                result.latencies.append(perf_counter() - started)
+                result.updates += 1
+                result.intervals[hub.update_interval] += 1
+                # The fake hass keeps what it is given; drop it like HA would.
+                hass.tasks.clear()
+                hass.events.clear()
+                if clock.now - cycle_start >= CYCLE:
+                    gc.collect()
+                    result.memory.append(tracemalloc.get_traced_memory()[0])
+                    result.objects.append(len(gc.get_objects()))
+                    cycle += 1
+                    cycle_start += CYCLE
+                    steps = _scenario(cycle_start)
+
+            result.statuses = server.statuses
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+            result.pending_timers = clock.pending_timers
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+            await hub.async_shutdown()
+    finally:
+        tracemalloc.stop()
+        patches.undo()
+    return result
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    """Run a soak and fail on unbounded growth."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--days", type=float, default=14.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    result = asyncio.run(async_soak(args.entries, args.days, args.seed))
+    print(result.summary())
+    errors = result.growth_errors()
+    for error in errors:
+        print(f"FAIL: {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
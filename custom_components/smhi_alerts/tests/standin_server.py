@@ -0,0 +1,200 @@
+"""Local aiohttp stand-in for the SMHI warnings API.
+
+Serves /warning.json and /areas.json with ETag and Last-Modified and
+answers conditional requests with 304. Rate limiting (429 with
+Retry-After), server errors and latency can be injected, and bodies are
+gzip-compressed when the client accepts it. Run standalone with
+
+    python custom_components/smhi_alerts/tests/standin_server.py --port 8080
+
+and point the hub's warnings_url and the catalogue's url at it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter, deque
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import gzip
+import hashlib
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import EPOCH, make_areas, make_payload  # noqa: E402
+
+
+class Document:
+    """One served JSON document with its validators."""
+
+    def __init__(self, content: Any, modified: datetime) -> None:
+        """Encode content once; validators follow the bytes."""
+        self.body = json.dumps(content, ensure_ascii=False).encode()
+        self.gzipped = gzip.compress(self.body, compresslevel=6)
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:16]}"'
+        self.last_modified = format_datetime(
+            modified.astimezone(timezone.utc).replace(microsecond=0), usegmt=True
+        )
+        self.modified = modified.replace(microsecond=0)
+
+    def not_modified(self, request: web.Request) -> bool:
+        """Return True if the request's validators still match."""
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return self.etag in (tag.strip() for tag in if_none_match.split(","))
+        since = request.headers.get("If-Modified-Since")
+        if since:
+            try:
+                return self.modified <= parsedate_to_datetime(since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+class StandInServer:
+    """The SMHI warnings API, served from memory on localhost.
+
+    Use as an async context manager; warnings_url and areas_url are valid
+    inside it. Replace the warnings with publish(), and queue failures with
+    rate_limit() and fail(). Every answered request is counted by status.
+    """
+
+    def __init__(
+        self,
+        warnings: list[dict[str, Any]] | None = None,
+        areas: list[dict[str, Any]] | None = None,
+        latency: float = 0.0,
+        port: int | None = None,
+    ) -> None:
+        """Serve warnings and areas, synthetic ones (seed 0) by default."""
+        self.latency = latency
+        self.statuses: Counter[int] = Counter()
+        # Headers of the most recent requests
+        self.requests: deque[dict[str, str]] = deque(maxlen=100)
+        self._rate_limited: list[int] = []
+        self._failures = 0
+        self.warnings = Document(
+            make_payload(20, 4, 64) if warnings is None else warnings, EPOCH
+        )
+        self.areas = Document(make_areas() if areas is None else areas, EPOCH)
+        app = web.Application()
+        app.router.add_get("/warning.json", self._handle_warnings)
+        app.router.add_get("/areas.json", self._handle_areas)
+        self._server = TestServer(app, port=port)
+
+    @property
+    def warnings_url(self) -> str:
+        """Return the URL of the warnings document."""
+        return str(self._server.make_url("/warning.json"))
+
+    @property
+    def areas_url(self) -> str:
+        """Return the URL of the areas document."""
+        return str(self._server.make_url("/areas.json"))
+
+    def publish(self, warnings: list[dict[str, Any]], modified: datetime) -> None:
+        """Replace the warnings document as if SMHI published at modified."""
+        self.warnings = Document(warnings, modified)
+
+    def rate_limit(self, retry_after: int = 60, count: int = 1) -> None:
+        """Answer the next count requests with 429 and Retry-After."""
+        self._rate_limited.extend([retry_after] * count)
+
+    def fail(self, count: int = 1) -> None:
+        """Answer the next count requests with 500."""
+        self._failures += count
+
+    async def __aenter__(self) -> StandInServer:
+        await self._server.start_server()
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self._server.close()
+
+    async def _handle_warnings(self, request: web.Request) -> web.Response:
+        return await self._serve(request, self.warnings)
+
+    async def _handle_areas(self, request: web.Request) -> web.Response:
+        return await self._serve(request, self.areas)
+
+    async def _serve(self, request: web.Request, document: Document) -> web.Response:
+        """Answer one request, applying queued faults and latency first."""
+        self.requests.append(dict(request.headers))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._rate_limited:
+            response = web.Response(
+                status=429,
+                headers={"Retry-After": str(self._rate_limited.pop(0))},
+            )
+        elif self._failures:
+            self._failures -= 1
+            response = web.Response(status=500)
+        else:
+            headers = {
+                "ETag": document.etag,
+                "Last-Modified": document.last_modified,
+            }
+            if document.not_modified(request):
+                response = web.Response(status=304, headers=headers)
+            elif "gzip" in request.headers.get("Accept-Encoding", ""):
+                response = web.Response(
+                    body=document.gzipped,
+                    content_type="application/json",
+                    headers={**headers, "Content-Encoding": "gzip"},
+                )
+            else:
+                response = web.Response(
+                    body=document.body,
+                    content_type="application/json",
+                    headers=headers,
+                )
+        self.statuses[response.status] += 1
+        return response
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:  # pragma: no cover
+    warnings = make_payload(
+        args.warnings,
+        args.areas,
+        args.vertices,
+        seed=args.seed,
+        parts=args.parts,
+        message_ratio=args.message_ratio,
+    )
+    async with StandInServer(
+        warnings, make_areas(seed=args.seed), args.latency, args.port
+    ) as server:
+        print(f"Serving {server.warnings_url} and {server.areas_url}")
+        await asyncio.Event().wait()
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    """Serve a synthetic document until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warnings", type=int, default=20)
+    parser.add_argument("--areas", type=int, default=4, help="areas per warning")
+    parser.add_argument("--vertices", type=int, default=64)
+    parser.add_argument("--parts", type=int, default=1, help="polygons per area")
+    parser.add_argument("--message-ratio", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    try:
+        asyncio.run(_serve_forever(parser.parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,161 @@
+"""Seeded synthetic SMHI warning documents for benchmarks and load tests."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from math import cos, pi, sin
+import random
+from typing import Any
+
+from custom_components.smhi_alerts.const import DISTRICTS
+
+EVENTS = [
+    ("WIND", "Vind", "Wind", "MET"),
+    ("RAIN", "Regn", "Rain", "MET"),
+    ("SNOW", "Snö", "Snow", "MET"),
+    ("FIRE", "Brandrisk", "Fire risk", "MET"),
+    ("HIGH_SEALEVEL", "Högt vattenstånd", "High sea level", "HYD"),
+]
+# Events published as messages (warningLevel MESSAGE), not warnings
+MESSAGE_EVENTS = [
+    ("THUNDER", "Åska", "Thunderstorm", "MET"),
+    ("FIRE", "Brandrisk", "Fire risk", "MET"),
+]
+LEVELS = [
+    ("YELLOW", "Gul", "Yellow"),
+    ("ORANGE", "Orange", "Orange"),
+    ("RED", "Röd", "Red"),
+]
+MESSAGE_LEVEL = ("MESSAGE", "Meddelande", "Message")
+# Rough extent of Sweden, lon/lat
+BOUNDS = (11.0, 55.3, 24.0, 69.0)
+EPOCH = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def iso(value: datetime) -> str:
+    """Return value as the UTC timestamp format SMHI uses."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def polygon(rng: random.Random, vertices: int, size: float = 0.5) -> list[list[float]]:
+    """Return a closed, star-shaped ring with the given number of vertices."""
+    lon = rng.uniform(BOUNDS[0], BOUNDS[2] - size)
+    lat = rng.uniform(BOUNDS[1], BOUNDS[3] - size)
+    ring = []
+    for i in range(vertices):
+        angle = 2 * pi * i / vertices
+        radius = size / 2 * rng.uniform(0.6, 1.0)
+        ring.append(
+            [
+                round(lon + size / 2 + radius * cos(angle), 6),
+                round(lat + size / 2 + radius * sin(angle), 6),
+            ]
+        )
+    ring.append(ring[0])
+    return ring
+
+
+def area_geometry(
+    rng: random.Random, vertices: int, parts: int = 1
+) -> dict[str, Any]:
+    """Return a Polygon, or a MultiPolygon of parts, as GeoJSON geometry."""
+    if parts > 1:
+        return {
+            "type": "MultiPolygon",
+            "coordinates": [[polygon(rng, vertices)] for _ in range(parts)],
+        }
+    return {"type": "Polygon", "coordinates": [polygon(rng, vertices)]}
+
+
+def make_payload(
+    warnings: int,
+    areas_per_warning: int,
+    vertices: int,
+    seed: int = 0,
+    geometry: bool = True,
+    parts: int = 1,
+    message_ratio: float = 0.0,
+    published: datetime = EPOCH,
+    levels: list[tuple[str, str, str]] = LEVELS,
+    start_after: timedelta = timedelta(hours=2),
+    duration: timedelta = timedelta(days=1),
+) -> list[dict[str, Any]]:
+    """Return a warning.json-like document; the same arguments give the same data.
+
+    message_ratio is the share of warnings published as MESSAGE events.
+    With parts > 1 areas get MultiPolygon geometry. Every area starts
+    start_after the publish time and lasts duration; warning levels are
+    drawn from levels.
+    """
+    rng = random.Random(seed)
+    # Numeric district ids only; "all" is a filter value, not an area.
+    districts = [item for item in DISTRICTS.items() if item[0].isdigit()]
+    start = published + start_after
+    payload = []
+    for warning_id in range(1, warnings + 1):
+        is_message = rng.random() < message_ratio
+        code, sv, en, mho = rng.choice(MESSAGE_EVENTS if is_message else EVENTS)
+        warning_areas = []
+        for area_id in range(1, areas_per_warning + 1):
+            level_code, level_sv, level_en = (
+                MESSAGE_LEVEL if is_message else rng.choice(levels)
+            )
+            affected = rng.sample(districts, k=rng.randint(1, 3))
+            area = {
+                "id": area_id,
+                "warningLevel": {"code": level_code, "sv": level_sv, "en": level_en},
+                "areaName": {"sv": affected[0][1], "en": affected[0][1]},
+                "affectedAreas": [
+                    {"id": int(district_id), "sv": name, "en": name}
+                    for district_id, name in affected
+                ],
+                "approximateStart": iso(start),
+                "approximateEnd": iso(start + duration),
+                "published": iso(published),
+                "eventDescription": {"sv": sv, "en": en},
+                "descriptions": [
+                    {
+                        "title": {"sv": "Vad händer", "en": "What happens"},
+                        "text": {"sv": f"{sv} väntas.", "en": f"{en} expected."},
+                    }
+                ],
+            }
+            if geometry:
+                area["area"] = {
+                    "type": "FeatureCollection",
+                    "features": [
+                        {
+                            "type": "Feature",
+                            "geometry": area_geometry(rng, vertices, parts),
+                        }
+                    ],
+                }
+            warning_areas.append(area)
+        payload.append(
+            {
+                "id": warning_id,
+                "event": {
+                    "sv": sv,
+                    "en": en,
+                    "code": code,
+                    "mhoClassification": {"code": mho},
+                },
+                "warningAreas": warning_areas,
+            }
+        )
+    return payload
+
+
+def make_areas(vertices: int = 64, seed: int = 0) -> list[dict[str, Any]]:
+    """Return an areas.json-like list with one polygon per district."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": int(district_id),
+            "sv": name,
+            "en": name,
+            "geometry": area_geometry(rng, vertices),
+        }
+        for district_id, name in DISTRICTS.items()
+        if district_id.isdigit()
+    ]
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from custom_components.smhi_alerts import sensor as sensor_module
+from custom_components.smhi_alerts.sensor import AlertEntityTracker, SMHIAlertSensor
+from helpers import make_entry
+
+
+class FakeRegistry:
+    def __init__(self, entries) -> None:
+        self.entries = entries
+        self.removed: list[str] = []
+
+    def async_get(self, entity_id):
+        return next((e for e in self.entries if e.entity_id == entity_id), None)
+
+    def async_remove(self, entity_id) -> None:
+        self.removed.append(entity_id)
+
+
+def _data(*messages) -> dict:
+    return {"state": "Alert", "attributes": {"messages": list(messages), "notice": ""}}
+
+
+def test_alert_entities_follow_the_diff(monkeypatch) -> None:
+    stale = SimpleNamespace(entity_id="sensor.old", unique_id="a_alert_9:9")
+    live = SimpleNamespace(entity_id="sensor.my_wind", unique_id="a_alert_1:1")
+    main = SimpleNamespace(entity_id="sensor.main", unique_id="a_smhi_alert_sensor")
+    registry = FakeRegistry([stale, live, main])
+    monkeypatch.setattr(
+        sensor_module,
+        "er",
+        SimpleNamespace(
+            async_get=lambda _hass: registry,
+            async_entries_for_config_entry=lambda reg, _id: reg.entries,
+        ),
+    )
+    wind = {"id": "1:1", "event": "Wind", "area": "Skåne", "code": "YELLOW"}
+    rain = {"id": "2:1", "event": "Rain", "area": "Skåne", "code": "YELLOW"}
+    coordinator = SimpleNamespace(
+        alert_entities=True,
+        data=_data(wind, rain),
+        async_add_listener=lambda _cb: (lambda: None),
+    )
+    added: list = []
+    tracker = AlertEntityTracker(
+        None, make_entry("a"), coordinator, lambda ents: added.extend(ents)
+    )
+    tracker.async_start()
+    # The still active alert keeps its registry entry across restarts.
+    assert registry.removed == ["sensor.old"]
+    assert [e.unique_id for e in added] == ["a_alert_1:1", "a_alert_2:1"]
+    assert added[0].native_value == "YELLOW"
+
+    written: list = []
+    monkeypatch.setattr(
+        sensor_module.SmhiAlertItemSensor,
+        "async_write_ha_state",
+        lambda self: written.append(self.native_value),
+    )
+    added[0].hass = object()
+    added[1].entity_id = "sensor.rain"
+    registry.entries.append(SimpleNamespace(entity_id="sensor.rain"))
+    coordinator.data = _data({**wind, "code": "ORANGE"})
+    tracker.async_sync()
+    assert written == ["ORANGE"]
+    assert registry.removed[-1] == "sensor.rain"
+    assert list(tracker.entities) == ["1:1"]
+    assert len(added) == 2
+
+    # Turning the option off removes the remaining alert entities.
+    coordinator.alert_entities = False
+    added[0].entity_id = "sensor.wind"
+    registry.entries.append(SimpleNamespace(entity_id="sensor.wind"))
+    tracker.async_sync()
+    assert registry.removed[-1] == "sensor.wind" and tracker.entities == {}
+
+
+def test_main_sensor_drops_messages_with_alert_entities() -> None:
+    coordinator = SimpleNamespace(
+        alert_entities=True,
+        areas=SimpleNamespace(name=str),
+        data=_data({"id": "1:1"}),
+        district="all",
+        language="en",
+        mode="district",
+        async_add_listener=lambda _cb: (lambda: None),
+    )
+    sensor = SMHIAlertSensor(coordinator, make_entry("a"))
+    assert "messages" not in sensor.extra_state_attributes
+    coordinator.alert_entities = False
+    assert sensor.extra_state_attributes["messages"] == [{"id": "1:1"}]
@@ -0,0 +1,158 @@
+import asyncio
+from datetime import timedelta
+
+import aiohttp
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.smhi_alerts import areas as areas_module, geometry
+from custom_components.smhi_alerts.areas import async_get_areas_catalogue
+from custom_components.smhi_alerts.const import AREAS_RETRY, DISTRICTS
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import AREAS, FakeStore, make_entry, make_hass
+
+
+@pytest.mark.asyncio
+async def test_static_districts_served_while_downloading(session) -> None:
+    FakeStore.areas = None
+    hass = make_hass()
+    catalogue = async_get_areas_catalogue(hass)
+
+    options = await catalogue.async_options()
+    assert len(options) == len(DISTRICTS)
+    assert catalogue.name("12") == DISTRICTS["12"]
+
+    await asyncio.gather(*hass.tasks)
+    assert session.area_calls == 1
+    assert catalogue.options() == [
+        {"label": "Stockholms län", "value": "1"},
+        {"label": "Skåne län", "value": "12"},
+    ]
+    assert FakeStore.areas["areas"] == AREAS
+
+    # Fresh now: later dialogs neither wait nor download again.
+    await catalogue.async_options()
+    assert len(hass.tasks) == 1 and session.area_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_catalogue_is_served_then_refreshed(session) -> None:
+    old = dt_util.utcnow() - timedelta(days=30)
+    FakeStore.areas = {
+        "areas": [{"id": 1, "sv": "Gammalt namn"}],
+        "fetched_at": old.isoformat(),
+    }
+    hass = make_hass()
+    catalogue = async_get_areas_catalogue(hass)
+    await catalogue.async_ensure_loaded()
+    assert catalogue.name(1) == "Gammalt namn"
+
+    await asyncio.gather(*hass.tasks)
+    assert catalogue.name(1) == "Stockholms län"
+    assert not catalogue.stale
+
+
+@pytest.mark.asyncio
+async def test_failed_download_waits_before_retrying(session, monkeypatch) -> None:
+    FakeStore.areas = None
+    attempts: list[str] = []
+
+    def _offline(url, **_kwargs):
+        attempts.append(url)
+        raise aiohttp.ClientError("offline")
+
+    monkeypatch.setattr(session, "get", _offline)
+    hass = make_hass()
+    catalogue = async_get_areas_catalogue(hass)
+    for _ in range(3):
+        await catalogue.async_options()
+        await asyncio.gather(*hass.tasks)
+    assert len(attempts) == 1 and catalogue.stale
+
+    later = dt_util.utcnow() + AREAS_RETRY
+    monkeypatch.setattr(areas_module.dt_util, "utcnow", lambda: later)
+    await catalogue.async_options()
+    await asyncio.gather(*hass.tasks)
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_coordinator_shares_catalogue_for_names(session) -> None:
+    FakeStore.areas["areas"] = [{"id": 12, "sv": "Skåne (SMHI)"}]
+    hass = make_hass()
+    coordinator = SmhiAlertCoordinator(hass, make_entry("a", "12"))
+    await coordinator._async_update_data()
+    assert coordinator.areas is async_get_areas_catalogue(hass)
+    assert coordinator.areas.name("12") == "Skåne (SMHI)"
+    assert session.area_calls == 0
+    await coordinator.hub.async_shutdown()
+
+
+def _square(lon: float, lat: float, size: float = 1.0) -> dict:
+    ring = [
+        [lon, lat],
+        [lon + size, lat],
+        [lon + size, lat + size],
+        [lon, lat + size],
+        [lon, lat],
+    ]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def _warning(area_id: int, geometry: dict) -> dict:
+    return {
+        "warningLevel": {"code": "YELLOW", "en": "Yellow"},
+        "affectedAreas": [{"id": area_id, "en": f"Area {area_id}"}],
+        "areaName": {"en": f"Area {area_id}"},
+        "area": geometry,
+    }
+
+
+@pytest.mark.asyncio
+async def test_point_resolves_to_district_once(session, monkeypatch) -> None:
+    # A point-in-polygon test on the raw vertices; nothing is projected.
+    monkeypatch.setattr(geometry, "project", None)
+    FakeStore.areas["areas"] = [
+        {"id": 1, "sv": "Stockholms län", "geometry": _square(17.5, 59.0)},
+        {"id": 12, "sv": "Skåne län", "geometry": _square(13.0, 55.5)},
+    ]
+    catalogue = async_get_areas_catalogue(make_hass())
+    await catalogue.async_ensure_loaded()
+    assert catalogue.districts_at(18.0, 59.3) == ("1",)
+    assert catalogue.districts_at(13.5, 55.9) == ("12",)
+    assert catalogue.districts_at(5.0, 50.0) == ()
+    assert catalogue.districts_at(18.0, 59.3) is catalogue.districts_at(18.0, 59.3)
+
+
+@pytest.mark.asyncio
+async def test_coordinate_mode_keeps_radius_for_home_district(session) -> None:
+    FakeStore.areas["areas"] = [
+        {"id": 1, "sv": "Stockholms län", "geometry": _square(17.5, 59.0)},
+    ]
+    payload = [
+        {
+            "event": {"en": "Wind", "code": "WIND"},
+            "warningAreas": [
+                # Home district, point inside the polygon: matches.
+                _warning(1, _square(17.8, 59.1, 0.5)),
+                # Tagged with the home district but far from the point: the
+                # district lookup alone must not match it.
+                _warning(2, _square(20.0, 65.0)),
+                # Other district next door: exact radius test.
+                _warning(3, _square(18.05, 59.3, 0.1)),
+                _warning(4, _square(10.0, 50.0)),
+            ],
+        }
+    ]
+    payload[0]["warningAreas"][1]["affectedAreas"] = [{"id": 1, "en": "Area 2"}]
+    hass = make_hass()
+    coordinator = SmhiAlertCoordinator(
+        hass,
+        make_entry(
+            "a", mode="coordinate", latitude=59.3, longitude=18.0, radius_km=10
+        ),
+    )
+    await coordinator.areas.async_ensure_loaded()
+    messages, _, _ = coordinator._process_data(payload)
+    assert sorted(m["area"] for m in messages) == ["Area 1", "Area 3"]
+    await coordinator.hub.async_shutdown()
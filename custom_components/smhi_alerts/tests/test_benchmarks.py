@@ -0,0 +1,18 @@
+import pytest
+
+from bench_process_data import QUICK_SIZES, async_run, format_table
+from synthetic import make_payload
+
+
+def test_payload_is_deterministic() -> None:
+    assert make_payload(3, 2, 8, seed=7) == make_payload(3, 2, 8, seed=7)
+    assert make_payload(3, 2, 8, seed=7) != make_payload(3, 2, 8, seed=8)
+    assert "area" not in make_payload(1, 1, 8, geometry=False)[0]["warningAreas"][0]
+
+
+@pytest.mark.asyncio
+async def test_benchmarks_run(session) -> None:
+    results = await async_run(QUICK_SIZES, repeat=1)
+    assert len(results) == 6
+    assert all(row["areas_per_s"] > 0 and row["peak_kib"] > 0 for row in results)
+    assert "coordinate" in format_table(results)
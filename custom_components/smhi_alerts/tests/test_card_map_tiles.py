@@ -38,6 +38,13 @@ def test_card_editor_exposes_tile_provider_fields() -> None:
     assert card_text.count("name: 'map_tile_max_zoom'") == 1
 
 
+def test_card_prunes_geometry_of_withdrawn_alerts() -> None:
+    card_text = CARD_PATH.read_text(encoding="utf-8")
+
+    assert "this._pruneGeometryCache();" in card_text
+    assert "if (!refs.has(ref)) this._geometryCache.delete(ref);" in card_text
+
+
 @pytest.mark.asyncio
 async def test_frontend_refreshes_card_after_integration_reload(monkeypatch) -> None:
     hass = SimpleNamespace(data={FRONTEND_DATA_KEY: {"setup_done": True}})
@@ -61,3 +68,11 @@ async def test_frontend_refreshes_card_after_integration_reload(monkeypatch) ->
 
     assert calls == ["sync", "resource"]
     assert hass.data[FRONTEND_DATA_KEY]["cache_key"] == "3.3.0-new"
+
+
+def test_card_fetches_referenced_geometry_on_demand() -> None:
+    card_text = CARD_PATH.read_text(encoding="utf-8")
+
+    assert "type: 'smhi_alerts/geometry'" in card_text
+    assert "request.etag = cached.etag" in card_text
+    assert "item?.geometry || item?.geometry_ref" in card_text
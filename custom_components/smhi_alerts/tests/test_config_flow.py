@@ -0,0 +1,33 @@
+import pytest
+
+from custom_components.smhi_alerts.config_flow import _validate_extra_locations
+
+
+def test_extra_locations_are_normalized() -> None:
+    user_input = {"extra_locations": {"latitude": "59.33", "longitude": 18.07}}
+    assert _validate_extra_locations(user_input) == {}
+    assert user_input["extra_locations"] == [
+        {"latitude": 59.33, "longitude": 18.07, "radius_km": 10.0}
+    ]
+    user_input = {}
+    assert _validate_extra_locations(user_input) == {}
+    assert user_input["extra_locations"] == []
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "59.33,18.07",
+        [{"lat": 59.33, "lon": 18.07}],
+        [{"latitude": 91, "longitude": 18.07}],
+        [{"latitude": 59.33, "longitude": 18.07, "radius_km": 0}],
+        [{"latitude": "north", "longitude": 18.07}],
+    ],
+)
+def test_malformed_extra_locations_are_a_form_error(value) -> None:
+    user_input = {"extra_locations": value}
+    assert _validate_extra_locations(user_input) == {
+        "extra_locations": "invalid_extra_locations"
+    }
+    # Left as typed, so the form can show it again.
+    assert user_input["extra_locations"] == value
@@ -0,0 +1,185 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.smhi_alerts.const import DOMAIN
+from custom_components.smhi_alerts.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.smhi_alerts.metrics import Samples
+from custom_components.smhi_alerts.hub import async_get_hub
+from custom_components.smhi_alerts import sensor as sensor_module
+from custom_components.smhi_alerts.sensor import (
+    DIAGNOSTIC_SENSORS,
+    HUB_DIAGNOSTIC_SENSORS,
+    SmhiAlertCoordinator,
+    SmhiAlertDiagnosticSensor,
+    SmhiHubDiagnosticSensor,
+    async_setup_entry,
+)
+from helpers import WARNINGS, make_entry, make_hass
+
+
+def test_samples_keep_the_most_recent_values() -> None:
+    samples = Samples(maxlen=100)
+    for value in range(1, 201):
+        samples.add(value / 1000)
+    assert len(samples) == 100 and samples.last == 0.2
+    assert samples.summary(1000) == {
+        "samples": 100,
+        "last": 200.0,
+        "p50": 150.0,
+        "p95": 195.0,
+        "p99": 199.0,
+    }
+    assert Samples().summary()["p50"] is None
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_report_fetch_and_process_counters(session) -> None:
+    session.payload = WARNINGS
+    hass = make_hass()
+    entries = {
+        "a": make_entry("a", "all"),
+        "b": make_entry("b", "1", latitude=59.3, longitude=18.0),
+    }
+    coordinators = {}
+    for entry_id, entry in entries.items():
+        coordinators[entry_id] = SmhiAlertCoordinator(hass, entry)
+        coordinators[entry_id].data = await coordinators[entry_id]._async_update_data()
+        hass.data[DOMAIN][entry_id] = {"coordinator": coordinators[entry_id]}
+    hub = coordinators["a"].hub
+
+    await hub.async_refresh()  # 304
+    real_get = session.get
+
+    def failing_get(*_args, **_kwargs):
+        raise aiohttp.ClientError("boom")
+
+    session.get = failing_get
+    await hub.async_refresh()
+    session.get = real_get
+
+    result = await async_get_config_entry_diagnostics(hass, entries["b"])
+    assert result["entry"]["data"]["latitude"] == "**REDACTED**"
+    assert result["hub"]["responses_total"] == {"200": 1, "304": 1, "error": 1}
+    assert result["hub"]["latency_ms"]["samples"] == 3
+    assert result["hub"]["decode_ms"]["samples"] == 1
+    assert result["hub"]["payload_bytes"] > 0
+    assert result["hub"]["compression_ratio"] == 1.0
+    assert result["hub"]["failure_count"] == 1
+    assert result["hub"]["update_interval_s"] > result["hub"]["base_interval_s"]
+    assert result["this_entry"]["mode"] == "district"
+    assert result["this_entry"]["attributes_bytes"] > 0
+    assert set(result["process_ms_by_mode"]) == {"all", "district"}
+
+    values = {
+        description.key: SmhiAlertDiagnosticSensor(
+            coordinators["b"], entries["b"], description
+        )
+        for description in DIAGNOSTIC_SENSORS
+    }
+    assert values["process_time"].coordinator is coordinators["b"]
+    assert values["attributes_size"].native_value == (
+        result["this_entry"]["attributes_bytes"]
+    )
+    assert all(sensor.available for sensor in values.values())
+
+    feed = {
+        description.key: SmhiHubDiagnosticSensor(hub, description)
+        for description in HUB_DIAGNOSTIC_SENSORS
+    }
+    assert feed["last_poll"].native_value == "failed"
+    assert feed["last_poll"].extra_state_attributes is None
+    assert feed["last_poll"].entity_registry_enabled_default
+    assert not feed["request_latency"].entity_registry_enabled_default
+    assert feed["poll_interval"].native_value == hub.update_interval.total_seconds()
+    assert feed["request_latency"].extra_state_attributes["responses_recent"] == {
+        "200": 1,
+        "304": 1,
+        "error": 1,
+    }
+    await hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_feed_sensors_exist_once_and_follow_every_poll(session) -> None:
+    hub = async_get_hub(make_hass())
+    assert hub.async_claim_diagnostics("a")
+    assert not hub.async_claim_diagnostics("b")
+    hub.async_release_diagnostics("b")
+    assert hub.diagnostics_owner == "a"
+    hub.async_release_diagnostics("a")
+    assert hub.async_claim_diagnostics("b")
+
+    polls: list[str] = []
+    remove = hub.async_add_poll_listener(
+        lambda: polls.append(hub.metrics.recent[-1])
+    )
+    sensor = SmhiHubDiagnosticSensor(hub, HUB_DIAGNOSTIC_SENSORS[0])
+    written: list[str] = []
+    sensor.async_write_ha_state = lambda: written.append(sensor.native_value)
+    hub.async_add_poll_listener(sensor._async_on_poll)
+    await hub.async_refresh()
+    await hub.async_refresh()  # 304: the payload listeners are not called
+    remove()
+    await hub.async_refresh()
+    assert polls == ["200", "304"]
+    # Quiet polls leave the last poll sensor alone until a poll fails.
+    assert written == ["ok"]
+
+    def failing_get(*_args, **_kwargs):
+        raise aiohttp.ClientError("boom")
+
+    session.get = failing_get
+    await hub.async_refresh()
+    assert written == ["ok", "failed"]
+    await hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_feed_sensors_move_to_another_entry_on_unload(
+    session, monkeypatch
+) -> None:
+    receivers: list = []
+
+    def _connect(_hass, _signal, target):
+        receivers.append(target)
+        return lambda: receivers.remove(target)
+
+    monkeypatch.setattr(sensor_module, "async_dispatcher_connect", _connect)
+    monkeypatch.setattr(
+        sensor_module,
+        "async_dispatcher_send",
+        lambda _hass, _signal: [target() for target in list(receivers)],
+    )
+    monkeypatch.setattr(
+        sensor_module.AlertEntityTracker, "async_start", lambda self: lambda: None
+    )
+    hass = make_hass()
+    added: dict[str, list] = {}
+    unloads: dict[str, list] = {}
+    for entry_id in ("a", "b"):
+        entry = make_entry(entry_id)
+        entry.async_on_unload = unloads.setdefault(entry_id, []).append
+        coordinator = SmhiAlertCoordinator(hass, entry)
+        hass.data[DOMAIN][entry_id] = {"coordinator": coordinator}
+        entities = added.setdefault(entry_id, [])
+        await async_setup_entry(
+            hass, entry, lambda new, *_args, into=entities: into.extend(new)
+        )
+
+    def feed(entry_id: str) -> list:
+        return [e for e in added[entry_id] if isinstance(e, SmhiHubDiagnosticSensor)]
+
+    assert len(feed("a")) == len(HUB_DIAGNOSTIC_SENSORS) and not feed("b")
+
+    # Unloading the owner hands the sensors to "b"; nothing is reloaded.
+    hass.data[DOMAIN].pop("a")
+    while unloads["a"]:
+        if asyncio.iscoroutine(job := unloads["a"].pop()()):
+            await job
+    assert len(feed("b")) == len(HUB_DIAGNOSTIC_SENSORS)
+    assert coordinator.hub.diagnostics_owner == "b"
+    await coordinator.hub.async_shutdown()
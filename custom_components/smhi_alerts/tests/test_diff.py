@@ -0,0 +1,59 @@
+import copy
+
+import pytest
+
+from custom_components.smhi_alerts.diff import diff_messages
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import WARNINGS, make_entry, make_hass
+
+
+def test_diff_by_stable_identity() -> None:
+    a = {"id": "1:1", "code": "YELLOW"}
+    b = {"id": "1:2", "code": "ORANGE"}
+    c = {"event": "Wind", "area": "Skåne", "start": "x"}
+    diff = diff_messages([a, b], [a, {**b, "code": "RED"}, c])
+    assert diff.new == [c]
+    assert diff.updated == [{"id": "1:2", "code": "RED"}]
+    assert diff.expired == []
+    assert not diff_messages([a, c], [dict(a), dict(c)])
+    assert diff_messages([a, b], [b]).expired == [a]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fires_compact_events(session) -> None:
+    hass = make_hass()
+    coordinator = SmhiAlertCoordinator(
+        hass, make_entry("a", "all", include_geometry=True)
+    )
+    first = copy.deepcopy(WARNINGS)
+    for area in first[0]["warningAreas"]:
+        area["area"] = {"type": "Polygon", "coordinates": []}
+    coordinator.data = await coordinator._async_build_data(first)
+    assert hass.events == []
+
+    second = copy.deepcopy(first)
+    expired = second[0]["warningAreas"].pop(0)
+    second[0]["warningAreas"][0]["published"] = "2026-01-01T09:00:00Z"
+    second.append(
+        {
+            "id": 200,
+            "event": {"en": "Rain", "code": "RAIN"},
+            "warningAreas": [{**expired, "id": 5}],
+        }
+    )
+    coordinator.data = await coordinator._async_build_data(second)
+
+    fired = [(event_type, data["alert"]["id"]) for event_type, data in hass.events]
+    assert sorted(fired) == [
+        ("smhi_alerts_alert_expired", "100:1"),
+        ("smhi_alerts_alert_new", "200:5"),
+        ("smhi_alerts_alert_updated", "100:2"),
+    ]
+    assert all("geometry" not in data["alert"] for _, data in hass.events)
+    assert {data["entry_id"] for _, data in hass.events} == {"a"}
+
+    # Re-filtering after an options change records the diff but stays quiet.
+    hass.events.clear()
+    coordinator.data = await coordinator._async_build_data(first, reprocess=True)
+    assert hass.events == []
+    assert [m["id"] for m in coordinator.last_diff.new] == ["100:1"]
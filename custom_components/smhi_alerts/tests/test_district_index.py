@@ -0,0 +1,83 @@
+import pytest
+
+from custom_components.smhi_alerts.district_index import PayloadDistrictIndex
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import make_entry, make_hass
+
+PAYLOAD = [
+    {
+        "event": {"sv": "Vind", "en": "Wind", "code": "WIND"},
+        "warningAreas": [
+            {
+                "warningLevel": {"code": "YELLOW", "en": "Yellow"},
+                "affectedAreas": [
+                    {"id": 1, "en": "Stockholm"},
+                    {"id": 41, "en": "Bothnian Bay"},
+                ],
+            },
+            {
+                "warningLevel": {"code": "ORANGE", "en": "Orange"},
+                "affectedAreas": [{"id": 12, "en": "Skåne"}],
+            },
+        ],
+    },
+    {
+        "event": {"en": "High sea level", "code": "HIGH_SEALEVEL"},
+        "warningAreas": [
+            {
+                "warningLevel": {"code": "YELLOW", "en": "Yellow"},
+                "affectedAreas": [{"id": 1, "en": "Stockholm"}],
+            }
+        ],
+    },
+]
+
+
+def test_index_groups_areas_by_district() -> None:
+    index = PayloadDistrictIndex(PAYLOAD)
+    wind_sthlm, wind_skane = PAYLOAD[0]["warningAreas"]
+    sea_sthlm = PAYLOAD[1]["warningAreas"][0]
+
+    stockholm = index.district("1")
+    assert set(stockholm) == {id(wind_sthlm), id(sea_sthlm)}
+    assert stockholm[id(wind_sthlm)] == [(wind_sthlm["affectedAreas"][0], False)]
+    assert stockholm[id(sea_sthlm)] == [(sea_sthlm["affectedAreas"][0], True)]
+    assert [marine for _, marine in index.affected(wind_sthlm)] == [False, True]
+    assert index.is_marine(wind_sthlm) and index.is_marine(sea_sthlm)
+    assert not index.is_marine(wind_skane)
+    assert index.district("99") == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("district", "exclude_sea", "expected"),
+    [
+        ("1", False, ["Stockholm", "Stockholm"]),
+        ("1", True, ["Stockholm"]),
+        ("41", True, []),
+        ("all", False, ["Skåne", "Stockholm, Bothnian Bay", "Stockholm"]),
+        ("all", True, ["Skåne", "Stockholm"]),
+    ],
+)
+async def test_district_filter_uses_index(
+    session, district, exclude_sea, expected
+) -> None:
+    coordinator = SmhiAlertCoordinator(
+        make_hass(), make_entry("a", district, exclude_sea=exclude_sea)
+    )
+    messages, _, _ = coordinator._process_data(PAYLOAD)
+    assert [m["area"] for m in messages] == expected
+
+
+@pytest.mark.asyncio
+async def test_extra_districts_report_matching_selector(session) -> None:
+    coordinator = SmhiAlertCoordinator(
+        make_hass(), make_entry("a", "1", extra_districts=["12", "41"])
+    )
+    messages, _, derived = coordinator._process_data(PAYLOAD)
+    assert [(m["area"], m["matched_by"]) for m in messages] == [
+        ("Skåne", ["district:12"]),
+        ("Stockholm, Bothnian Bay", ["district:1", "district:41"]),
+        ("Stockholm", ["district:1"]),
+    ]
+    assert derived["warnings_count"] == 3
@@ -0,0 +1,299 @@
+import copy
+import random
+
+import pytest
+
+from custom_components.smhi_alerts import geometry
+from custom_components.smhi_alerts.geometry import (
+    AreaGeometry,
+    GeometryPart,
+    PayloadGeometryIndex,
+    PayloadGeometryRefs,
+)
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import make_entry, make_hass
+
+
+def _square(lon: float, lat: float, half: float) -> list[list[list[float]]]:
+    return [
+        [
+            [lon - half, lat - half],
+            [lon + half, lat - half],
+            [lon + half, lat + half],
+            [lon - half, lat + half],
+            [lon - half, lat - half],
+        ]
+    ]
+
+
+def _area(*polygons) -> dict:
+    return {
+        "area": {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "MultiPolygon", "coordinates": list(polygons)},
+                }
+            ],
+        }
+    }
+
+
+def _reference_within_radius(lon0, lat0, radius_m, rings, closed=True) -> bool:
+    """Original per-edge implementation, kept as the behavioural reference."""
+    from math import cos, hypot, radians
+
+    def proj(lon, lat):
+        return (
+            (radians(lon) - radians(lon0)) * cos(radians(lat0)) * 6371000.0,
+            (radians(lat) - radians(lat0)) * 6371000.0,
+        )
+
+    def seg(ax, ay, bx, by):
+        abx, aby = bx - ax, by - ay
+        denom = abx * abx + aby * aby
+        if denom <= 0:
+            return hypot(ax, ay)
+        t = max(0.0, min(1.0, (-ax * abx - ay * aby) / denom))
+        return hypot(ax + t * abx, ay + t * aby)
+
+    outer = rings[0] if closed else rings
+    if closed:
+        inside = False
+        for i in range(len(outer)):
+            xi, yi = proj(*outer[i])
+            xj, yj = proj(*outer[i - 1])
+            if ((yi > 0) != (yj > 0)) and (0 < (xj - xi) * -yi / (yj - yi + 1e-12) + xi):
+                inside = not inside
+        if inside:
+            return True
+    edges = list(zip(outer, outer[1:]))
+    if closed:
+        edges.append((outer[-1], outer[0]))
+    return min(seg(*proj(*a), *proj(*b)) for a, b in edges) <= radius_m
+
+
+def _brute_force(coordinator: SmhiAlertCoordinator, area: dict) -> bool:
+    parts = AreaGeometry.from_container(area["area"]).parts
+    radius_m = coordinator.radius_km * 1000.0
+    return any(
+        _reference_within_radius(
+            coordinator.longitude, coordinator.latitude, radius_m, part.coords
+        )
+        for part in parts
+    )
+
+
+def _coordinator(session, lat=59.3, lon=18.0, radius=10) -> SmhiAlertCoordinator:
+    entry = make_entry(
+        "c", mode="coordinate", latitude=lat, longitude=lon, radius_km=radius
+    )
+    return SmhiAlertCoordinator(make_hass(), entry)
+
+
+@pytest.mark.asyncio
+async def test_far_away_parts_skip_exact_tests(session, monkeypatch) -> None:
+    coordinator = _coordinator(session)
+    calls: list = []
+    original = GeometryPart.within_radius
+
+    def _counting(part, *args):
+        calls.append(part.coords)
+        return original(part, *args)
+
+    monkeypatch.setattr(GeometryPart, "within_radius", _counting)
+    near = _square(18.0, 59.3, 0.05)
+    far = _square(13.0, 55.6, 0.05)
+    area = _area(far, near)
+    index = PayloadGeometryIndex([{"warningAreas": [area]}])
+
+    assert coordinator._area_matches_coordinate_filter(area, index)
+    assert calls == [near]
+
+    calls.clear()
+    assert not coordinator._area_matches_coordinate_filter(_area(far), index)
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_prefilter_matches_exact_test(session) -> None:
+    rng = random.Random(5)
+    coordinator = _coordinator(session, radius=25)
+    areas = [
+        _area(
+            _square(
+                18.0 + rng.uniform(-1.0, 1.0),
+                59.3 + rng.uniform(-0.6, 0.6),
+                rng.uniform(0.01, 0.3),
+            )
+        )
+        for _ in range(200)
+    ]
+    index = PayloadGeometryIndex([{"warningAreas": areas}])
+
+    results = [coordinator._area_matches_coordinate_filter(a, index) for a in areas]
+    assert results == [_brute_force(coordinator, a) for a in areas]
+    assert any(results) and not all(results)
+
+
+def _wavy_ring(lon: float, lat: float, vertices: int) -> list[list[list[float]]]:
+    from math import cos, pi, sin
+
+    ring = []
+    for i in range(vertices):
+        angle = 2 * pi * i / vertices
+        r = 0.2 + 0.05 * sin(7 * angle)
+        ring.append([lon + r * cos(angle) * 1.8, lat + r * sin(angle)])
+    ring.append(ring[0])
+    return [ring]
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_projected_buffers_match_reference(monkeypatch, vectorized) -> None:
+    if vectorized:
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(geometry, "NUMPY_MIN_VERTICES", 0)
+    else:
+        monkeypatch.setattr(geometry, "np", None)
+    rng = random.Random(11)
+    rings = _wavy_ring(18.0, 59.3, 400)
+    part = GeometryPart.from_coords("polygon", rings)
+    line = GeometryPart.from_coords("line", rings[0][:150])
+    for _ in range(300):
+        lon = 18.0 + rng.uniform(-0.8, 0.8)
+        lat = 59.3 + rng.uniform(-0.4, 0.4)
+        radius_m = rng.uniform(500, 20000)
+        assert part.within_radius(lon, lat, radius_m) == _reference_within_radius(
+            lon, lat, radius_m, rings
+        )
+        assert line.within_radius(lon, lat, radius_m) == _reference_within_radius(
+            lon, lat, radius_m, rings[0][:150], closed=False
+        )
+
+
+def test_grid_query_matches_brute_force(monkeypatch) -> None:
+    rng = random.Random(7)
+    areas = [
+        _area(
+            _square(
+                rng.uniform(11.0, 24.0), rng.uniform(55.0, 69.0), rng.uniform(0.02, 1.5)
+            )
+        )
+        for _ in range(150)
+    ]
+    index = PayloadGeometryIndex([{"warningAreas": areas}])
+    exact_tests = 0
+    original = AreaGeometry.within_radius
+
+    def _counting(geometry, *args):
+        nonlocal exact_tests
+        exact_tests += 1
+        return original(geometry, *args)
+
+    monkeypatch.setattr(AreaGeometry, "within_radius", _counting)
+    for _ in range(100):
+        lon, lat = rng.uniform(10.0, 25.0), rng.uniform(54.0, 70.0)
+        radius_m = rng.uniform(1000, 80000)
+        expected = {
+            id(a)
+            for a in areas
+            if _reference_within_radius(
+                lon, lat, radius_m, AreaGeometry.from_container(a["area"]).parts[0].coords
+            )
+        }
+        assert index.query(lon, lat, radius_m) == expected
+    # The grid keeps most areas out of the candidate set.
+    assert exact_tests < 100 * len(areas) / 4
+
+    exact_tests = 0
+    index.query(lon, lat, radius_m)
+    assert exact_tests == 0
+
+
+def test_known_areas_containing_the_point_skip_projection(monkeypatch) -> None:
+    home, near, far = (
+        _area(_square(18.0, 59.3, 0.5)),
+        _area(_square(18.6, 59.3, 0.05)),
+        _area(_square(19.0, 59.3, 0.1)),
+    )
+    index = PayloadGeometryIndex([{"warningAreas": [home, near, far]}])
+    projected: list[int] = []
+    original = geometry.project
+
+    def _counting(lons, *args):
+        projected.append(len(lons))
+        return original(lons, *args)
+
+    monkeypatch.setattr(geometry, "project", _counting)
+    known = frozenset({id(home), id(near)})
+    # The point is inside home: settled without projecting anything.
+    assert index.query(18.0, 59.3, 20000, known) == {id(home)}
+    assert projected == []
+    # Just outside a known area its edges are measured; the radius decides.
+    assert index.query(18.52, 59.3, 20000, known) == {id(home), id(near)}
+    assert projected
+    assert index.query(18.52, 59.3, 20000, known) == index.query(18.52, 59.3, 20000)
+
+
+@pytest.mark.asyncio
+async def test_extra_locations_evaluated_in_one_pass(session) -> None:
+    entry = make_entry(
+        "c",
+        mode="coordinate",
+        latitude=59.3,
+        longitude=18.0,
+        radius_km=5,
+        extra_locations=[
+            {"latitude": 55.6, "longitude": 13.0, "radius_km": 5},
+            {"latitude": 65.0},
+        ],
+    )
+    coordinator = SmhiAlertCoordinator(make_hass(), entry)
+    stockholm = _area(_square(18.0, 59.3, 0.05))
+    malmo = _area(_square(13.0, 55.6, 0.05))
+    both = _area(_square(18.0, 59.3, 0.05), _square(13.0, 55.6, 0.05))
+    for area, name in ((stockholm, "Stockholm"), (malmo, "Malmö"), (both, "Both")):
+        area["areaName"] = {"en": name}
+        area["warningLevel"] = {"code": "YELLOW"}
+    payload = [{"event": {"code": "WIND"}, "warningAreas": [stockholm, malmo, both]}]
+
+    messages, _, _ = coordinator._process_data(payload)
+    assert len(coordinator.extra_locations) == 1
+    assert {m["area"]: m["matched_by"] for m in messages} == {
+        "Stockholm": ["coordinate:59.3,18.0@5km"],
+        "Malmö": ["coordinate:55.6,13.0@5km"],
+        "Both": ["coordinate:59.3,18.0@5km", "coordinate:55.6,13.0@5km"],
+    }
+
+
+def test_simplified_geometry_is_smaller_and_cached() -> None:
+    rings = _wavy_ring(18.0, 59.3, 2000)
+    feature = {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": rings}}
+    payload = [{"id": 1, "warningAreas": [{"id": 2, "area": feature}]}]
+
+    simplified, etag = PayloadGeometryRefs(payload).get("1:2")
+    ring = simplified["geometry"]["coordinates"][0]
+    assert 4 <= len(ring) < len(rings[0]) / 4
+    assert ring[0] == ring[-1]
+    assert all(round(v, 5) == v for point in ring for v in point)
+    # Every dropped vertex stays within the tolerance of the simplified outline.
+    part = GeometryPart.from_coords("line", ring)
+    for lon, lat in rings[0][::50]:
+        assert part.within_radius(lon, lat, geometry.SIMPLIFY_TOLERANCE * 111_200)
+
+    # A later payload with the same polygon reuses the cached result.
+    again = PayloadGeometryRefs(copy.deepcopy(payload)).get("1:2")
+    assert again == (simplified, etag) and again[0] is simplified
+    exact, exact_etag = PayloadGeometryRefs(payload).get("1:2", 0.0)
+    assert len(exact["geometry"]["coordinates"][0]) == len(rings[0])
+    assert exact_etag != etag
+
+
+def test_simplify_keeps_small_rings_valid() -> None:
+    tiny = {"type": "Polygon", "coordinates": _square(18.0, 59.3, 0.0001)}
+    assert len(geometry.simplify_geometry(tiny)["coordinates"][0]) == 5
+    assert geometry.simplify_geometry({"type": "Point", "coordinates": [1, 2]}) == {
+        "type": "Point",
+        "coordinates": [1, 2],
+    }
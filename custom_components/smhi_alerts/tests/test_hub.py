@@ -0,0 +1,208 @@
+import asyncio
+import copy
+from datetime import timedelta
+import time
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.util import dt as dt_util
+
+from custom_components.smhi_alerts import async_setup_entry
+from custom_components.smhi_alerts import hub as hub_module
+from custom_components.smhi_alerts.const import DATA_HUB, DOMAIN
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import WARNINGS, FakeResponse, FakeStore, make_entry, make_hass
+
+
+@pytest.mark.asyncio
+async def test_entries_share_one_fetch_and_apply_own_filters(session) -> None:
+    hass = make_hass()
+
+    stockholm = SmhiAlertCoordinator(hass, make_entry("a", "1"))
+    skane = SmhiAlertCoordinator(hass, make_entry("b", "12"))
+    assert stockholm.hub is skane.hub is hass.data[DOMAIN][DATA_HUB]
+
+    first = await asyncio.gather(
+        stockholm._async_update_data(), skane._async_update_data()
+    )
+    assert len(session.calls) == 1
+    assert first[0]["attributes"]["highest_severity"] == "YELLOW"
+    assert first[1]["attributes"]["highest_severity"] == "ORANGE"
+
+    stockholm.data, skane.data = first
+    stockholm.hub.async_add_listener(stockholm.async_handle_hub_update)
+    skane.hub.async_add_listener(skane.async_handle_hub_update)
+
+    await stockholm.hub.async_refresh()
+    await asyncio.gather(*hass.tasks)
+    assert len(session.calls) == 2
+    assert session.calls[1]["If-None-Match"] == '"v1"'
+    assert stockholm.data["attributes"]["messages"][0]["area"] == "Stockholm"
+    assert skane.data["attributes"]["messages"][0]["area"] == "Skåne"
+    await stockholm.hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_served_then_revalidated(session) -> None:
+    hass = make_hass()
+    first = SmhiAlertCoordinator(hass, make_entry("a", "1"))
+    await first._async_update_data()
+    assert FakeStore.saved["etag"] == '"v1"'
+    await first.hub.async_shutdown()
+
+    # Simulate a restart: new hub, same persisted snapshot.
+    restarted = make_hass()
+    coordinator = SmhiAlertCoordinator(restarted, make_entry("a", "1"))
+    data = await coordinator._async_update_data()
+    assert data["attributes"]["warnings_count"] == 1
+
+    await asyncio.gather(*restarted.tasks)
+    assert len(session.calls) == 2
+    assert session.calls[1]["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_options_change_refilters_without_network(session) -> None:
+    hass = make_hass()
+    entry = make_entry("a", "1")
+    coordinator = SmhiAlertCoordinator(hass, entry)
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.data["attributes"]["highest_severity"] == "YELLOW"
+
+    entry.options = {"district": "12", "language": "sv"}
+    coordinator.apply_entry_options(entry)
+    await coordinator.async_refilter()
+
+    assert len(session.calls) == 1
+    assert coordinator.data["state"] == "Varning"
+    assert coordinator.data["attributes"]["highest_severity"] == "ORANGE"
+    assert coordinator.data["attributes"]["messages"][0]["area"] == "Skåne län"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_result_writes_no_state(session) -> None:
+    hass = make_hass()
+    coordinator = SmhiAlertCoordinator(hass, make_entry("a", "1"))
+    coordinator.data = await coordinator._async_update_data()
+    coordinator.hub.async_add_listener(coordinator.async_handle_hub_update)
+    updates: list = []
+    coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+    first = coordinator.data
+
+    # 304: the hub does not even wake the entry.
+    await coordinator.hub.async_refresh()
+    assert hass.tasks == []
+
+    # 200 with an identical document: filtered again, but nothing written.
+    session.calls.clear()
+    coordinator.hub._etag = None
+    coordinator.hub.data = None
+    await coordinator.hub.async_refresh()
+    await asyncio.gather(*hass.tasks)
+    assert len(session.calls) == 1
+    assert updates == []
+    assert coordinator.data is first
+
+    # A real change is published with a fresh heartbeat.
+    session.payload = [{**session.payload[0], "warningAreas": []}]
+    coordinator.hub._etag = None
+    await coordinator.hub.async_refresh()
+    await asyncio.gather(*hass.tasks)
+    assert updates[-1]["attributes"]["warnings_count"] == 0
+    await coordinator.hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_setup_sees_revalidation_that_lands_during_setup(
+    session, monkeypatch
+) -> None:
+    # The snapshot predates the Skåne warning SMHI serves now.
+    snapshot = copy.deepcopy(WARNINGS)
+    del snapshot[0]["warningAreas"][1]
+    FakeStore.saved = {
+        "payload": snapshot,
+        "etag": '"v0"',
+        "last_modified": None,
+        "fetched_at": dt_util.utcnow().isoformat(),
+    }
+    hass = make_hass()
+
+    async def _forward(_entry, _platforms):
+        return None
+
+    hass.config_entries = SimpleNamespace(async_forward_entry_setups=_forward)
+    process = SmhiAlertCoordinator._process_data
+
+    def _slow_process(self, data):
+        # Long enough for the revalidation to land mid-build.
+        time.sleep(0.05)
+        return process(self, data)
+
+    monkeypatch.setattr(SmhiAlertCoordinator, "_process_data", _slow_process)
+    entry = make_entry("a", "12")
+    entry.state = ConfigEntryState.SETUP_IN_PROGRESS
+    entry.add_update_listener = lambda _listener: None
+    assert await async_setup_entry(hass, entry)
+    # The revalidation starts the apply task when it lands.
+    while not all(task.done() for task in hass.tasks):
+        await asyncio.gather(*hass.tasks)
+    coordinator = hass.data[DOMAIN]["a"]["coordinator"]
+    assert coordinator.hub.data == session.payload
+    assert coordinator.data["attributes"]["messages"][0]["area"] == "Skåne"
+    await coordinator.hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_fetch(session, monkeypatch) -> None:
+    hass = make_hass()
+    first = SmhiAlertCoordinator(hass, make_entry("a", "1"))
+    second = SmhiAlertCoordinator(hass, make_entry("b", "12"))
+    hub = first.hub
+    await first._async_update_data()
+    session.calls.clear()
+    session.delay = 0.05
+
+    await asyncio.gather(
+        hub.async_refresh(),
+        hub.async_refresh(),
+        hub.async_refresh(),
+        second.hub.async_refresh(),
+    )
+    assert len(session.calls) == 1
+    assert hub.last_update_success
+
+    # Within the minimum gap the current payload is served without a call.
+    monkeypatch.setattr(hub_module, "FETCH_MIN_GAP", 60)
+    await hub.async_refresh()
+    assert len(session.calls) == 1
+    await hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_backoff_starts_from_regular_interval(session, monkeypatch) -> None:
+    hub = hub_module.async_get_hub(make_hass())
+    # An entry shows an active orange warning: poll every minute.
+    hub.async_set_poll_bounds("a", (timedelta(minutes=1), timedelta(minutes=30)))
+    hub.async_set_escalations("a", ((float("-inf"), float("inf")),))
+    await hub.async_refresh()
+    assert hub.update_interval == timedelta(minutes=1)
+
+    monkeypatch.setattr(
+        session,
+        "get",
+        lambda *_a, **_kw: FakeResponse(429, None, {"Retry-After": "3600"}),
+    )
+    await hub.async_refresh()
+    assert hub.update_interval >= timedelta(hours=1)
+
+    def _offline(*_args, **_kwargs):
+        raise aiohttp.ClientError("offline")
+
+    monkeypatch.setattr(session, "get", _offline)
+    await hub.async_refresh()
+    # Second failure in a row: 4 x SCAN_INTERVAL, not 4 x one minute.
+    assert timedelta(minutes=20) <= hub.update_interval < timedelta(minutes=21)
+    await hub.async_shutdown()
@@ -0,0 +1,57 @@
+import copy
+from pathlib import Path
+
+import pytest
+
+from custom_components.smhi_alerts.profiler import UpdateProfiler
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import POLYGON, WARNINGS, make_entry, make_hass
+
+
+@pytest.mark.asyncio
+async def test_profiles_the_next_updates(session, tmp_path) -> None:
+    payload = copy.deepcopy(WARNINGS)
+    for area in payload[0]["warningAreas"]:
+        area["area"] = POLYGON
+    session.payload = payload
+    hass = make_hass()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    district = SmhiAlertCoordinator(hass, make_entry("a", "all"))
+    located = SmhiAlertCoordinator(
+        hass,
+        make_entry("b", mode="coordinate", latitude=59.2, longitude=18.8),
+    )
+    district.data = await district._async_update_data()
+    hub = district.hub
+    assert hub.profiler is None
+
+    profiler = hub.profiler = UpdateProfiler(hass, hub, 2)
+    # Nothing is recorded before the first profiled fetch.
+    assert profiler.async_profiled_process("a", len) is len
+
+    await hub.async_refresh()  # 304
+    hub._etag = None
+    await hub.async_refresh()  # 200
+    for coordinator in (district, located):
+        await coordinator._async_build_data(hub.data, reprocess=True)
+    # A third fetch is past the requested number of updates.
+    hub._etag = None
+    await hub.async_refresh()
+    assert len(profiler.records) == 2
+
+    not_modified, downloaded = profiler.records
+    assert (not_modified.status, downloaded.status) == (304, 200)
+    assert not_modified.stages["decode"] == 0 and not not_modified.entries
+    assert downloaded.bytes > 0 and downloaded.stages["decode"] > 0
+    # "a" reuses its rendered messages; "b" renders them for the first time.
+    assert downloaded.entries["a"]["filter"] > 0
+    assert downloaded.entries["a"]["render"] == 0
+    assert downloaded.entries["b"]["geometry"] > 0
+    assert downloaded.entries["b"]["render"] > 0
+
+    path = await profiler.async_finish()
+    assert hub.profiler is None
+    report = Path(path).read_text()
+    assert "render ms" in report and "_process_data" in report
+    assert Path(path).with_suffix(".cprof").exists()
+    await hub.async_shutdown()
@@ -0,0 +1,69 @@
+import copy
+
+import pytest
+
+from custom_components.smhi_alerts.cache import LRUCache
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import WARNINGS, make_entry, make_hass
+
+
+@pytest.mark.asyncio
+async def test_unchanged_areas_reuse_rendered_messages(session) -> None:
+    coordinator = SmhiAlertCoordinator(make_hass(), make_entry("a", "all"))
+    first, first_notice, _ = coordinator._process_data(WARNINGS)
+
+    # A fresh download of the same document renders nothing again.
+    again, again_notice, _ = coordinator._process_data(copy.deepcopy(WARNINGS))
+    assert [a is b for a, b in zip(first, again)] == [True, True]
+    assert again_notice == first_notice
+
+    updated = copy.deepcopy(WARNINGS)
+    updated[0]["warningAreas"][1]["published"] = "2026-01-01T09:00:00Z"
+    updated[0]["warningAreas"][1]["warningLevel"] = {"code": "RED", "en": "Red"}
+    changed, _, derived = coordinator._process_data(updated)
+    assert changed[0]["code"] == "RED" and changed[0] is not first[0]
+    assert changed[1] is first[1]
+    assert derived["highest_severity"] == "RED"
+
+    # Options may change what is rendered, so they start from scratch.
+    coordinator.apply_entry_options(coordinator.entry)
+    rerendered = coordinator._process_data(WARNINGS)[0]
+    assert rerendered[1] is not first[1]
+
+    # Renderings of a pass that raced the change are not served either.
+    coordinator.include_geometry = not coordinator.include_geometry
+    assert coordinator._process_data(WARNINGS)[0][1] is not rerendered[1]
+
+
+@pytest.mark.asyncio
+async def test_withdrawn_areas_leave_the_render_cache(session) -> None:
+    coordinator = SmhiAlertCoordinator(make_hass(), make_entry("a", "all"))
+    coordinator._process_data(WARNINGS)
+    assert len(coordinator.render_cache) == 2
+
+    withdrawn = copy.deepcopy(WARNINGS)
+    del withdrawn[0]["warningAreas"][1]
+    coordinator._process_data(withdrawn)
+    assert len(coordinator.render_cache) == 1
+
+    # A republished area replaces its old rendering instead of adding one.
+    republished = copy.deepcopy(withdrawn)
+    republished[0]["warningAreas"][0]["published"] = "2026-01-01T09:00:00Z"
+    coordinator._process_data(republished)
+    assert len(coordinator.render_cache) == 1
+    coordinator._process_data([])
+    assert len(coordinator.render_cache) == 0
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (len(cache), cache.hits, cache.misses) == (2, 3, 1)
+
+    cache.retain({"c"})
+    assert (cache.get("a"), cache.get("c")) == (None, 3)
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from custom_components.smhi_alerts import async_setup_entry
+from custom_components.smhi_alerts.const import (
+    DATA_HUB,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DOMAIN,
+)
+from custom_components.smhi_alerts.hub import async_get_hub
+from custom_components.smhi_alerts.scheduler import (
+    PollScheduler,
+    escalation_windows,
+    has_escalation,
+)
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import make_entry, make_hass
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _payload(code: str, start: str, published: str = "2026-01-01T11:30:00Z"):
+    return [
+        {
+            "warningAreas": [
+                {
+                    "warningLevel": {"code": code},
+                    "approximateStart": start,
+                    "published": published,
+                }
+            ]
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    ("code", "start", "expected"),
+    [
+        ("ORANGE", "2026-01-01T11:00:00Z", True),
+        ("RED", "2026-01-01T14:00:00Z", True),
+        ("ORANGE", "2026-01-02T12:00:00Z", False),
+        ("YELLOW", "2026-01-01T11:00:00Z", False),
+    ],
+)
+def test_escalation_window(code, start, expected) -> None:
+    windows = escalation_windows([{"code": code, "start": start, "end": "Unknown"}])
+    assert has_escalation(windows, NOW) is expected
+
+
+def test_escalation_polls_at_lower_bound() -> None:
+    scheduler = PollScheduler()
+    scheduler.observe(_payload("ORANGE", "2026-01-01T13:00:00Z"), None)
+    windows = escalation_windows([{"code": "ORANGE", "start": "2026-01-01T13:00:00Z"}])
+    assert scheduler.next_interval(windows, NOW) == scheduler.min_interval
+    # Without an entry showing it, the warning does not count.
+    assert scheduler.next_interval((), NOW) == timedelta(minutes=5)
+
+
+def test_quiet_periods_back_off_to_upper_bound() -> None:
+    scheduler = PollScheduler()
+    scheduler.observe(_payload("YELLOW", "2026-01-01T10:00:00Z"), None)
+    assert scheduler.next_interval((), NOW) == timedelta(minutes=5)
+    assert scheduler.next_interval(
+        (), NOW + timedelta(hours=1)
+    ) == timedelta(minutes=10)
+    assert scheduler.next_interval(
+        (), NOW + timedelta(hours=12)
+    ) == scheduler.max_interval
+
+
+def test_learned_cadence_polls_after_expected_publish() -> None:
+    scheduler = PollScheduler()
+    for hour in (4, 7, 10):
+        scheduler.observe([], f"Thu, 01 Jan 2026 {hour:02d}:00:00 GMT")
+    # An older or repeated publish time is not a new observation.
+    scheduler.observe([], "Thu, 01 Jan 2026 09:00:00 GMT")
+    assert scheduler.cadence == timedelta(hours=3)
+
+    # Quiet for 2h50 backs off to 20 minutes, but the publish expected at
+    # 13:00 is 10 minutes away, so poll one minute after it instead.
+    now = datetime(2026, 1, 1, 12, 50, tzinfo=timezone.utc)
+    assert scheduler.next_interval((), now) == timedelta(minutes=11)
+
+
+@pytest.mark.asyncio
+async def test_hub_applies_tightest_entry_bounds(session) -> None:
+    hass = make_hass()
+    relaxed = make_entry("a", "1")
+    relaxed.options = {"min_scan_interval": 3, "max_scan_interval": 120}
+    eager = make_entry("b", "12")
+    eager.options = {"min_scan_interval": 2, "max_scan_interval": 20}
+    first = SmhiAlertCoordinator(hass, relaxed)
+    second = SmhiAlertCoordinator(hass, eager)
+    hub = first.hub
+    assert hub.scheduler.min_interval == timedelta(minutes=2)
+    assert hub.scheduler.max_interval == timedelta(minutes=20)
+
+    await first._async_update_data()
+    # The orange warning is in Skåne, which only the second entry shows.
+    assert hub.update_interval > timedelta(minutes=2)
+    await second._async_update_data()
+    assert hub.update_interval == timedelta(minutes=2)
+
+    await second.async_shutdown()
+    assert hub.scheduler.min_interval == timedelta(minutes=3)
+    assert hub.scheduler.max_interval == timedelta(minutes=120)
+    assert hub.update_interval > timedelta(minutes=3)
+    await hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_setup_releases_poll_bounds(session, monkeypatch) -> None:
+    def _offline(*_args, **_kwargs):
+        raise aiohttp.ClientError("offline")
+
+    monkeypatch.setattr(session, "get", _offline)
+    hass = make_hass()
+    hub = async_get_hub(hass)
+    entry = make_entry("a", "1")
+    entry.state = ConfigEntryState.SETUP_IN_PROGRESS
+    entry.options = {"min_scan_interval": 1}
+    with pytest.raises(ConfigEntryNotReady):
+        await async_setup_entry(hass, entry)
+    # Nothing is left behind to pin the shared hub to the entry's bounds.
+    assert hub.scheduler.min_interval == DEFAULT_MIN_SCAN_INTERVAL
+    assert DATA_HUB not in hass.data[DOMAIN]
@@ -0,0 +1,13 @@
+import pytest
+
+from soak import async_soak
+
+
+@pytest.mark.asyncio
+async def test_soak_stays_bounded() -> None:
+    result = await async_soak(entries=8, days=3.0)
+    assert result.updates > 0 and result.latencies
+    assert {200, 304, 429, 500} <= set(result.statuses)
+    assert len(result.memory) == 6
+    assert not result.growth_errors(), result.summary()
+    assert result.pending_timers == 0
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import timedelta
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from custom_components.smhi_alerts import areas as areas_module
+from custom_components.smhi_alerts import hub as hub_module
+from custom_components.smhi_alerts.areas import async_get_areas_catalogue
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from helpers import FakeStore, make_entry, make_hass
+from standin_server import StandInServer
+from synthetic import EPOCH, make_payload
+
+
+@pytest_asyncio.fixture
+async def client(monkeypatch):
+    async with aiohttp.ClientSession() as session:
+        monkeypatch.setattr(
+            hub_module.aiohttp_client,
+            "async_get_clientsession",
+            lambda _hass: session,
+        )
+        monkeypatch.setattr(hub_module, "Store", FakeStore)
+        monkeypatch.setattr(areas_module, "Store", FakeStore)
+        monkeypatch.setattr(hub_module, "FETCH_MIN_GAP", 0)
+        FakeStore.saved = FakeStore.areas = None
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_fetch_path_end_to_end(client) -> None:
+    async with StandInServer(make_payload(5, 2, 16, message_ratio=0.4)) as server:
+        hass = make_hass()
+        coordinator = SmhiAlertCoordinator(
+            hass, make_entry("a", "all", include_messages=True)
+        )
+        hub = coordinator.hub
+        hub.warnings_url = server.warnings_url
+        coordinator.areas.url = server.areas_url
+
+        data = await coordinator._async_update_data()
+        assert data["attributes"]["warnings_count"] > 0
+        assert data["attributes"]["messages_count"] > 0
+        assert server.statuses[200] == 2  # warnings and areas
+        assert server.requests[0]["Accept-Encoding"] == "gzip, deflate"
+
+        await hub.async_refresh()
+        assert server.statuses[304] == 1
+        assert server.requests[-1]["If-None-Match"] == server.warnings.etag
+
+        server.publish(make_payload(1, 1, 16, seed=3), EPOCH + timedelta(hours=1))
+        await hub.async_refresh()
+        assert len(hub.data) == 1 and server.statuses[200] == 3
+
+        base = hub.update_interval
+        server.rate_limit(retry_after=120)
+        await hub.async_refresh()
+        assert server.statuses[429] == 1
+        assert not hub.last_update_success
+        assert hub.update_interval > base
+
+        server.fail()
+        await hub.async_refresh()
+        assert server.statuses[500] == 1 and not hub.last_update_success
+
+        await hub.async_refresh()
+        assert hub.last_update_success and hub.data is not None
+        await asyncio.gather(*hass.tasks)
+        await hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_latency_is_shared_by_concurrent_refreshes(client) -> None:
+    async with StandInServer(latency=0.05) as server:
+        hub = hub_module.async_get_hub(make_hass())
+        hub.warnings_url = server.warnings_url
+        await asyncio.gather(*(hub.async_refresh() for _ in range(5)))
+        assert sum(server.statuses.values()) == 1
+        await hub.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_areas_catalogue_from_standin(client) -> None:
+    async with StandInServer() as server:
+        hass = make_hass()
+        catalogue = async_get_areas_catalogue(hass)
+        catalogue.url = server.areas_url
+        await catalogue.async_ensure_loaded()
+        await asyncio.gather(*hass.tasks)
+        assert catalogue.name(1) == "Stockholms län"
+        ring = catalogue.areas[0]["geometry"]["coordinates"][0]
+        lon = sum(p[0] for p in ring[:-1]) / (len(ring) - 1)
+        lat = sum(p[1] for p in ring[:-1]) / (len(ring) - 1)
+        assert "1" in catalogue.districts_at(lon, lat)
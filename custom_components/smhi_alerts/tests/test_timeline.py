@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.smhi_alerts import sensor as sensor_module
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from custom_components.smhi_alerts.timeline import AlertTimeline
+from helpers import make_entry, make_hass
+
+T0 = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+
+
+def _iso(hours: float) -> str:
+    return (T0 + timedelta(hours=hours)).isoformat()
+
+
+def test_counts_and_next_transition() -> None:
+    timeline = AlertTimeline(
+        [
+            {"code": "YELLOW", "start": _iso(0), "end": _iso(2)},
+            {"code": "ORANGE", "start": _iso(1), "end": "Unknown"},
+            {"code": "MESSAGE", "start": None, "end": _iso(3)},
+            {"code": "NONE", "start": _iso(0), "end": _iso(9)},
+        ]
+    )
+    assert timeline.counts(T0 - timedelta(hours=1)) == (1, 2)
+    assert timeline.counts(T0) == (2, 1)
+    assert timeline.counts(T0 + timedelta(hours=2)) == (2, 0)
+    assert timeline.counts(T0 + timedelta(hours=5)) == (1, 0)
+    assert timeline.next_transition(T0) == T0 + timedelta(hours=1)
+    assert timeline.next_transition(T0 + timedelta(hours=3)) is None
+
+
+@pytest.mark.asyncio
+async def test_timer_flips_counts_without_refiltering(session, monkeypatch) -> None:
+    now = [T0 - timedelta(minutes=30)]
+    timers: list = []
+    monkeypatch.setattr(sensor_module.dt_util, "utcnow", lambda: now[0])
+    monkeypatch.setattr(
+        sensor_module,
+        "async_track_point_in_time",
+        lambda _hass, action, when: timers.append((when, action)) or (lambda: None),
+    )
+    session.payload = [
+        {
+            "event": {"en": "Wind", "code": "WIND"},
+            "warningAreas": [
+                {
+                    "warningLevel": {"code": "YELLOW"},
+                    "affectedAreas": [{"id": 1, "en": "Stockholm"}],
+                    "approximateStart": _iso(0),
+                    "approximateEnd": _iso(6),
+                }
+            ],
+        }
+    ]
+    coordinator = SmhiAlertCoordinator(make_hass(), make_entry("a", "1"))
+    coordinator.data = await coordinator._async_update_data()
+    attributes = coordinator.data["attributes"]
+    assert (attributes["active_count"], attributes["upcoming_count"]) == (0, 1)
+    assert timers[-1][0] == T0
+
+    processed: list = []
+    monkeypatch.setattr(coordinator, "_process_data", processed.append)
+    updates: list = []
+    coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+    now[0] = T0
+    timers[-1][1](T0)
+    assert updates[-1]["attributes"]["active_count"] == 1
+    assert updates[-1]["attributes"]["upcoming_count"] == 0
+    assert timers[-1][0] == T0 + timedelta(hours=6)
+    assert processed == []
@@ -0,0 +1,59 @@
+import asyncio
+import copy
+
+import pytest
+
+from custom_components.smhi_alerts.const import DATA_HUB, DOMAIN
+from custom_components.smhi_alerts.sensor import SmhiAlertCoordinator
+from custom_components.smhi_alerts.websocket_api import websocket_get_geometry
+from helpers import POLYGON, WARNINGS, make_entry, make_hass
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.results: list = []
+        self.errors: list = []
+
+    def send_result(self, msg_id, result) -> None:
+        self.results.append(result)
+
+    def send_error(self, msg_id, code, message) -> None:
+        self.errors.append(code)
+
+
+async def _call(hass, connection, **msg) -> None:
+    websocket_get_geometry(
+        hass, connection, {"id": 1, "type": "smhi_alerts/geometry", **msg}
+    )
+    # The handler answers from a task once the executor is done.
+    await asyncio.gather(*hass.tasks)
+
+
+@pytest.mark.asyncio
+async def test_messages_reference_geometry_served_with_etag(session) -> None:
+    payload = copy.deepcopy(WARNINGS)
+    for area in payload[0]["warningAreas"]:
+        area["area"] = POLYGON
+    session.payload = payload
+    hass = make_hass()
+    coordinator = SmhiAlertCoordinator(
+        hass, make_entry("a", "all", include_geometry=True)
+    )
+    data = await coordinator._async_update_data()
+    messages = data["attributes"]["messages"]
+    assert all("geometry" not in m for m in messages)
+    ref = messages[0]["geometry_ref"]
+    assert ref == "100:2"
+
+    connection = FakeConnection()
+    await _call(hass, connection, ref=ref)
+    etag = connection.results[0]["etag"]
+    assert connection.results[0]["geometry"] == POLYGON
+
+    await _call(hass, connection, ref=ref, etag=etag)
+    assert connection.results[1] == {"etag": etag, "not_modified": True}
+
+    await _call(hass, connection, ref="100:9")
+    await _call(make_hass(), connection, ref=ref)
+    assert connection.errors == ["not_found", "not_found"]
+    assert hass.data[DOMAIN][DATA_HUB] is coordinator.hub
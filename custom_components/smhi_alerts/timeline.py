@@ -0,0 +1,70 @@
+"""Active and upcoming alert windows of one entry."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Codes that count as alerts, see alerts_count.
+ALERT_CODES = frozenset({"YELLOW", "ORANGE", "RED", "MESSAGE"})
+
+
+def _timestamp(value: Any) -> float | None:
+    """Return a POSIX timestamp for an ISO string, None if not a time."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = dt_util.parse_datetime(value)
+    except ValueError:
+        return None
+    return parsed.timestamp() if parsed is not None else None
+
+
+class AlertTimeline:
+    """Sorted start and end times of the alert windows in a message list.
+
+    An alert is active from approximateStart (or always, if unknown) until
+    approximateEnd (or indefinitely), and upcoming before its start. Counts
+    and the next transition are answered by bisection, so a timer can flip
+    them without re-filtering the payload.
+    """
+
+    def __init__(self, messages: list[dict[str, Any]]) -> None:
+        """Index the windows of every alert in messages."""
+        starts: list[float] = []
+        ends: list[float] = []
+        self.open_ended = 0
+        for msg in messages:
+            if msg.get("code") not in ALERT_CODES:
+                continue
+            start = _timestamp(msg.get("start"))
+            end = _timestamp(msg.get("end"))
+            start = float("-inf") if start is None else start
+            if end is None:
+                self.open_ended += 1
+                end = float("inf")
+            # A window that ends before it starts is never active.
+            ends.append(max(start, end))
+            starts.append(start)
+        self._starts = sorted(starts)
+        self._ends = sorted(ends)
+        self._boundaries = sorted(
+            {t for t in (*starts, *ends) if t not in (float("inf"), float("-inf"))}
+        )
+
+    def counts(self, now: datetime) -> tuple[int, int]:
+        """Return (active, upcoming) alert counts at now."""
+        ts = now.timestamp()
+        started = bisect_right(self._starts, ts)
+        ended = bisect_right(self._ends, ts)
+        return started - ended, len(self._starts) - started
+
+    def next_transition(self, now: datetime) -> datetime | None:
+        """Return the first start or end strictly after now."""
+        index = bisect_right(self._boundaries, now.timestamp())
+        if index == len(self._boundaries):
+            return None
+        return dt_util.utc_from_timestamp(self._boundaries[index])
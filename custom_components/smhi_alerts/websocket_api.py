@@ -0,0 +1,72 @@
+"""Websocket API for the SMHI Alert card."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+import voluptuous as vol
+
+from .const import DATA_HUB, DOMAIN
+from .geometry import SIMPLIFY_TOLERANCE
+
+if TYPE_CHECKING:
+    from .hub import SmhiWarningsHub
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_get_geometry)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/geometry",
+        vol.Required("ref"): str,
+        vol.Optional("etag"): str,
+        # Douglas-Peucker tolerance in degrees; 0 only quantizes.
+        vol.Optional("tolerance", default=SIMPLIFY_TOLERANCE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+    }
+)
+@websocket_api.async_response
+async def websocket_get_geometry(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the simplified GeoJSON of one warning area by its geometry_ref.
+
+    A client that sends the ETag it already holds gets not_modified instead
+    of the polygon again. Hashing and simplifying run in the executor.
+    """
+    hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+    found = None
+    if hub is not None and hub.data:
+        found = await hass.async_add_executor_job(
+            _lookup_geometry,
+            hub,
+            hub.data,
+            msg["ref"],
+            msg.get("tolerance", SIMPLIFY_TOLERANCE),
+        )
+    if found is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown or expired geometry"
+        )
+        return
+    geometry, etag = found
+    if msg.get("etag") == etag:
+        connection.send_result(msg["id"], {"etag": etag, "not_modified": True})
+        return
+    connection.send_result(msg["id"], {"etag": etag, "geometry": geometry})
+
+
+def _lookup_geometry(
+    hub: SmhiWarningsHub, payload: list[dict[str, Any]], ref: str, tolerance: float
+) -> tuple[Any, str] | None:
+    """Return (simplified geometry, etag) of ref in payload; executor only."""
+    return hub.geometry_refs(payload).get(ref, tolerance)
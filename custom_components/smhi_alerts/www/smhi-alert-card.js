@@ -362,6 +362,8 @@ class SmhiAlertCard extends LitElement {
   constructor() {
     super();
     this._maps = new Map();
+    // Geometry fetched on demand, keyed by reference: { etag, geometry, published, pending }
+    this._geometryCache = new Map();
   }
 
   disconnectedCallback() {
@@ -624,7 +626,7 @@ class SmhiAlertCard extends LitElement {
 
     const mkMapBlock = () => {
       if (!this.config?.show_map) return null;
-      if (!item?.geometry) return null;
+      if (!this._hasGeometry(item)) return null;
       const mapId = `smhi-alert-map-${this._sanitizeDomId(alertKey)}`;
       const statusId = `smhi-alert-map-status-${this._sanitizeDomId(alertKey)}`;
       return html`
@@ -724,7 +726,7 @@ class SmhiAlertCard extends LitElement {
           continue;
         }
         if (k === 'map') {
-          if (this.config?.show_map && !!item?.geometry) return true;
+          if (this.config?.show_map && this._hasGeometry(item)) return true;
           continue;
         }
         if (metaSpanFor(k)) return true;
@@ -1086,6 +1088,7 @@ class SmhiAlertCard extends LitElement {
   _maybeInitMaps() {
     if (!this.config?.show_map) return;
     if (!this.renderRoot) return;
+    this._pruneGeometryCache();
 
     const messages = this._visibleMessages();
     const { inlineKeys, detailsKeys } = this._splitMetaOrder(this.config?.meta_order);
@@ -1098,12 +1101,15 @@ class SmhiAlertCard extends LitElement {
       const expanded = !!this._expanded?.[key];
       const mapVisible = (mapInInline || (mapInDetails && expanded));
       if (!mapVisible) continue;
-      if (!item?.geometry) continue;
+      if (!this._hasGeometry(item)) continue;
       const mapId = `smhi-alert-map-${this._sanitizeDomId(key)}`;
       const el = this.renderRoot.querySelector(`#${mapId}`);
       if (!el) continue;
       activeKeys.add(key);
-      this._ensureLeafletAndRenderMap(key, el, item.geometry, String(item.code || '').toUpperCase()).catch(() => {
+      this._resolveGeometry(item).then((geometry) => {
+        if (!geometry) throw new Error('geometry unavailable');
+        return this._ensureLeafletAndRenderMap(key, el, geometry, String(item.code || '').toUpperCase());
+      }).catch(() => {
         const statusEl = this.renderRoot?.querySelector?.(`#smhi-alert-map-status-${this._sanitizeDomId(key)}`);
         if (statusEl) {
           statusEl.textContent = this._t('map_failed');
@@ -1122,6 +1128,47 @@ class SmhiAlertCard extends LitElement {
     }
   }
 
+  _pruneGeometryCache() {
+    // Drop polygons of alerts that are no longer in the entity's messages.
+    if (!this._geometryCache.size) return;
+    const messages = this._messages();
+    const refs = new Set(
+      (Array.isArray(messages) ? messages : []).map((m) => m?.geometry_ref).filter(Boolean)
+    );
+    for (const ref of this._geometryCache.keys()) {
+      if (!refs.has(ref)) this._geometryCache.delete(ref);
+    }
+  }
+
+  _hasGeometry(item) {
+    return !!(item?.geometry || item?.geometry_ref);
+  }
+
+  async _resolveGeometry(item) {
+    // Inline geometry (older integration versions) is used as-is.
+    if (item?.geometry) return item.geometry;
+    const ref = item?.geometry_ref;
+    if (!ref || !this.hass?.callWS) return null;
+    const published = String(item.published || '');
+    const cached = this._geometryCache.get(ref);
+    if (cached?.pending) return cached.pending;
+    if (cached?.geometry && cached.published === published) return cached.geometry;
+
+    // Republished alert: revalidate with the ETag; unchanged polygons are not resent.
+    const request = { type: 'smhi_alerts/geometry', ref };
+    if (cached?.etag) request.etag = cached.etag;
+    const pending = this.hass.callWS(request).then((res) => {
+      const geometry = res?.not_modified ? cached?.geometry : res?.geometry;
+      this._geometryCache.set(ref, { etag: res?.etag, geometry, published });
+      return geometry || null;
+    }).catch((err) => {
+      this._geometryCache.delete(ref);
+      throw err;
+    });
+    this._geometryCache.set(ref, { ...(cached || {}), pending });
+    return pending;
+  }
+
   _sanitizeDomId(value) {
     // Important: this value is used inside querySelector(`#${id}`).
     // Characters like ':' and '.' make the selector invalid unless escaped, so we strip them here.